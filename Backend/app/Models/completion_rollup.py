@@ -0,0 +1,132 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import BigInteger, DDL, Date, Index, Integer, String, event, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database import Base
+
+# Stands in for completions without a body category in the unique key (NULLs are never equal)
+NO_CATEGORY = "00000000-0000-0000-0000-000000000000"
+
+
+class CompletionDailyRollup(Base):
+    # Sets (one exercise completion per set), reps and break time per profile, training day and body
+    # category. Maintained by statement-level triggers on training_exercise_completions (see below),
+    # so the create slices, the write buffer, the data sync imports and deletes all keep it current.
+    # Analytics read this table instead of the raw completion log: O(days) instead of O(sets).
+    # Rebuild with `python manage_rollups.py rebuild` (app/infrastructure/rollups.py).
+    __tablename__ = "completion_daily_rollups"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    profile_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    training_day: Mapped[date] = mapped_column(Date, nullable=False)
+    body_category_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    # Category name as stored on the completions (denormalized there), updated by newer completions
+    body_category_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    sets: Mapped[int] = mapped_column(Integer, nullable=False)
+    reps: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    break_time_seconds: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+# One row per (profile, day, category); the triggers upsert against this index
+Index(
+    "ux_completion_daily_rollups_key",
+    CompletionDailyRollup.profile_id,
+    CompletionDailyRollup.training_day,
+    func.coalesce(CompletionDailyRollup.body_category_id, text(f"'{NO_CATEGORY}'::uuid")),
+    unique=True,
+)
+
+# The completion log the rollups are computed from
+ROLLUP_SOURCE_TABLE = "training_exercise_completions"
+
+ROLLUP_KEY = f"profile_id, training_day, (coalesce(body_category_id, '{NO_CATEGORY}'::uuid))"
+
+# Aggregates a set of completion rows into rollup deltas. Sorted by key, so concurrent transactions
+# lock the rollup rows in the same order and cannot deadlock each other.
+_DELTAS = """
+    SELECT profile_id, training_day, body_category_id, max(body_category_name) AS body_category_name,
+           count(*) AS sets, sum(reps) AS reps, sum(break_time_seconds) AS break_time_seconds
+    FROM {rows}
+    GROUP BY profile_id, training_day, body_category_id
+    ORDER BY profile_id, training_day, body_category_id
+"""
+
+ADD_ROLLUPS_SQL = f"""
+    INSERT INTO completion_daily_rollups AS r
+        (profile_id, training_day, body_category_id, body_category_name, sets, reps, break_time_seconds)
+    {_DELTAS}
+    ON CONFLICT ({ROLLUP_KEY}) DO UPDATE SET
+        sets = r.sets + EXCLUDED.sets,
+        reps = r.reps + EXCLUDED.reps,
+        break_time_seconds = r.break_time_seconds + EXCLUDED.break_time_seconds,
+        body_category_name = coalesce(EXCLUDED.body_category_name, r.body_category_name)
+"""
+
+# Subtracts a set of completion rows from the rollups and removes rollup rows that became empty.
+# Used by the triggers for deleted rows and when a partition of completions is detached.
+SUBTRACT_ROLLUPS_SQL = f"""
+    UPDATE completion_daily_rollups r SET
+        sets = r.sets - o.sets,
+        reps = r.reps - o.reps,
+        break_time_seconds = r.break_time_seconds - o.break_time_seconds
+    FROM ({_DELTAS}) o
+    WHERE r.profile_id = o.profile_id AND r.training_day = o.training_day
+      AND coalesce(r.body_category_id, '{NO_CATEGORY}'::uuid) = coalesce(o.body_category_id, '{NO_CATEGORY}'::uuid)
+"""
+
+REMOVE_EMPTY_ROLLUPS_SQL = """
+    DELETE FROM completion_daily_rollups r USING (SELECT DISTINCT profile_id, training_day FROM {rows}) o
+    WHERE r.sets <= 0 AND r.profile_id = o.profile_id AND r.training_day = o.training_day
+"""
+
+APPLY_COMPLETION_ROLLUPS = DDL(f"""
+CREATE OR REPLACE FUNCTION apply_completion_rollups() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM completion_daily_rollups;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        {SUBTRACT_ROLLUPS_SQL.format(rows="old_rows")};
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        {ADD_ROLLUPS_SQL.format(rows="new_rows")};
+    END IF;
+
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        {REMOVE_EMPTY_ROLLUPS_SQL.format(rows="old_rows")};
+    END IF;
+    RETURN NULL;
+END
+$$
+""")
+
+
+def rollup_triggers_ddl() -> DDL:
+    # Like the sync change triggers: statement level with transition tables, created only if missing
+    table_name = ROLLUP_SOURCE_TABLE
+    statements = {
+        "insert": "AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows",
+        "update": "AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "delete": "AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows",
+        "truncate": "AFTER TRUNCATE ON {table}",
+    }
+    creates = "\n".join(
+        f"""    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'completion_rollups_{operation}' AND tgrelid = '{table_name}'::regclass) THEN
+        CREATE TRIGGER completion_rollups_{operation} {timing.format(table=table_name)}
+        FOR EACH STATEMENT EXECUTE FUNCTION apply_completion_rollups();
+    END IF;"""
+        for operation, timing in statements.items()
+    )
+    return DDL(f"DO $$\nBEGIN\n{creates}\nEND\n$$")
+
+
+# Runs after create_all, when both tables exist. Existing completions are not counted until the
+# rollups are rebuilt once (manage_rollups.py).
+event.listen(Base.metadata, "after_create", APPLY_COMPLETION_ROLLUPS.execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "after_create", rollup_triggers_ddl().execute_if(dialect="postgresql"))
@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DDL, DateTime, Index, String, event, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database import Base
+
+
+class SyncChange(Base):
+    # Change log for delta sync. Filled by statement-level triggers on every synced table (see below),
+    # so ORM writes, bulk statements and the COPY import are all recorded. `txid` is the id of the
+    # writing transaction; the delta export uses transaction snapshots as watermarks
+    # (see app/features/data_sync/data_sync_changes.py).
+    __tablename__ = "sync_changes"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    txid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("pg_current_xact_id()::text::bigint")
+    )
+    table_name: Mapped[str] = mapped_column(String(63), nullable=False)
+    # NULL for "truncate" entries, which stand for the whole table
+    row_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    # insert, update, delete or truncate
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+
+
+Index("ix_sync_changes_txid", SyncChange.txid)
+
+
+# Tables whose changes are recorded; each has a UUID column "id"
+TRACKED_TABLES = [
+    "profiles",
+    "body_categories",
+    "training_exercise_items",
+    "training_plans",
+    "training_exercises",
+    "training_plan_completions",
+    "training_exercise_completions",
+]
+
+# One row per changed row and statement, read from the statement's transition table. Statement-level
+# triggers keep bulk imports cheap (one INSERT ... SELECT per statement instead of one call per row)
+# and also work on the partitioned completions table.
+RECORD_SYNC_CHANGES = DDL("""
+CREATE OR REPLACE FUNCTION record_sync_changes() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        INSERT INTO sync_changes (table_name, operation) VALUES (TG_ARGV[0], 'truncate');
+    ELSE
+        INSERT INTO sync_changes (table_name, row_id, operation)
+        SELECT TG_ARGV[0], changed_rows.id, lower(TG_OP) FROM changed_rows;
+    END IF;
+    RETURN NULL;
+END
+$$
+""")
+
+
+def sync_triggers_ddl(table_name: str) -> DDL:
+    # Creates the triggers only if they are missing, so startup does not lock the tables every time
+    statements = {
+        "insert": f"AFTER INSERT ON {table_name} REFERENCING NEW TABLE AS changed_rows",
+        "update": f"AFTER UPDATE ON {table_name} REFERENCING NEW TABLE AS changed_rows",
+        "delete": f"AFTER DELETE ON {table_name} REFERENCING OLD TABLE AS changed_rows",
+        "truncate": f"AFTER TRUNCATE ON {table_name}",
+    }
+    creates = "\n".join(
+        f"""    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'sync_changes_{operation}' AND tgrelid = '{table_name}'::regclass) THEN
+        CREATE TRIGGER sync_changes_{operation} {timing}
+        FOR EACH STATEMENT EXECUTE FUNCTION record_sync_changes('{table_name}');
+    END IF;"""
+        for operation, timing in statements.items()
+    )
+    return DDL(f"DO $$\nBEGIN\n{creates}\nEND\n$$")
+
+
+# Runs after create_all, when all tracked tables exist (also for databases created before the change log)
+event.listen(Base.metadata, "after_create", RECORD_SYNC_CHANGES.execute_if(dialect="postgresql"))
+for tracked_table in TRACKED_TABLES:
+    event.listen(Base.metadata, "after_create", sync_triggers_ddl(tracked_table).execute_if(dialect="postgresql"))
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, date
 from venv import create
-from sqlalchemy import ForeignKey, Integer, String, DateTime, Date
+from sqlalchemy import DDL, ForeignKey, Index, Integer, String, DateTime, Date, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,9 @@ from app.infrastructure.database import Base
 
 class TrainingExerciseCompletion(Base):
     __tablename__ = "training_exercise_completions"
+    # Append-only log, monthly range-partitioned by training_day (see app/infrastructure/partitioning.py).
+    # PostgreSQL requires the partition key to be part of the primary key.
+    __table_args__ = {"postgresql_partition_by": "RANGE (training_day)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -43,4 +46,23 @@ class TrainingExerciseCompletion(Base):
         default=datetime.now(),
         nullable=False
     )
-    training_day: Mapped[date] = mapped_column(Date, nullable=False)
+    training_day: Mapped[date] = mapped_column(Date, primary_key=True, nullable=False)
+
+
+# Matches the history query: filter by profile, order by training_day DESC, training_plan_id DESC, order
+Index(
+    "ix_training_exercise_completions_profile_history",
+    TrainingExerciseCompletion.profile_id,
+    TrainingExerciseCompletion.training_day.desc(),
+    TrainingExerciseCompletion.training_plan_id.desc(),
+    TrainingExerciseCompletion.order,
+)
+Index("ix_training_exercise_completions_training_plan_id", TrainingExerciseCompletion.training_plan_id)
+
+# A partitioned table accepts no rows without partitions: the default partition catches every
+# training_day until the monthly partitions are created at startup
+event.listen(
+    TrainingExerciseCompletion.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS training_exercise_completions_default PARTITION OF training_exercise_completions DEFAULT").execute_if(dialect="postgresql"),
+)
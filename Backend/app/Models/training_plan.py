@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.Models.training_exercise_item import TrainingExerciseItem
@@ -53,3 +53,9 @@ class TrainingExercise(Base):
     training_exercise_item: Mapped["TrainingExerciseItem"] = relationship(
         "TrainingExerciseItem", lazy="selectin"
     )
+
+
+# Plans of a profile ordered by name (/training-plans/byProfileId)
+Index("ix_training_plans_profile_id_name", TrainingPlan.profile_id, TrainingPlan.name)
+# Loading the exercises of a plan (selectinload) and cascading deletes
+Index("ix_training_exercises_training_plan_id", TrainingExercise.training_plan_id)
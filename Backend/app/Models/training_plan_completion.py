@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import ForeignKey, Integer, String, DateTime, Date
+from sqlalchemy import ForeignKey, Index, Integer, String, DateTime, Date
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -30,3 +30,13 @@ class TrainingPlanCompletion(Base):
         nullable=False
     )
     training_day: Mapped[date] = mapped_column(Date, nullable=False)
+
+
+# Matches the history query: filter by profile, order by training_day DESC, created_at DESC
+Index(
+    "ix_training_plan_completions_profile_history",
+    TrainingPlanCompletion.profile_id,
+    TrainingPlanCompletion.training_day.desc(),
+    TrainingPlanCompletion.created_at.desc(),
+)
+Index("ix_training_plan_completions_training_plan_id", TrainingPlanCompletion.training_plan_id)
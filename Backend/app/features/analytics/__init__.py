@@ -0,0 +1 @@
+# Analytics Feature Module
@@ -0,0 +1,65 @@
+from datetime import date
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database import get_read_session
+from app.features.analytics.period import resolve_period
+from app.features.analytics.schemas import HeatmapDay
+from app.Models.completion_rollup import CompletionDailyRollup
+from app.Models.training_plan_completion import TrainingPlanCompletion
+
+router = APIRouter()
+
+DEFAULT_DAYS = 365
+
+
+@router.get("/profiles/{profile_id}/analytics/heatmap", response_model=list[HeatmapDay], tags=["analytics"])
+async def get_heatmap(
+    profile_id: UUID,
+    from_day: date | None = Query(None, description="First day of the calendar (default: one year before to_day)"),
+    to_day: date | None = Query(None, description="Last day of the calendar (default: today)"),
+    session: AsyncSession = Depends(get_read_session),
+) -> list[HeatmapDay]:
+    # Calendar heatmap: only days with training are returned, the client fills in the empty days.
+    # level buckets the active days into quartiles of their set count.
+    from_day, to_day = resolve_period(from_day, to_day, DEFAULT_DAYS)
+    rollups = CompletionDailyRollup
+    plans = TrainingPlanCompletion
+
+    # Daily rollups, summed over the body categories
+    sets_per_day = (
+        select(
+            rollups.training_day.label("day"),
+            func.sum(rollups.sets).label("sets"),
+            func.sum(rollups.reps).label("reps"),
+        )
+        .where(rollups.profile_id == profile_id)
+        .where(rollups.training_day >= from_day, rollups.training_day <= to_day)
+        .group_by(rollups.training_day)
+        .subquery()
+    )
+    sessions_per_day = (
+        select(plans.training_day.label("day"), func.count().label("sessions"))
+        .where(plans.profile_id == profile_id)
+        .where(plans.training_day >= from_day, plans.training_day <= to_day)
+        .group_by(plans.training_day)
+        .subquery()
+    )
+
+    sets = func.coalesce(sets_per_day.c.sets, 0)
+    query = (
+        select(
+            func.coalesce(sets_per_day.c.day, sessions_per_day.c.day).label("day"),
+            sets.label("sets"),
+            func.coalesce(sets_per_day.c.reps, 0).label("reps"),
+            func.coalesce(sessions_per_day.c.sessions, 0).label("sessions"),
+            func.ntile(4).over(order_by=sets).label("level"),
+        )
+        .select_from(sets_per_day)
+        .join(sessions_per_day, sessions_per_day.c.day == sets_per_day.c.day, full=True)
+        .order_by("day")
+    )
+
+    result = await session.execute(query)
+    return [HeatmapDay.model_validate(row) for row in result.mappings()]
@@ -0,0 +1,71 @@
+from datetime import date
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database import get_read_session
+from app.features.analytics.period import resolve_period
+from app.features.analytics.schemas import PlanCompletionRatio
+from app.Models.training_plan_completion import TrainingPlanCompletion
+
+router = APIRouter()
+
+DEFAULT_DAYS = 90
+RECENT_SESSIONS = 5
+
+
+def ratio(completed, total):
+    return func.coalesce(cast(completed, Float) / func.nullif(total, 0), 0.0)
+
+
+@router.get("/profiles/{profile_id}/analytics/plan-completion", response_model=list[PlanCompletionRatio], tags=["analytics"])
+async def get_plan_completion(
+    profile_id: UUID,
+    from_day: date | None = Query(None, description="First training day of the period (default: 90 days before to_day)"),
+    to_day: date | None = Query(None, description="Last training day of the period (default: today)"),
+    session: AsyncSession = Depends(get_read_session),
+) -> list[PlanCompletionRatio]:
+    # Share of completed exercises per training plan, over the whole period and over the plan's
+    # last RECENT_SESSIONS sessions (numbered per plan with a window function)
+    from_day, to_day = resolve_period(from_day, to_day, DEFAULT_DAYS)
+    model = TrainingPlanCompletion
+
+    numbered = (
+        select(
+            model.training_plan_id,
+            model.training_plan_name,
+            model.count_completed_exercises,
+            model.count_open_exercises,
+            model.training_day,
+            func.row_number().over(
+                partition_by=model.training_plan_id,
+                order_by=(model.training_day.desc(), model.created_at.desc(), model.id.desc()),
+            ).label("recency"),
+        )
+        .where(model.profile_id == profile_id)
+        .where(model.training_day >= from_day, model.training_day <= to_day)
+        .subquery()
+    )
+
+    recent = numbered.c.recency <= RECENT_SESSIONS
+    completed = numbered.c.count_completed_exercises
+    total = numbered.c.count_completed_exercises + numbered.c.count_open_exercises
+
+    query = (
+        select(
+            numbered.c.training_plan_id,
+            # Name at the latest session, plans can be renamed
+            func.max(numbered.c.training_plan_name).filter(numbered.c.recency == 1).label("training_plan_name"),
+            func.count().label("sessions"),
+            func.sum(completed).label("completed_exercises"),
+            func.sum(numbered.c.count_open_exercises).label("open_exercises"),
+            ratio(func.sum(completed), func.sum(total)).label("completion_ratio"),
+            ratio(func.sum(completed).filter(recent), func.sum(total).filter(recent)).label("recent_completion_ratio"),
+            func.max(numbered.c.training_day).label("last_training_day"),
+        )
+        .group_by(numbered.c.training_plan_id)
+        .order_by(func.max(numbered.c.training_day).desc(), numbered.c.training_plan_id)
+    )
+
+    result = await session.execute(query)
+    return [PlanCompletionRatio.model_validate(row) for row in result.mappings()]
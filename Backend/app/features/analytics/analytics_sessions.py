@@ -0,0 +1,68 @@
+from datetime import date, datetime, timedelta
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import DateTime, Date, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database import get_read_session
+from app.features.analytics.period import resolve_period, week_start
+from app.features.analytics.schemas import WeeklySessions
+from app.Models.training_plan_completion import TrainingPlanCompletion
+
+router = APIRouter()
+
+DEFAULT_DAYS = 12 * 7
+# The moving average covers the current and the previous weeks
+AVERAGE_WEEKS = 4
+
+
+@router.get("/profiles/{profile_id}/analytics/sessions", response_model=list[WeeklySessions], tags=["analytics"])
+async def get_weekly_sessions(
+    profile_id: UUID,
+    from_day: date | None = Query(None, description="First training day of the period (default: 12 weeks before to_day)"),
+    to_day: date | None = Query(None, description="Last training day of the period (default: today)"),
+    session: AsyncSession = Depends(get_read_session),
+) -> list[WeeklySessions]:
+    # One row per ISO week of the period, weeks without training included. A session is a completed
+    # training plan (training_plan_completions row).
+    from_day, to_day = resolve_period(from_day, to_day, DEFAULT_DAYS)
+    model = TrainingPlanCompletion
+    first_week = week_start(from_day)
+    # The moving average of the first weeks needs the weeks before the period
+    series_start = first_week - timedelta(weeks=AVERAGE_WEEKS - 1)
+
+    week = cast(func.date_trunc(literal_column("'week'"), cast(model.training_day, DateTime)), Date)
+    per_week = (
+        select(
+            week.label("week"),
+            func.count().label("sessions"),
+            func.count(model.training_day.distinct()).label("training_days"),
+        )
+        .where(model.profile_id == profile_id)
+        .where(model.training_day >= series_start, model.training_day <= to_day)
+        .group_by(week)
+        .subquery()
+    )
+
+    weeks = func.generate_series(
+        datetime.combine(series_start, datetime.min.time()),
+        datetime.combine(week_start(to_day), datetime.min.time()),
+        timedelta(weeks=1),
+    ).table_valued("week_start").render_derived()
+    series_week = cast(weeks.c.week_start, Date)
+    sessions = func.coalesce(per_week.c.sessions, 0)
+
+    filled = (
+        select(
+            series_week.label("week"),
+            sessions.label("sessions"),
+            func.coalesce(per_week.c.training_days, 0).label("training_days"),
+            func.avg(sessions).over(order_by=series_week, rows=(-(AVERAGE_WEEKS - 1), 0)).label("average_sessions_4_weeks"),
+        )
+        .select_from(weeks)
+        .outerjoin(per_week, per_week.c.week == series_week)
+        .subquery()
+    )
+
+    query = select(filled).where(filled.c.week >= first_week).order_by(filled.c.week)
+    result = await session.execute(query)
+    return [WeeklySessions.model_validate(row) for row in result.mappings()]
@@ -0,0 +1,47 @@
+from datetime import date
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import DateTime, Date, Float, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database import get_read_session
+from app.features.analytics.period import resolve_period
+from app.features.analytics.schemas import WeeklyCategoryVolume
+from app.Models.completion_rollup import CompletionDailyRollup
+
+router = APIRouter()
+
+DEFAULT_DAYS = 12 * 7
+
+
+@router.get("/profiles/{profile_id}/analytics/volume", response_model=list[WeeklyCategoryVolume], tags=["analytics"])
+async def get_weekly_volume(
+    profile_id: UUID,
+    from_day: date | None = Query(None, description="First training day of the period (default: 12 weeks before to_day)"),
+    to_day: date | None = Query(None, description="Last training day of the period (default: today)"),
+    session: AsyncSession = Depends(get_read_session),
+) -> list[WeeklyCategoryVolume]:
+    # Sets (one completion per set), reps and break time per body category and ISO week. Reads the
+    # daily rollups, so the work depends on the days and categories in the period, not the sets.
+    from_day, to_day = resolve_period(from_day, to_day, DEFAULT_DAYS)
+    model = CompletionDailyRollup
+    week = cast(func.date_trunc(literal_column("'week'"), cast(model.training_day, DateTime)), Date).label("week")
+    sets = func.sum(model.sets)
+
+    query = (
+        select(
+            week,
+            model.body_category_id,
+            func.max(model.body_category_name).label("body_category_name"),
+            sets.label("sets"),
+            func.sum(model.reps).label("reps"),
+            func.sum(model.break_time_seconds).label("break_time_seconds"),
+            (cast(sets, Float) / cast(func.sum(sets).over(partition_by=week), Float)).label("share_of_week"),
+        )
+        .where(model.profile_id == profile_id)
+        .where(model.training_day >= from_day, model.training_day <= to_day)
+        .group_by(week, model.body_category_id)
+        .order_by(week, sets.desc(), model.body_category_id)
+    )
+
+    result = await session.execute(query)
+    return [WeeklyCategoryVolume.model_validate(row) for row in result.mappings()]
@@ -0,0 +1,16 @@
+from datetime import date, timedelta
+from fastapi import HTTPException
+
+
+def resolve_period(from_day: date | None, to_day: date | None, default_days: int) -> tuple[date, date]:
+    # Analytics always run over a bounded period, so the result size and the scanned partitions of
+    # the completion log do not grow with the history
+    to_day = to_day or date.today()
+    from_day = from_day or to_day - timedelta(days=default_days - 1)
+    if from_day > to_day:
+        raise HTTPException(status_code=400, detail="from_day must not be after to_day")
+    return from_day, to_day
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
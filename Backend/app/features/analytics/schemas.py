@@ -0,0 +1,48 @@
+from uuid import UUID
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class WeeklyCategoryVolume(BaseModel):
+    week: date  # Monday of the ISO week
+    body_category_id: UUID | None = None
+    body_category_name: str | None = None
+    sets: int
+    reps: int
+    break_time_seconds: int
+    share_of_week: float  # Fraction of the week's sets done in this category
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WeeklySessions(BaseModel):
+    week: date
+    sessions: int
+    training_days: int
+    average_sessions_4_weeks: float  # Moving average over this and the three previous weeks
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PlanCompletionRatio(BaseModel):
+    training_plan_id: UUID
+    training_plan_name: str
+    sessions: int
+    completed_exercises: int
+    open_exercises: int
+    completion_ratio: float
+    recent_completion_ratio: float  # Ratio over the plan's last RECENT_SESSIONS sessions
+    last_training_day: date
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class HeatmapDay(BaseModel):
+    day: date
+    sets: int
+    reps: int
+    sessions: int
+    level: int  # 1-4, quartile of the day's sets among all active days in the period
+
+    model_config = ConfigDict(from_attributes=True)
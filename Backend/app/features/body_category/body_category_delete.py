@@ -4,6 +4,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
 from app.Models.body_category import BodyCategory
+from app.features.training_plan.execute_cache import invalidate_execute_cache
+from app.features.excersice_completion.completion_references import invalidate_reference_cache
 
 
 router = APIRouter()
@@ -21,4 +23,6 @@ async def delete_body_category(category_id: UUID, session: AsyncSession = Depend
         raise HTTPException(status_code=404, detail="Body Category not found")
 
     await session.delete(category)
+    invalidate_execute_cache(session)
+    invalidate_reference_cache(session)
     await session.flush()
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
 from app.Models.body_category import BodyCategory
 from app.features.body_category.schemas import BodyCategoryResponse
 
@@ -10,7 +10,7 @@ router = APIRouter()
 
 
 @router.get("/body-categories", response_model=list[BodyCategoryResponse], status_code=200, tags=["body-categories"])
-async def list_body_categories(session: AsyncSession = Depends(get_session)) -> list[BodyCategoryResponse]:
+async def list_body_categories(session: AsyncSession = Depends(get_read_session)) -> list[BodyCategoryResponse]:
 
     all_categories = await session.execute(
         select(BodyCategory)
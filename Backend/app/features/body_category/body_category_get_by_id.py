@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
 from app.Models.body_category import BodyCategory
 from app.features.body_category.schemas import BodyCategoryResponse
 
@@ -11,7 +11,7 @@ router = APIRouter()
 
 
 @router.get("/body-categories/{category_id}", response_model=BodyCategoryResponse, status_code=200, tags=["body-categories"])
-async def get_body_category(category_id: UUID, session: AsyncSession = Depends(get_session)) -> BodyCategoryResponse:
+async def get_body_category(category_id: UUID, session: AsyncSession = Depends(get_read_session)) -> BodyCategoryResponse:
 
     category = (await session.execute(
         select(BodyCategory)
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
 from app.Models.body_category import BodyCategory
 from app.features.body_category.schemas import BodyCategoryUpdate, BodyCategoryResponse
+from app.features.training_plan.execute_cache import invalidate_execute_cache
 
 
 router = APIRouter()
@@ -32,6 +33,7 @@ async def update_body_category(body: BodyCategoryUpdate, session: AsyncSession =
         raise HTTPException(status_code=409, detail="Name already exists")
 
     category.name = body.name
+    invalidate_execute_cache(session)
     
     await session.flush()
     await session.refresh(category)
@@ -0,0 +1,229 @@
+import struct
+import typing
+import uuid
+import zlib
+from functools import cache
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, timedelta, timezone
+
+from pydantic import BaseModel
+
+from app.features.data_sync.schemas import DataSyncExport
+from app.features.data_sync.tables import SYNC_TABLES
+
+# Binary sync archive, an alternative to the JSON document for export and import.
+#
+#   archive := MAGIC VERSION block* end
+#   block   := u16 key length, key (utf-8), u32 row count, u32 payload length, zlib(payload)
+#   end     := u16 0
+#
+# Every table writes at least one block (an empty table writes one block with zero rows), so a reader
+# sees every table of the document. The payload stores the block column by column in sync schema
+# field order; optional columns start with a null bitmap:
+#
+#   uuid      16 bytes per row
+#   int       i64 per row
+#   date      i32 per row (proleptic ordinal)
+#   datetime  i64 per row (microseconds since 1970-01-01, naive like the database columns)
+#   str       u32 dictionary size, (u32 length, utf-8)*, then a u32 dictionary index per row
+#
+# The denormalized names of the completion tables shrink to dictionary indices, and the repeated
+# foreign key UUIDs compress well once grouped by column. All integers are little-endian.
+MEDIA_TYPE = "application/vnd.bearmode.sync-archive"
+MAGIC = b"BMSA"
+VERSION = 1
+
+# Upper bounds for one block of an uploaded archive, compressed and decompressed. The writers produce
+# blocks of a few thousand rows, far below this; larger headers mean a broken or hostile upload.
+MAX_BLOCK_ROWS = 100_000
+MAX_BLOCK_BYTES = 32 * 1024 * 1024
+
+_EPOCH = datetime(1970, 1, 1)
+_HEADER = struct.Struct("<II")
+_KEY_LENGTH = struct.Struct("<H")
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+@cache
+def column_kinds(schema: type[BaseModel]) -> list[tuple[str, str, bool]]:
+    # (field name, kind, nullable) for every field of a sync schema
+    kinds = {uuid.UUID: "uuid", int: "int", str: "str", datetime: "datetime", date: "date"}
+    columns = []
+    for name, field in schema.model_fields.items():
+        annotation = field.annotation
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        nullable = len(arguments) == 1
+        columns.append((name, kinds[arguments[0] if nullable else annotation], nullable))
+    return columns
+
+
+def _encode_column(kind: str, values: list) -> bytes:
+    count = len(values)
+    if kind == "uuid":
+        return b"".join(value.bytes if value is not None else bytes(16) for value in values)
+    if kind == "int":
+        return struct.pack(f"<{count}q", *(value or 0 for value in values))
+    if kind == "date":
+        return struct.pack(f"<{count}i", *(value.toordinal() if value is not None else 0 for value in values))
+    if kind == "datetime":
+        micros = []
+        for value in values:
+            if value is None:
+                micros.append(0)
+                continue
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            micros.append((value - _EPOCH) // timedelta(microseconds=1))
+        return struct.pack(f"<{count}q", *micros)
+
+    dictionary: dict[str, int] = {}
+    indices = [dictionary.setdefault(value or "", len(dictionary)) for value in values]
+    parts = [struct.pack("<I", len(dictionary))]
+    for value in dictionary:
+        encoded = value.encode("utf-8")
+        parts.append(struct.pack("<I", len(encoded)))
+        parts.append(encoded)
+    parts.append(struct.pack(f"<{count}I", *indices))
+    return b"".join(parts)
+
+
+def _decode_column(kind: str, count: int, payload: memoryview, offset: int) -> tuple[list, int]:
+    if kind == "uuid":
+        end = offset + 16 * count
+        return [uuid.UUID(bytes=bytes(payload[i:i + 16])) for i in range(offset, end, 16)], end
+    if kind == "int":
+        return list(struct.unpack_from(f"<{count}q", payload, offset)), offset + 8 * count
+    if kind == "date":
+        return [date.fromordinal(value) if value else None
+                for value in struct.unpack_from(f"<{count}i", payload, offset)], offset + 4 * count
+    if kind == "datetime":
+        return [_EPOCH + timedelta(microseconds=value)
+                for value in struct.unpack_from(f"<{count}q", payload, offset)], offset + 8 * count
+
+    (size,) = struct.unpack_from("<I", payload, offset)
+    offset += 4
+    dictionary = []
+    for _ in range(size):
+        (length,) = struct.unpack_from("<I", payload, offset)
+        offset += 4
+        dictionary.append(str(payload[offset:offset + length], "utf-8"))
+        offset += length
+    indices = struct.unpack_from(f"<{count}I", payload, offset)
+    return [dictionary[index] for index in indices], offset + 4 * count
+
+
+def encode_block(key: str, schema: type[BaseModel], rows: Sequence[Sequence]) -> bytes:
+    # rows are tuples in sync schema field order (e.g. rows of select(*sync_columns(...)))
+    parts = []
+    for index, (_, kind, nullable) in enumerate(column_kinds(schema)):
+        values = [row[index] for row in rows]
+        if nullable:
+            bitmap = bytearray((len(values) + 7) // 8)
+            for position, value in enumerate(values):
+                if value is None:
+                    bitmap[position // 8] |= 1 << (position % 8)
+            parts.append(bytes(bitmap))
+        parts.append(_encode_column(kind, values))
+
+    payload = zlib.compress(b"".join(parts), 6)
+    encoded_key = key.encode("utf-8")
+    return _KEY_LENGTH.pack(len(encoded_key)) + encoded_key + _HEADER.pack(len(rows), len(payload)) + payload
+
+
+def decode_block(schema: type[BaseModel], count: int, compressed: bytes) -> list[dict]:
+    try:
+        # Decompress with a limit, so a small block cannot expand into gigabytes
+        decompressor = zlib.decompressobj()
+        payload = decompressor.decompress(compressed, MAX_BLOCK_BYTES)
+        if decompressor.unconsumed_tail:
+            raise ArchiveError("Archive block too large")
+        if not decompressor.eof:
+            raise ArchiveError("Corrupt archive block: truncated payload")
+        payload = memoryview(payload)
+        offset = 0
+        columns = {}
+        for name, kind, nullable in column_kinds(schema):
+            nulls = None
+            if nullable:
+                length = (count + 7) // 8
+                nulls = payload[offset:offset + length]
+                offset += length
+            values, offset = _decode_column(kind, count, payload, offset)
+            if nulls is not None:
+                values = [None if nulls[i // 8] & (1 << (i % 8)) else value for i, value in enumerate(values)]
+            columns[name] = values
+    except ArchiveError:
+        raise
+    except (zlib.error, struct.error, IndexError, UnicodeDecodeError, ValueError) as e:
+        raise ArchiveError(f"Corrupt archive block: {e}") from e
+
+    if offset != len(payload):
+        raise ArchiveError("Corrupt archive block: unexpected trailing data")
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())] if names else []
+
+
+def archive_header() -> bytes:
+    return MAGIC + bytes([VERSION])
+
+
+def archive_end() -> bytes:
+    return _KEY_LENGTH.pack(0)
+
+
+def encode_archive(data: DataSyncExport, block_rows: int = 2000) -> bytes:
+    parts = [archive_header()]
+    for key, _, schema in SYNC_TABLES:
+        names = list(schema.model_fields)
+        rows = [tuple(getattr(row, name) for name in names) for row in getattr(data, key)]
+        for start in range(0, max(len(rows), 1), block_rows):
+            parts.append(encode_block(key, schema, rows[start:start + block_rows]))
+    parts.append(archive_end())
+    return b"".join(parts)
+
+
+async def iter_archive_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[str, dict | None]]:
+    # Reads an archive while it is received and yields rows in the same shape as
+    # stream_parser.iter_sync_rows: (key, None) when a table starts, then (key, row) per row.
+    # Only the current block is held in memory.
+    schemas = {key: schema for key, _, schema in SYNC_TABLES}
+    chunks = aiter(chunks)
+    buffer = bytearray()
+
+    async def read(size: int) -> bytes:
+        while len(buffer) < size:
+            chunk = await anext(chunks, None)
+            if chunk is None:
+                raise ArchiveError("Truncated archive")
+            buffer.extend(chunk)
+        data = bytes(buffer[:size])
+        del buffer[:size]
+        return data
+
+    if await read(len(MAGIC) + 1) != archive_header():
+        raise ArchiveError("Not a sync archive or unsupported version")
+
+    started = set()
+    while True:
+        (key_length,) = _KEY_LENGTH.unpack(await read(_KEY_LENGTH.size))
+        if key_length == 0:
+            break
+        key = (await read(key_length)).decode("utf-8", errors="replace")
+        if key not in schemas:
+            raise ArchiveError(f"Unknown table: {key}")
+        count, length = _HEADER.unpack(await read(_HEADER.size))
+        if count > MAX_BLOCK_ROWS or length > MAX_BLOCK_BYTES:
+            raise ArchiveError("Archive block too large")
+
+        if key not in started:
+            started.add(key)
+            yield key, None
+        for row in decode_block(schemas[key], count, await read(length)):
+            yield key, row
+
+    if buffer or await anext(chunks, None) is not None:
+        raise ArchiveError("Unexpected data after archive")
+
@@ -0,0 +1,249 @@
+from collections.abc import AsyncIterator, Collection, Iterable
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.features.data_sync.schemas import DataSyncExport
+from app.features.data_sync.tables import SYNC_TABLES
+
+# Rows per COPY call when staging a streamed document
+STREAM_BATCH_SIZE = 5000
+
+
+class ImportValidationError(ValueError):
+    # Raised when the staged data violates primary key uniqueness or referential integrity
+    def __init__(self, problems: list[str]):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+def staging_name(table_name: str) -> str:
+    return f"staging_{table_name}"
+
+
+async def create_staging_tables(session: AsyncSession) -> None:
+    # Temporary tables are private to this connection and dropped automatically at the end of the
+    # transaction, so loading them takes no locks on the real tables
+    for _, model, _ in SYNC_TABLES:
+        table_name = model.__tablename__
+        await session.execute(text(
+            f'CREATE TEMP TABLE "{staging_name(table_name)}" (LIKE "{table_name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+        ))
+
+
+async def copy_into_staging(session: AsyncSession, table_name: str, columns: list[str], records: Iterable[tuple]) -> None:
+    # Bulk loads the records with the COPY protocol of asyncpg on the session's own connection
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging_name(table_name), records=records, columns=columns
+    )
+
+
+async def validate_staging(session: AsyncSession, include_live: bool = False, keep_existing: Collection[str] = ()) -> None:
+    # Checks all staged tables set-wise instead of row by row: duplicate primary keys, duplicate
+    # values of unique columns (names) and foreign keys that point to rows missing from the staged
+    # data. With include_live (merge import) a reference may also point to a row that already exists
+    # in the live table, and a unique value must not be taken by a live row with another id.
+    # keep_existing: tables that are merged with merge_staging(insert_only=...), see unique_problems.
+    problems = []
+
+    for _, model, _ in SYNC_TABLES:
+        table = model.__table__
+        staged = staging_name(table.name)
+
+        primary_key = ", ".join(f'"{column.name}"' for column in table.primary_key.columns)
+        duplicates = (await session.execute(text(
+            f'SELECT count(*) FROM (SELECT 1 FROM "{staged}" GROUP BY {primary_key} HAVING count(*) > 1) d'
+        ))).scalar()
+        if duplicates:
+            problems.append(f"{table.name}: {duplicates} duplicate ids")
+
+        for column in [column.name for column in table.columns if column.unique]:
+            problems.extend(await unique_problems(session, table.name, column, include_live, table.name in keep_existing))
+
+        for foreign_key in sorted(table.foreign_keys, key=lambda fk: fk.parent.name):
+            column = foreign_key.parent.name
+            referenced_column = foreign_key.column.name
+            referenced_tables = [staging_name(foreign_key.column.table.name)]
+            if include_live:
+                referenced_tables.append(foreign_key.column.table.name)
+            not_exists = " ".join(
+                f'AND NOT EXISTS (SELECT 1 FROM "{referenced}" p WHERE p."{referenced_column}" = c."{column}")'
+                for referenced in referenced_tables
+            )
+            missing = (await session.execute(text(
+                f'SELECT count(*) FROM "{staged}" c WHERE c."{column}" IS NOT NULL {not_exists}'
+            ))).scalar()
+            if missing:
+                problems.append(f"{table.name}.{column}: {missing} rows reference missing {foreign_key.column.table.name}")
+
+    if problems:
+        raise ImportValidationError(problems)
+
+
+async def unique_problems(session: AsyncSession, table_name: str, column: str, include_live: bool, keep_existing: bool = False) -> list[str]:
+    # Values of a unique column that occur more than once in the staged rows or, with include_live,
+    # that belong to a live row with another id. This includes live rows the same import renames:
+    # the upsert checks the unique index row by row, so whether the old value is gone in time would
+    # depend on the insert order (such a rename has to be split into two imports).
+    # With keep_existing live rows stay as they are and only staged rows with new ids are inserted.
+    staged = staging_name(table_name)
+    problems = []
+
+    duplicates = (await session.execute(text(
+        f'SELECT count(*) FROM (SELECT 1 FROM "{staged}" GROUP BY "{column}" HAVING count(*) > 1) d'
+    ))).scalar()
+    if duplicates:
+        problems.append(f"{table_name}.{column}: {duplicates} duplicate values")
+
+    if include_live:
+        skipped = f'AND NOT EXISTS (SELECT 1 FROM "{table_name}" e WHERE e.id = s.id)' if keep_existing else ""
+        taken, renamed = (await session.execute(text(
+            f'SELECT count(*) FILTER (WHERE o.id IS NULL), count(*) FILTER (WHERE o.id IS NOT NULL) '
+            f'FROM "{staged}" s JOIN "{table_name}" t ON t."{column}" = s."{column}" AND t.id <> s.id '
+            f'LEFT JOIN "{staged}" o ON o.id = t.id '
+            f'WHERE TRUE {skipped}'
+        ))).one()
+        if keep_existing:
+            # Staged rows of existing ids are skipped, so the live row keeps its value
+            taken, renamed = taken + renamed, 0
+        if taken:
+            problems.append(f"{table_name}.{column}: {taken} values already used by other rows")
+        if renamed:
+            problems.append(f"{table_name}.{column}: {renamed} values taken from rows renamed in the same import")
+
+    return problems
+
+
+async def insert_staging(session: AsyncSession, keys: list[str]) -> dict[str, int]:
+    # Copies the staged rows of the given tables into the live tables, in document order
+    counts = {}
+    for key, model, _ in SYNC_TABLES:
+        if key not in keys:
+            continue
+        columns = ", ".join(f'"{column.name}"' for column in model.__table__.columns)
+        result = await session.execute(text(
+            f'INSERT INTO "{model.__tablename__}" ({columns}) SELECT {columns} FROM "{staging_name(model.__tablename__)}"'
+        ))
+        counts[key] = result.rowcount
+    return counts
+
+
+async def swap_in_staging(session: AsyncSession) -> dict[str, int]:
+    # Replaces the live data with the staged data. This is the only step that locks the real tables,
+    # and it runs entirely inside the database (no per-row round trips) right before the commit.
+    table_names = [model.__tablename__ for _, model, _ in SYNC_TABLES]
+    await session.execute(text("TRUNCATE " + ", ".join(f'"{name}"' for name in table_names)))
+    return await insert_staging(session, [key for key, _, _ in SYNC_TABLES])
+
+
+async def merge_staging(session: AsyncSession, keys: list[str] | None = None, insert_only: Collection[str] = ()) -> dict[str, dict[str, int]]:
+    # Upserts the staged rows by primary key in one statement per table (all tables or the given ones).
+    # The DO UPDATE only fires for rows whose values actually differ, so unchanged rows are neither
+    # rewritten nor returned; xmax = 0 identifies rows that were freshly inserted.
+    # Tables in insert_only only get their missing rows (DO NOTHING); existing rows are never changed.
+    counts = {}
+    for key, model, _ in SYNC_TABLES:
+        if keys is not None and key not in keys:
+            continue
+        table = model.__table__
+        staged = staging_name(table.name)
+        primary_key = [column.name for column in table.primary_key.columns]
+        values = [column.name for column in table.columns if column.name not in primary_key]
+        columns = ", ".join(f'"{column.name}"' for column in table.columns)
+        conflict = ", ".join(f'"{name}"' for name in primary_key)
+        assignments = ", ".join(f'"{name}" = EXCLUDED."{name}"' for name in values)
+        current = ", ".join(f'"{table.name}"."{name}"' for name in values)
+        incoming = ", ".join(f'EXCLUDED."{name}"' for name in values)
+
+        total = (await session.execute(text(f'SELECT count(*) FROM "{staged}"'))).scalar()
+        if key in insert_only:
+            inserted = (await session.execute(text(
+                f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{staged}" ON CONFLICT ({conflict}) DO NOTHING'
+            ))).rowcount
+            counts[key] = {"inserted": inserted, "updated": 0, "unchanged": total - inserted}
+            continue
+
+        changed = (await session.execute(text(
+            f'WITH upserted AS ('
+            f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{staged}" '
+            f'ON CONFLICT ({conflict}) DO UPDATE SET {assignments} '
+            f'WHERE ({current}) IS DISTINCT FROM ({incoming}) '
+            f'RETURNING (xmax = 0) AS inserted) '
+            f'SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted'
+        ))).one()
+        inserted, updated = changed
+        counts[key] = {"inserted": inserted, "updated": updated, "unchanged": total - inserted - updated}
+    return counts
+
+
+async def stage_document(session: AsyncSession, data: DataSyncExport) -> None:
+    await create_staging_tables(session)
+
+    for key, model, schema in SYNC_TABLES:
+        columns = list(schema.model_fields)
+        records = (tuple(getattr(row, column) for column in columns) for row in getattr(data, key))
+        await copy_into_staging(session, model.__tablename__, columns, records)
+
+
+async def stage_rows(session: AsyncSession, rows: AsyncIterator[tuple[str, dict | None]], batch_size: int = STREAM_BATCH_SIZE) -> None:
+    # Stages a streamed document (see stream_parser.iter_sync_rows): every row is validated against
+    # its sync schema and copied in batches, so at most one batch is held in memory
+    await create_staging_tables(session)
+    tables = {key: (model, list(schema.model_fields), schema) for key, model, schema in SYNC_TABLES}
+    row_counts = {}
+    batch_key = None
+    batch = []
+
+    async def flush() -> None:
+        if batch:
+            model, columns, _ = tables[batch_key]
+            await copy_into_staging(session, model.__tablename__, columns, batch)
+            batch.clear()
+
+    async for key, row in rows:
+        if key not in tables:
+            raise ImportValidationError([f"Unknown table: {key}"])
+        if row is None:
+            row_counts.setdefault(key, 0)
+            continue
+        if key != batch_key or len(batch) >= batch_size:
+            await flush()
+            batch_key = key
+        index = row_counts.get(key, 0)
+        row_counts[key] = index + 1
+
+        _, columns, schema = tables[key]
+        try:
+            validated = schema.model_validate(row)
+        except ValidationError as e:
+            raise ImportValidationError([f"{key}[{index}].{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()]) from e
+        batch.append(tuple(getattr(validated, column) for column in columns))
+
+    await flush()
+    missing = [key for key in tables if key not in row_counts]
+    if missing:
+        raise ImportValidationError([f"Missing table: {key}" for key in missing])
+
+
+async def copy_import(session: AsyncSession, data: DataSyncExport) -> dict[str, int]:
+    # Replace import: COPY into staging tables, validate in bulk, swap into place.
+    # Everything runs in the session's transaction, so a failure leaves the live data untouched.
+    await stage_document(session, data)
+    await validate_staging(session)
+    return await swap_in_staging(session)
+
+
+async def merge_import(session: AsyncSession, data: DataSyncExport) -> dict[str, dict[str, int]]:
+    # Merge import: rows of the document are inserted or updated, rows missing from it are kept
+    await stage_document(session, data)
+    await validate_staging(session, include_live=True)
+    return await merge_staging(session)
+
+
+async def stream_import(session: AsyncSession, rows: AsyncIterator[tuple[str, dict | None]], merge: bool = False) -> dict:
+    # Same as copy_import / merge_import, but for a document that is parsed while it is received
+    await stage_rows(session, rows)
+    await validate_staging(session, include_live=merge)
+    return await merge_staging(session) if merge else await swap_in_staging(session)
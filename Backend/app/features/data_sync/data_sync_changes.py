@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import exists, select, text
+
+from app.infrastructure.change_log import pruned_before
+from app.infrastructure.database import read_transaction_session
+from app.Models.sync_change import SyncChange
+from app.features.data_sync.schemas import DataSyncChanges, DataSyncExport
+from app.features.data_sync.tables import SYNC_TABLES, sync_columns
+
+router = APIRouter(tags=["data-sync"])
+
+# Oldest transaction still running when the snapshot was taken. Every transaction with a smaller id
+# has finished, so all changes below it are final. Returned as watermark and used as the upper bound,
+# the next request continues exactly where this one stopped, even if transactions commit out of order.
+SNAPSHOT_XMIN = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+@router.get("/data-sync/changes", response_model=DataSyncChanges)
+async def get_changes(since: int | None = Query(None, ge=0)):
+    # Without `since` (first sync), after a replace import and for a `since` older than the pruned
+    # part of the change log, only reset=True and the watermark are returned. The client then drops
+    # its local data, loads the full data set from the streaming /data-sync/export and continues with
+    # since=watermark. The export is read after the watermark, so changes from the next delta may
+    # already be in it; applying them again is harmless (changes carry the current row version).
+    async with read_transaction_session(isolation_level="REPEATABLE READ") as session:
+        watermark = (await session.execute(SNAPSHOT_XMIN)).scalar_one()
+        if since is not None and since > watermark:
+            raise HTTPException(status_code=400, detail="Invalid watermark")
+
+        in_range = SyncChange.txid.between(since or 0, watermark - 1)
+        pruned = await pruned_before(session)
+        reset = since is None or (pruned is not None and since < pruned) or (await session.execute(
+            select(exists().where(in_range, SyncChange.operation == "truncate"))
+        )).scalar()
+
+        changes = {key: [] for key, _, _ in SYNC_TABLES}
+        deleted = {}
+        if not reset:
+            for key, model, schema in SYNC_TABLES:
+                columns = sync_columns(model, schema)
+                names = [column.name for column in columns]
+                changed_ids = select(SyncChange.row_id).where(
+                    in_range, SyncChange.table_name == model.__tablename__, SyncChange.row_id.is_not(None)
+                ).distinct()
+                # Changed rows that no longer exist were deleted (possibly after an insert or update)
+                deleted[key] = list((await session.execute(
+                    changed_ids.where(~exists().where(model.id == SyncChange.row_id))
+                )).scalars())
+                query = select(*columns).where(model.id.in_(changed_ids))
+                changes[key] = [dict(zip(names, row)) for row in await session.execute(query)]
+
+    return DataSyncChanges(
+        watermark=watermark,
+        reset=reset,
+        changes=DataSyncExport.model_validate(changes),
+        deleted=deleted,
+    )
@@ -1,45 +1,133 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-
-from app.infrastructure.database import get_session
-from app.Models.profile import Profile
-from app.Models.body_category import BodyCategory
-from app.Models.training_exercise_item import TrainingExerciseItem
-from app.Models.training_plan import TrainingPlan, TrainingExercise
-from app.Models.training_plan_completion import TrainingPlanCompletion
-from app.Models.training_exercise_completion import TrainingExerciseCompletion
-
-from app.features.data_sync.schemas import (
-    DataSyncExport,
-    ProfileSync,
-    BodyCategorySync,
-    TrainingExerciseItemSync,
-    TrainingPlanSync,
-    TrainingExerciseSync,
-    TrainingPlanCompletionSync,
-    TrainingExerciseCompletionSync
-)
+import asyncio
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Row, Select, select, text
+
+from app.config import settings
+from app.infrastructure.database import read_transaction_session
+from app.features.data_sync.archive import MEDIA_TYPE as ARCHIVE_MEDIA_TYPE, archive_end, archive_header, encode_block
+from app.features.data_sync.schemas import DataSyncExport
+from app.features.data_sync.tables import SYNC_TABLES, sync_columns
 
 router = APIRouter(tags=["data-sync"])
 
-@router.get("/data-sync/export", response_model=DataSyncExport)
-async def export_data(session: AsyncSession = Depends(get_session)):
-    # Fetch all data from all tables
-    profiles = (await session.execute(select(Profile))).scalars().all()
-    body_categories = (await session.execute(select(BodyCategory))).scalars().all()
-    training_exercise_items = (await session.execute(select(TrainingExerciseItem))).scalars().all()
-    training_plans = (await session.execute(select(TrainingPlan))).scalars().all()
-    training_exercises = (await session.execute(select(TrainingExercise))).scalars().all()
-    training_plan_completions = (await session.execute(select(TrainingPlanCompletion))).scalars().all()
-    training_exercise_completions = (await session.execute(select(TrainingExerciseCompletion))).scalars().all()
-
-    return DataSyncExport(
-        profiles=[ProfileSync.model_validate(p) for p in profiles],
-        body_categories=[BodyCategorySync.model_validate(b) for b in body_categories],
-        training_exercise_items=[TrainingExerciseItemSync.model_validate(t) for t in training_exercise_items],
-        training_plans=[TrainingPlanSync.model_validate(p) for p in training_plans],
-        training_exercises=[TrainingExerciseSync.model_validate(e) for e in training_exercises],
-        training_plan_completions=[TrainingPlanCompletionSync.model_validate(c) for c in training_plan_completions],
-        training_exercise_completions=[TrainingExerciseCompletionSync.model_validate(c) for c in training_exercise_completions]
-    )
+# Rows fetched per server-side cursor round trip
+EXPORT_CHUNK_SIZE = 2000
+# Fetched chunks a table may buffer ahead of the writer
+EXPORT_QUEUE_CHUNKS = 4
+
+
+async def _drain(queue: asyncio.Queue) -> AsyncIterator[Sequence[Row]]:
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+async def export_partitions(queries: dict[str, Select] | None = None) -> AsyncIterator[tuple[str, type[BaseModel], AsyncIterator[Sequence[Row]]]]:
+    # Yields (key, sync schema, fetched row chunks) per table in document order while all tables are
+    # read concurrently. A coordinating REPEATABLE READ transaction exports its snapshot and every
+    # table is read on its own pooled connection that imports this snapshot, so the document is as
+    # consistent as if it had been read in one transaction. Each table buffers at most
+    # EXPORT_QUEUE_CHUNKS chunks ahead of the writer, so memory stays bounded.
+    # `queries` replaces the select of a table (e.g. to export a single profile).
+    async with read_transaction_session(isolation_level="REPEATABLE READ") as coordinator:
+        snapshot = (await coordinator.execute(text("SELECT pg_export_snapshot()"))).scalar_one()
+        queues = [asyncio.Queue(maxsize=EXPORT_QUEUE_CHUNKS) for _ in SYNC_TABLES]
+        # Tables start in document order, so the table the writer waits for always has a connection
+        connections = asyncio.Semaphore(max(settings.data_sync_export_connections, 1))
+
+        async def fetch(queue: asyncio.Queue, query: Select) -> None:
+            try:
+                async with connections, read_transaction_session(snapshot=snapshot) as session:
+                    result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+                    async for rows in result.partitions():
+                        await queue.put(rows)
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+
+        tasks = [
+            asyncio.create_task(fetch(queue, (queries or {}).get(key, select(*sync_columns(model, schema)))))
+            for queue, (key, model, schema) in zip(queues, SYNC_TABLES)
+        ]
+        try:
+            for queue, (key, _, schema) in zip(queues, SYNC_TABLES):
+                yield key, schema, _drain(queue)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def export_chunks(queries: dict[str, Select] | None = None) -> AsyncIterator[bytes]:
+    # Writes the DataSyncExport JSON document piece by piece: every fetched chunk is encoded and
+    # sent right away, so neither ORM objects nor the full document are ever held in memory
+    yield b"{"
+    index = 0
+    async for key, schema, partitions in export_partitions(queries):
+        names = list(schema.model_fields)
+        yield (b"," if index else b"") + to_json(key) + b":["
+        first = True
+        async for rows in partitions:
+            chunk = b",".join(to_json(dict(zip(names, row))) for row in rows)
+            yield (b"" if first else b",") + chunk
+            first = False
+        yield b"]"
+        index += 1
+    yield b"}"
+
+
+async def archive_chunks(queries: dict[str, Select] | None = None) -> AsyncIterator[bytes]:
+    # Same as export_chunks, but every fetched chunk becomes one compressed column block of the
+    # binary archive (see archive.py)
+    yield archive_header()
+    async for key, schema, partitions in export_partitions(queries):
+        empty = True
+        async for rows in partitions:
+            yield encode_block(key, schema, rows)
+            empty = False
+        if empty:
+            yield encode_block(key, schema, [])
+    yield archive_end()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(request: Request, queries: dict[str, Select] | None = None) -> StreamingResponse:
+    # The binary archive is returned when the client asks for it via Accept; it is compressed already
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if ARCHIVE_MEDIA_TYPE in request.headers.get("Accept", ""):
+        return StreamingResponse(archive_chunks(queries), media_type=ARCHIVE_MEDIA_TYPE, headers=headers)
+
+    # gzip is used when the client accepts it; browsers and HTTP clients decompress transparently
+    chunks = export_chunks(queries)
+
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        chunks = gzip_chunks(chunks)
+
+    return StreamingResponse(chunks, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/data-sync/export",
+    response_model=None,
+    responses={200: {"model": DataSyncExport, "content": {ARCHIVE_MEDIA_TYPE: {}}}},
+)
+async def export_data(request: Request) -> StreamingResponse:
+    return export_response(request)
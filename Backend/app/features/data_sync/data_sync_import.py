@@ -1,59 +1,35 @@
-from fastapi import APIRouter, Depends
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete
 
 from app.infrastructure.database import get_session
-from app.Models.profile import Profile
-from app.Models.body_category import BodyCategory
-from app.Models.training_exercise_item import TrainingExerciseItem
-from app.Models.training_plan import TrainingPlan, TrainingExercise
-from app.Models.training_plan_completion import TrainingPlanCompletion
-from app.Models.training_exercise_completion import TrainingExerciseCompletion
 
+from app.features.data_sync.copy_import import ImportValidationError, copy_import, merge_import
 from app.features.data_sync.schemas import DataSyncExport
+from app.features.training_plan.execute_cache import invalidate_execute_cache
+from app.features.excersice_completion.completion_references import invalidate_reference_cache
+from app.features.progress.history_cache import invalidate_progress_cache
 
 router = APIRouter(tags=["data-sync"])
 
 @router.post("/data-sync/import")
-async def import_data(data: DataSyncExport, session: AsyncSession = Depends(get_session)):
-    # 1. Delete all existing data in reverse dependency order
-    await session.execute(delete(TrainingExerciseCompletion))
-    await session.execute(delete(TrainingPlanCompletion))
-    await session.execute(delete(TrainingExercise))
-    await session.execute(delete(TrainingPlan))
-    await session.execute(delete(TrainingExerciseItem))
-    await session.execute(delete(BodyCategory))
-    await session.execute(delete(Profile))
-    
-    # 2. Insert new data in dependency order
-    for p in data.profiles:
-        session.add(Profile(**p.model_dump()))
-    await session.flush()
-    
-    for b in data.body_categories:
-        session.add(BodyCategory(**b.model_dump()))
-    await session.flush()
-        
-    for tp in data.training_plans:
-        session.add(TrainingPlan(**tp.model_dump()))
-    await session.flush()
-        
-    for t in data.training_exercise_items:
-        session.add(TrainingExerciseItem(**t.model_dump()))
-    await session.flush()
-        
-    for te in data.training_exercises:
-        session.add(TrainingExercise(**te.model_dump()))
-    await session.flush()
-        
-    for tpc in data.training_plan_completions:
-        session.add(TrainingPlanCompletion(**tpc.model_dump()))
-    await session.flush()
-        
-    for tec in data.training_exercise_completions:
-        session.add(TrainingExerciseCompletion(**tec.model_dump()))
-    await session.flush()
-        
-    await session.commit()
-    
-    return {"message": "Data imported successfully."}
+async def import_data(
+    data: DataSyncExport,
+    mode: Literal["replace", "merge"] = Query("replace"),
+    session: AsyncSession = Depends(get_session),
+):
+    invalidate_execute_cache(session)
+    invalidate_reference_cache(session)
+    invalidate_progress_cache(session)
+
+    # Bulk-load into staging tables via COPY, validate, then either replace the live data in one step
+    # or upsert it by primary key (merge). The transaction is committed by get_session.
+    try:
+        if mode == "merge":
+            counts = await merge_import(session, data)
+        else:
+            counts = await copy_import(session, data)
+    except ImportValidationError as e:
+        raise HTTPException(status_code=400, detail=e.problems)
+
+    return {"message": "Data imported successfully.", "counts": counts}
@@ -0,0 +1,49 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database import get_session
+
+from app.features.data_sync.archive import MEDIA_TYPE as ARCHIVE_MEDIA_TYPE, ArchiveError, iter_archive_rows
+from app.features.data_sync.copy_import import ImportValidationError, stream_import
+from app.features.data_sync.schemas import DataSyncExport
+from app.features.data_sync.stream_parser import SyncDocumentError, decompressed, iter_sync_rows
+from app.features.training_plan.execute_cache import invalidate_execute_cache
+from app.features.excersice_completion.completion_references import invalidate_reference_cache
+from app.features.progress.history_cache import invalidate_progress_cache
+
+router = APIRouter(tags=["data-sync"])
+
+@router.post(
+    "/data-sync/import/stream",
+    openapi_extra={"requestBody": {"content": {
+        "application/json": {"schema": DataSyncExport.model_json_schema(ref_template="#/components/schemas/{model}")},
+        ARCHIVE_MEDIA_TYPE: {},
+    }}},
+)
+async def import_data_stream(
+    request: Request,
+    mode: Literal["replace", "merge"] = Query("replace"),
+    session: AsyncSession = Depends(get_session),
+):
+    # Like /data-sync/import, but the body (optionally Content-Encoding: gzip) is parsed while it is
+    # received and copied into the staging tables batch by batch, so memory use does not depend on
+    # the size of the document. Content-Type selects JSON or the binary archive.
+    invalidate_execute_cache(session)
+    invalidate_reference_cache(session)
+    invalidate_progress_cache(session)
+
+    gzip = request.headers.get("Content-Encoding", "").lower() == "gzip"
+    chunks = decompressed(request.stream(), gzip)
+    if request.headers.get("Content-Type", "").startswith(ARCHIVE_MEDIA_TYPE):
+        rows = iter_archive_rows(chunks)
+    else:
+        rows = iter_sync_rows(chunks)
+    try:
+        counts = await stream_import(session, rows, merge=mode == "merge")
+    except (SyncDocumentError, ArchiveError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportValidationError as e:
+        raise HTTPException(status_code=400, detail=e.problems)
+
+    return {"message": "Data imported successfully.", "counts": counts}
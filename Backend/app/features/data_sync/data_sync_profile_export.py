@@ -0,0 +1,27 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database import get_read_session
+from app.Models.profile import Profile
+
+from app.features.data_sync.archive import MEDIA_TYPE as ARCHIVE_MEDIA_TYPE
+from app.features.data_sync.data_sync_export import export_response
+from app.features.data_sync.profile_scope import profile_queries
+from app.features.data_sync.schemas import DataSyncExport
+
+router = APIRouter(tags=["data-sync"])
+
+@router.get(
+    "/data-sync/profiles/{profile_id}/export",
+    response_model=None,
+    responses={200: {"model": DataSyncExport, "content": {ARCHIVE_MEDIA_TYPE: {}}}},
+)
+async def export_profile_data(profile_id: UUID, request: Request, session: AsyncSession = Depends(get_read_session)) -> StreamingResponse:
+    # Same document as /data-sync/export, restricted to one profile: its plans and completions plus
+    # the exercise items and body categories they reference
+    if await session.get(Profile, profile_id) is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return export_response(request, profile_queries(profile_id))
@@ -0,0 +1,35 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database import get_session
+
+from app.features.data_sync.copy_import import ImportValidationError
+from app.features.data_sync.profile_scope import import_profile
+from app.features.data_sync.schemas import DataSyncExport
+from app.features.training_plan.execute_cache import invalidate_execute_cache
+from app.features.excersice_completion.completion_references import invalidate_reference_cache
+from app.features.progress.history_cache import invalidate_progress_cache
+
+router = APIRouter(tags=["data-sync"])
+
+@router.post("/data-sync/profiles/{profile_id}/import")
+async def import_profile_data(profile_id: UUID, data: DataSyncExport, session: AsyncSession = Depends(get_session)):
+    # Replaces only this profile's plans and completions (e.g. a document from
+    # /data-sync/profiles/{profile_id}/export); other profiles are not touched
+    invalidate_execute_cache(session)
+    invalidate_reference_cache(session)
+    invalidate_progress_cache(session)
+
+    try:
+        counts = await import_profile(session, profile_id, data)
+    except HTTPException:
+        raise
+    except ImportValidationError as e:
+        raise HTTPException(status_code=400, detail=e.problems)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"message": "Profile imported successfully.", "counts": counts}
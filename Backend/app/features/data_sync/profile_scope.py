@@ -0,0 +1,142 @@
+from uuid import UUID
+from sqlalchemy import Select, delete, select, text, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.Models.profile import Profile
+from app.Models.body_category import BodyCategory
+from app.Models.training_exercise_item import TrainingExerciseItem
+from app.Models.training_plan import TrainingPlan, TrainingExercise
+from app.Models.training_plan_completion import TrainingPlanCompletion
+from app.Models.training_exercise_completion import TrainingExerciseCompletion
+
+from app.features.data_sync.copy_import import (
+    ImportValidationError,
+    insert_staging,
+    merge_staging,
+    stage_document,
+    staging_name,
+    validate_staging,
+)
+from app.features.data_sync.schemas import DataSyncExport
+from app.features.data_sync.tables import SYNC_TABLES, sync_columns
+
+# Rows owned by a profile; a profile import replaces them
+OWNED_TABLES = ["training_plans", "training_exercises", "training_plan_completions", "training_exercise_completions"]
+# The profile row and the exercise items / body categories it references. The profile row is upserted.
+# Items and categories are shared between profiles, so a profile import only inserts missing ones and
+# never changes or deletes existing ones (an older document must not rename them for everyone).
+SHARED_TABLES = ["profiles", "body_categories", "training_exercise_items"]
+INSERT_ONLY_TABLES = ["body_categories", "training_exercise_items"]
+# (table, column, referenced table) of references that must stay within the profile's document
+PROFILE_REFERENCES = [
+    ("training_exercises", "training_plan_id", "training_plans"),
+    ("training_plan_completions", "training_plan_id", "training_plans"),
+    ("training_exercise_completions", "training_plan_id", "training_plans"),
+    ("training_exercise_completions", "exercise_id", "training_exercises"),
+]
+
+
+def profile_queries(profile_id: UUID) -> dict[str, Select]:
+    # Selects for a profile's part of the sync document. Every filter is served by an index on
+    # profile_id or training_plan_id, so the cost depends on the profile's data only.
+    schemas = {key: (model, schema) for key, model, schema in SYNC_TABLES}
+
+    def columns(key: str) -> list:
+        return sync_columns(*schemas[key])
+
+    plan_ids = select(TrainingPlan.id).where(TrainingPlan.profile_id == profile_id)
+    item_ids = select(TrainingExercise.training_exercise_item_id).where(TrainingExercise.training_plan_id.in_(plan_ids))
+    category_ids = union(
+        select(TrainingExerciseItem.body_category_id).where(TrainingExerciseItem.id.in_(item_ids)),
+        select(TrainingExerciseCompletion.body_category_id).where(
+            TrainingExerciseCompletion.profile_id == profile_id,
+            TrainingExerciseCompletion.body_category_id.is_not(None),
+        ),
+    )
+
+    return {
+        "profiles": select(*columns("profiles")).where(Profile.id == profile_id),
+        "body_categories": select(*columns("body_categories")).where(BodyCategory.id.in_(category_ids)),
+        "training_exercise_items": select(*columns("training_exercise_items")).where(TrainingExerciseItem.id.in_(item_ids)),
+        "training_plans": select(*columns("training_plans")).where(TrainingPlan.profile_id == profile_id),
+        "training_exercises": select(*columns("training_exercises")).where(TrainingExercise.training_plan_id.in_(plan_ids)),
+        "training_plan_completions": select(*columns("training_plan_completions")).where(TrainingPlanCompletion.profile_id == profile_id),
+        "training_exercise_completions": select(*columns("training_exercise_completions")).where(TrainingExerciseCompletion.profile_id == profile_id),
+    }
+
+
+async def _count(session: AsyncSession, sql: str, profile_id: UUID) -> int:
+    return (await session.execute(text(sql), {"profile_id": profile_id})).scalar()
+
+
+async def validate_profile_scope(session: AsyncSession, profile_id: UUID) -> None:
+    # The document may only contain this profile and rows that belong to it
+    problems = []
+    profiles = staging_name("profiles")
+
+    if await _count(session, f'SELECT count(*) FROM "{profiles}" WHERE id <> :profile_id', profile_id):
+        problems.append("profiles: document contains other profiles")
+    if not await _count(session, f'SELECT count(*) FROM "{profiles}" WHERE id = :profile_id', profile_id):
+        problems.append("profiles: document does not contain the profile")
+
+    for key in ["training_plans", "training_plan_completions", "training_exercise_completions"]:
+        if await _count(session, f'SELECT count(*) FROM "{staging_name(key)}" WHERE profile_id <> :profile_id', profile_id):
+            problems.append(f"{key}: rows belong to another profile")
+
+    name_taken = (await session.execute(text(
+        f'SELECT count(*) FROM "{profiles}" s JOIN profiles p ON p.name = s.name AND p.id <> s.id'
+    ))).scalar()
+    if name_taken:
+        problems.append("profiles: name already exists")
+
+    # Plans, exercises and completions may only refer to the profile's own plans and exercises
+    for key, column, referenced in PROFILE_REFERENCES:
+        outside = (await session.execute(text(
+            f'SELECT count(*) FROM "{staging_name(key)}" c '
+            f'WHERE NOT EXISTS (SELECT 1 FROM "{staging_name(referenced)}" p WHERE p.id = c."{column}")'
+        ))).scalar()
+        if outside:
+            problems.append(f"{key}.{column}: {outside} rows refer to {referenced} outside the document")
+
+    if problems:
+        raise ImportValidationError(problems)
+
+
+async def delete_profile_rows(session: AsyncSession, profile_id: UUID) -> None:
+    plan_ids = select(TrainingPlan.id).where(TrainingPlan.profile_id == profile_id)
+    await session.execute(delete(TrainingExerciseCompletion).where(TrainingExerciseCompletion.profile_id == profile_id))
+    await session.execute(delete(TrainingPlanCompletion).where(TrainingPlanCompletion.profile_id == profile_id))
+    await session.execute(delete(TrainingExercise).where(TrainingExercise.training_plan_id.in_(plan_ids)))
+    await session.execute(delete(TrainingPlan).where(TrainingPlan.profile_id == profile_id))
+
+
+async def check_foreign_ids(session: AsyncSession) -> None:
+    # After the profile's own rows were deleted, a staged id that still exists belongs to someone else
+    problems = []
+    for key in OWNED_TABLES:
+        taken = (await session.execute(text(
+            f'SELECT count(*) FROM "{staging_name(key)}" s WHERE EXISTS (SELECT 1 FROM "{key}" t WHERE t.id = s.id)'
+        ))).scalar()
+        if taken:
+            problems.append(f"{key}: {taken} ids are used by another profile")
+    if problems:
+        raise ImportValidationError(problems)
+
+
+async def import_profile(session: AsyncSession, profile_id: UUID, data: DataSyncExport) -> dict:
+    # Replaces one profile's plans and completions with the document's, upserts the profile and adds
+    # the exercise items and body categories it references if they are missing. Rows of other
+    # profiles and existing items and categories are not touched.
+    # The old rows are deleted before the references and names are validated, so the document cannot
+    # refer to plans that only exist in the version being replaced, and its plan names only collide
+    # with plans of other profiles. Everything runs in one transaction.
+    await stage_document(session, data)
+    await validate_profile_scope(session, profile_id)
+
+    await delete_profile_rows(session, profile_id)
+    await check_foreign_ids(session)
+    await validate_staging(session, include_live=True, keep_existing=INSERT_ONLY_TABLES)
+
+    counts = await merge_staging(session, SHARED_TABLES, insert_only=INSERT_ONLY_TABLES)
+    counts.update(await insert_staging(session, OWNED_TABLES))
+    return counts
@@ -81,3 +81,14 @@ class DataSyncExport(BaseModel):
     training_exercises: list[TrainingExerciseSync]
     training_plan_completions: list[TrainingPlanCompletionSync]
     training_exercise_completions: list[TrainingExerciseCompletionSync]
+
+
+class DataSyncChanges(BaseModel):
+    # Delta since a watermark: `changes` holds the current version of every inserted or updated row,
+    # `deleted` the ids of removed rows per table. With reset=True (first sync, a replace import in
+    # between or a pruned watermark) `changes` is empty: the client drops its local data, loads
+    # /data-sync/export and continues with since=watermark.
+    watermark: int
+    reset: bool
+    changes: DataSyncExport
+    deleted: dict[str, list[UUID]]
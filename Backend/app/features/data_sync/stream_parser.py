@@ -0,0 +1,129 @@
+import codecs
+import json
+import zlib
+from collections.abc import AsyncIterator
+
+# A single row of a sync document is small; a larger unparsed remainder means the input is broken
+MAX_PENDING_CHARS = 1024 * 1024
+# Upper bound for one piece of decompressed output, so a highly compressed chunk cannot blow up memory
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class SyncDocumentError(ValueError):
+    pass
+
+
+async def decompressed(chunks: AsyncIterator[bytes], gzip: bool) -> AsyncIterator[bytes]:
+    if not gzip:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    decompressor = zlib.decompressobj(31)  # wbits=31 -> gzip container
+    async for chunk in chunks:
+        while chunk:
+            try:
+                data = decompressor.decompress(chunk, DECOMPRESS_CHUNK_SIZE)
+            except zlib.error as e:
+                raise SyncDocumentError(f"Invalid gzip data: {e}") from e
+            chunk = decompressor.unconsumed_tail
+            if data:
+                yield data
+    if not decompressor.eof:
+        raise SyncDocumentError("Truncated gzip data")
+
+
+async def iter_sync_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[str, dict | None]]:
+    # Incremental parser for the sync document shape {"<table>": [{...}, ...], ...}.
+    # Yields (table key, None) when a table starts and (table key, row) as soon as a row is
+    # complete; only the not yet parsed remainder of the
+    # input is buffered, so memory stays bounded by the chunk size plus one row.
+    chunks = aiter(chunks)
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    state = "document"  # document -> key -> row -> row_separator -> key_separator -> end
+    key = None
+    finished = False
+
+    async def more() -> bool:
+        nonlocal buffer, position, finished
+        if finished:
+            return False
+        if len(buffer) - position > MAX_PENDING_CHARS:
+            raise SyncDocumentError("Row too large or malformed document")
+
+        chunk = await anext(chunks, None)
+        try:
+            text = text_decoder.decode(chunk if chunk is not None else b"", final=chunk is None)
+        except UnicodeDecodeError as e:
+            raise SyncDocumentError("Invalid UTF-8 in document") from e
+        buffer = buffer[position:] + text
+        position = 0
+        finished = chunk is None
+        return not finished or bool(text)
+
+    async def next_char() -> str | None:
+        # Skips whitespace and returns the next significant character without consuming it
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not await more():
+                return None
+
+    async def expect(characters: str) -> str:
+        nonlocal position
+        char = await next_char()
+        if char is None or char not in characters:
+            raise SyncDocumentError(f"Expected one of {characters!r}, got {char!r}")
+        position += 1
+        return char
+
+    async def next_value():
+        # JSON values (keys and rows) are decoded with raw_decode; an incomplete value fails until
+        # enough input has arrived. Strings and objects end with a closing character, so a value
+        # that decodes successfully is always complete.
+        nonlocal position
+        await next_char()
+        while True:
+            try:
+                value, position = _decoder.raw_decode(buffer, position)
+                return value
+            except json.JSONDecodeError as e:
+                if not await more():
+                    raise SyncDocumentError(f"Invalid JSON: {e.msg}") from e
+
+    while True:
+        if state == "document":
+            await expect("{")
+            state = "key" if await next_char() != "}" else "end"
+            if state == "end":
+                position += 1
+        elif state == "key":
+            key = await next_value()
+            if not isinstance(key, str):
+                raise SyncDocumentError("Expected a table name")
+            await expect(":")
+            await expect("[")
+            yield key, None
+            state = "row" if await next_char() != "]" else "row_separator"
+        elif state == "row":
+            row = await next_value()
+            if not isinstance(row, dict):
+                raise SyncDocumentError(f"Expected an object in {key}")
+            yield key, row
+            state = "row_separator"
+        elif state == "row_separator":
+            state = "row" if await expect(",]") == "," else "key_separator"
+        elif state == "key_separator":
+            state = "key" if await expect(",}") == "," else "end"
+        elif state == "end":
+            if await next_char() is not None:
+                raise SyncDocumentError("Unexpected data after document")
+            return
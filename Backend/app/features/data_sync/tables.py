@@ -0,0 +1,32 @@
+from app.Models.profile import Profile
+from app.Models.body_category import BodyCategory
+from app.Models.training_exercise_item import TrainingExerciseItem
+from app.Models.training_plan import TrainingPlan, TrainingExercise
+from app.Models.training_plan_completion import TrainingPlanCompletion
+from app.Models.training_exercise_completion import TrainingExerciseCompletion
+
+from app.features.data_sync.schemas import (
+    ProfileSync,
+    BodyCategorySync,
+    TrainingExerciseItemSync,
+    TrainingPlanSync,
+    TrainingExerciseSync,
+    TrainingPlanCompletionSync,
+    TrainingExerciseCompletionSync
+)
+
+# Tables of a sync document: (key in DataSyncExport, ORM model, sync schema), in the order of the document
+SYNC_TABLES = [
+    ("profiles", Profile, ProfileSync),
+    ("body_categories", BodyCategory, BodyCategorySync),
+    ("training_exercise_items", TrainingExerciseItem, TrainingExerciseItemSync),
+    ("training_plans", TrainingPlan, TrainingPlanSync),
+    ("training_exercises", TrainingExercise, TrainingExerciseSync),
+    ("training_plan_completions", TrainingPlanCompletion, TrainingPlanCompletionSync),
+    ("training_exercise_completions", TrainingExerciseCompletion, TrainingExerciseCompletionSync),
+]
+
+
+def sync_columns(model, schema) -> list:
+    # Core columns of the model that make up the sync schema, in schema field order
+    return [model.__table__.c[field] for field in schema.model_fields]
@@ -0,0 +1,51 @@
+from datetime import date, datetime
+from uuid import UUID, uuid4
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Models.training_exercise_completion import TrainingExerciseCompletion as TrainingExerciseCompletionModel
+from app.features.excersice_completion.schemas import TrainingExerciseCompletionCreate
+
+
+def completion_key(row: dict) -> tuple[UUID, date]:
+    # Primary key of a completion row (the table is partitioned by training_day)
+    return row["id"], row["training_day"]
+
+
+def completion_rows(exercise_completions: list[TrainingExerciseCompletionCreate]) -> list[dict]:
+    now = datetime.now()
+    return [
+        {
+            "id": ec.id or uuid4(),
+            "profile_id": ec.profile_id,
+            "training_plan_id": ec.training_plan_id,
+            "exercise_id": ec.exercise_id,
+            "exercise_description": ec.exercise_description,
+            "exercise_video_url": ec.exercise_video_url,
+            "body_category_id": ec.body_category_id,
+            "body_category_name": ec.body_category_name,
+            "order": ec.order,
+            "equipment": ec.equipment,
+            "reps": ec.reps,
+            "break_time_seconds": ec.break_time_seconds,
+            "created_at": now,
+            "training_day": ec.training_day,
+        }
+        for ec in exercise_completions
+    ]
+
+
+async def insert_completions(session: AsyncSession, rows: list[dict]) -> set[tuple[UUID, date]]:
+    # Idempotent multi-row insert: SQLAlchemy sends the rows as batched multi-row INSERT statements
+    # ("insertmanyvalues"), and rows whose primary key (id, training_day) already exists are skipped,
+    # so a client retrying an upload neither fails nor inserts twice (the client sends the training
+    # day, see TrainingExerciseCompletionCreate). Returns the keys (completion_key) of the new rows.
+    if not rows:
+        return set()
+
+    statement = (
+        insert(TrainingExerciseCompletionModel)
+        .on_conflict_do_nothing(index_elements=["id", "training_day"])
+        .returning(TrainingExerciseCompletionModel.id, TrainingExerciseCompletionModel.training_day)
+    )
+    result = await session.execute(statement, rows)
+    return {(id, training_day) for id, training_day in result}
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+class ReferenceCache:
+    # In-process existence cache for ids referenced by completions (profiles, plans, exercises, body
+    # categories): (table, id) -> exists. Both hits and misses are cached, so a client that keeps
+    # uploading completions for the same plan needs no validation query at all.
+    # Deleting or importing referenced rows clears the cache (see invalidate_reference_cache); entries read before
+    # the clear are dropped via the generation. Other worker processes do not see the clear, so every
+    # entry also expires after ttl_seconds. A stale hit is still caught by the foreign keys on insert.
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, UUID], tuple[bool, float]] = OrderedDict()
+        self.generation = 0
+
+    def get(self, table: str, id: UUID) -> bool | None:
+        entry = self._entries.get((table, id))
+        if entry is None:
+            return None
+
+        exists, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[(table, id)]
+            return None
+
+        self._entries.move_to_end((table, id))
+        return exists
+
+    def put(self, generation: int, table: str, ids: set[UUID], exists: bool) -> None:
+        if self.max_entries <= 0 or generation != self.generation:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        for id in ids:
+            self._entries[(table, id)] = (exists, expires_at)
+            self._entries.move_to_end((table, id))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+reference_cache = ReferenceCache(
+    settings.completion_reference_cache_size,
+    settings.completion_reference_cache_ttl_seconds,
+)
+
+
+def invalidate_reference_cache(session: AsyncSession) -> None:
+    # Called by slices that delete profiles, plans, exercises or body categories and by the data sync
+    # imports (which can also add ids that were cached as missing). Like
+    # invalidate_execute_cache it clears right away and once more after the commit, so a validation
+    # that read the old rows in between cannot put them back.
+    def invalidate(*_) -> None:
+        reference_cache.clear()
+
+    invalidate()
+    event.listen(session.sync_session, "after_commit", invalidate, once=True)
+
+
+async def validate_references(session: AsyncSession, references: list[tuple[type, set[UUID]]]) -> None:
+    # Checks that all referenced ids exist, e.g. [(Profile, profile_ids), (TrainingPlan, plan_ids)].
+    # Ids that are not cached are checked for all tables in one statement which only returns the
+    # missing ones. Raises 404 for the first model (in the given order) with missing ids.
+    generation = reference_cache.generation
+    missing: dict[str, set[UUID]] = {}
+    unchecked: dict[str, set[UUID]] = {}
+
+    for model, ids in references:
+        table = model.__tablename__
+        for id in ids:
+            exists = reference_cache.get(table, id)
+            if exists is None:
+                unchecked.setdefault(table, set()).add(id)
+            elif not exists:
+                missing.setdefault(table, set()).add(id)
+
+    if unchecked:
+        parts = []
+        params = {}
+        for index, (table, ids) in enumerate(unchecked.items()):
+            parts.append(
+                f"SELECT '{table}' AS table_name, v.id FROM unnest(:ids_{index}) AS v(id) "
+                f'WHERE NOT EXISTS (SELECT 1 FROM "{table}" t WHERE t.id = v.id)'
+            )
+            params[f"ids_{index}"] = list(ids)
+
+        statement = text(" UNION ALL ".join(parts)).bindparams(
+            *(bindparam(name, type_=ARRAY(PG_UUID(as_uuid=True))) for name in params)
+        )
+        for table_name, id in (await session.execute(statement, params)).all():
+            missing.setdefault(table_name, set()).add(id)
+
+        for table, ids in unchecked.items():
+            not_found = ids & missing.get(table, set())
+            reference_cache.put(generation, table, ids - not_found, True)
+            reference_cache.put(generation, table, not_found, False)
+
+    for model, _ in references:
+        missing_ids = missing.get(model.__tablename__)
+        if missing_ids:
+            raise HTTPException(
+                status_code=404,
+                detail=f"{model.__name__} with ids {', '.join(str(id) for id in missing_ids)} not found"
+            )
+
+
+def reference_error(error: IntegrityError) -> HTTPException:
+    # A referenced row was deleted after validation (or while its cache entry was stale)
+    if getattr(error.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+        reference_cache.clear()
+        return HTTPException(status_code=404, detail="Referenced row not found")
+    return HTTPException(status_code=500, detail=str(error))
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database import get_session
+from app.features.excersice_completion.schemas import BulkIngestResult, TrainingExerciseCompletionCreate
+from app.features.excersice_completion.completion_insert import completion_rows, insert_completions
+from app.features.excersice_completion.completion_references import reference_error
+from app.features.excersice_completion.excersice_completion_create import validate_completion_references
+from app.features.progress.history_cache import append_after_commit
+
+
+router = APIRouter()
+
+
+@router.post("/exercice-completion/bulk", response_model=BulkIngestResult, tags=["exercice-completion"])
+async def bulk_create_exercise_completions(exercise_completions: list[TrainingExerciseCompletionCreate], session: AsyncSession = Depends(get_session)) -> BulkIngestResult:
+    # Idempotent upload for offline clients: the request can be retried as a whole, completions that
+    # were stored before are reported as duplicates instead of failing the batch
+    try:
+        await validate_completion_references(session, exercise_completions)
+        rows = completion_rows(exercise_completions)
+        inserted_keys = await insert_completions(session, rows)
+        append_after_commit(session, rows, inserted_keys)
+        # One key per inserted row; an id may occur on several training days
+        accepted = len(inserted_keys)
+
+    except HTTPException:
+        raise
+    except IntegrityError as e:
+        raise reference_error(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return BulkIngestResult(accepted=accepted, duplicates=len(exercise_completions) - accepted)
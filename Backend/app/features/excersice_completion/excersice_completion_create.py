@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from uuid import uuid4, UUID
-from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
-from app.Models.training_exercise_completion import TrainingExerciseCompletion as TrainingExerciseCompletionModel
-from app.features.excersice_completion.schemas import TrainingExerciseCompletion
+from app.infrastructure.write_buffer import completion_write_buffer
+from app.features.excersice_completion.schemas import TrainingExerciseCompletionCreate
+from app.features.excersice_completion.completion_insert import completion_key, completion_rows, insert_completions
+from app.features.excersice_completion.completion_references import reference_error, validate_references
+from app.features.progress.history_cache import append_after_commit, append_written
 from app.Models.profile import Profile
 from app.Models.training_plan import TrainingPlan, TrainingExercise
 from app.Models.body_category import BodyCategory
@@ -14,60 +15,36 @@ from app.Models.body_category import BodyCategory
 router = APIRouter()
 
 
-async def validate_ids(session: AsyncSession, model, ids: set[UUID], model_name: str):
-    if not ids:
-        return
-
-    result = await session.scalars(select(model.id).where(model.id.in_(ids)))
-    found_ids = set(result.all())
-
-    missing_ids = ids - found_ids
-    if missing_ids:
-        raise HTTPException(
-            status_code=404,
-            detail=f"{model_name} with ids {', '.join(str(id) for id in missing_ids)} not found"
-        )
+async def validate_completion_references(session: AsyncSession, exercise_compeltions: list[TrainingExerciseCompletionCreate]):
+    # Validate existence of all referenced rows in one round trip (or none if cached)
+    await validate_references(session, [
+        (Profile, {ec.profile_id for ec in exercise_compeltions}),
+        (TrainingPlan, {ec.training_plan_id for ec in exercise_compeltions}),
+        (TrainingExercise, {ec.exercise_id for ec in exercise_compeltions}),
+        (BodyCategory, {ec.body_category_id for ec in exercise_compeltions}),
+    ])
 
 
 @router.post("/exercice-completion", status_code=201, tags=["exercice-completion"])
-async def create_training_plan(exercise_compeltions: list[TrainingExerciseCompletion], session: AsyncSession = Depends(get_session)) -> None:
+async def create_training_plan(exercise_compeltions: list[TrainingExerciseCompletionCreate], session: AsyncSession = Depends(get_session)) -> None:
     try:
-        # Collect unique IDs
-        profile_ids = {ec.profile_id for ec in exercise_compeltions}
-        training_plan_ids = {
-            ec.training_plan_id for ec in exercise_compeltions}
-        exercise_ids = {ec.exercise_id for ec in exercise_compeltions}
-        body_category_ids = {ec.body_category_id for ec in exercise_compeltions}
-
-        # Validate existence
-        await validate_ids(session, Profile, profile_ids, "Profile")
-        await validate_ids(session, TrainingPlan, training_plan_ids, "TrainingPlan")
-        await validate_ids(session, TrainingExercise, exercise_ids, "TrainingExercise")
-        await validate_ids(session, BodyCategory, body_category_ids, "BodyCategory")
-
-        for exercise_completion in exercise_compeltions:
-            completion = TrainingExerciseCompletionModel(
-                id=exercise_completion.id or uuid4(),
-                profile_id=exercise_completion.profile_id,
-                training_plan_id=exercise_completion.training_plan_id,
-                exercise_id=exercise_completion.exercise_id,
-                exercise_description=exercise_completion.exercise_description,
-                exercise_video_url=exercise_completion.exercise_video_url,
-                body_category_id=exercise_completion.body_category_id,
-                body_category_name=exercise_completion.body_category_name,
-                order=exercise_completion.order,
-                equipment=exercise_completion.equipment,
-                reps=exercise_completion.reps,
-                break_time_seconds=exercise_completion.break_time_seconds,
-                created_at=datetime.now(),
-                training_day=exercise_completion.training_day or datetime.now().date()
-            )
-            session.add(completion)
-
-        await session.flush()
+        await validate_completion_references(session, exercise_compeltions)
+
+        # Completions that already exist (retried upload) are skipped. With the write buffer enabled the
+        # rows are committed together with other requests (see app/infrastructure/write_buffer.py).
+        rows = completion_rows(exercise_compeltions)
+        # New rows are appended to cached progress histories (see app/features/progress)
+        if completion_write_buffer.running:
+            # Give the connection of the validation back to the pool before waiting for the flush
+            await session.commit()
+            append_written(rows, await completion_write_buffer.write(insert_completions, rows, completion_key))
+        else:
+            append_after_commit(session, rows, await insert_completions(session, rows))
 
     except HTTPException:
         raise
+    except IntegrityError as e:
+        raise reference_error(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -1,23 +1,73 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from uuid import UUID
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
+from app.infrastructure.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from app.features.excersice_completion.schemas import TrainingExerciseCompletion
 from app.Models.training_exercise_completion import TrainingExerciseCompletion as TrainingExerciseCompletionModel
 
 router = APIRouter()
 
+# Keyset: same order as the history index (training_day DESC, training_plan_id DESC, order), id as tie breaker
+CURSOR_TYPES = [date, UUID, int, UUID]
+
+
+def after_cursor(cursor_values: list):
+    training_day, training_plan_id, order, completion_id = cursor_values
+    model = TrainingExerciseCompletionModel
+    return and_(
+        # Redundant range condition so the index (and partition pruning) can be used for the leading column
+        model.training_day <= training_day,
+        or_(
+            model.training_day < training_day,
+            and_(model.training_day == training_day, model.training_plan_id < training_plan_id),
+            and_(model.training_day == training_day, model.training_plan_id == training_plan_id, model.order > order),
+            and_(model.training_day == training_day, model.training_plan_id == training_plan_id, model.order == order, model.id > completion_id),
+        )
+    )
+
 
 @router.get("/exercice-completion/byProfileId/{profile_id}", response_model=list[TrainingExerciseCompletion], status_code=200, tags=["exercice-completion"])
-async def list_training_plans(profile_id: str, session: AsyncSession = Depends(get_session)) -> list[TrainingExerciseCompletion]:
+async def list_training_plans(
+    profile_id: UUID,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description=f"Page size; the next page cursor is returned in the {NEXT_CURSOR_HEADER} header"),
+    cursor: str | None = Query(None, description="Cursor of the next page from a previous response"),
+    from_day: date | None = Query(None, description="Only completions on or after this training day"),
+    to_day: date | None = Query(None, description="Only completions on or before this training day"),
+    session: AsyncSession = Depends(get_read_session)
+) -> list[TrainingExerciseCompletion]:
 
-    all_plans = await session.execute(
+    query = (
         select(TrainingExerciseCompletionModel)
         .where(TrainingExerciseCompletionModel.profile_id == profile_id)
         .order_by(TrainingExerciseCompletionModel.training_day.desc())
         .order_by(TrainingExerciseCompletionModel.training_plan_id.desc())
         .order_by(TrainingExerciseCompletionModel.order)
+        .order_by(TrainingExerciseCompletionModel.id)
     )
+
+    if from_day is not None:
+        query = query.where(TrainingExerciseCompletionModel.training_day >= from_day)
+    if to_day is not None:
+        query = query.where(TrainingExerciseCompletionModel.training_day <= to_day)
+    if cursor is not None:
+        try:
+            query = query.where(after_cursor(decode_cursor(cursor, CURSOR_TYPES)))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if limit is not None:
+        # One extra row tells whether another page exists
+        query = query.limit(limit + 1)
+
+    all_plans = await session.execute(query)
     result = list(all_plans.scalars().all())
 
+    if limit is not None and len(result) > limit:
+        result = result[:limit]
+        last = result[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([last.training_day, last.training_plan_id, last.order, last.id])
+
     return [TrainingExerciseCompletion.model_validate(plan) for plan in result]
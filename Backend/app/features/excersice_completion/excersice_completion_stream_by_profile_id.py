@@ -0,0 +1,83 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from uuid import UUID
+from pydantic_core import to_json
+from sqlalchemy import select
+from app.infrastructure.database import read_transaction_session
+from app.features.excersice_completion.schemas import TrainingExerciseCompletion
+from app.Models.training_exercise_completion import TrainingExerciseCompletion as TrainingExerciseCompletionModel
+
+router = APIRouter()
+
+COLUMNS = list(TrainingExerciseCompletion.model_fields)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def encode_ndjson(rows) -> bytes:
+    return b"".join(to_json(dict(zip(COLUMNS, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_history(profile_id: UUID, format: str, chunk_size: int, from_day: date | None, to_day: date | None) -> AsyncIterator[bytes]:
+    # Rows are fetched chunk by chunk from a server-side cursor and encoded per chunk. The next chunk is
+    # only fetched once the previous one has been sent, so memory stays constant and slow clients
+    # throttle the database reads instead of buffering the whole history in the server.
+    query = (
+        select(*[getattr(TrainingExerciseCompletionModel, column) for column in COLUMNS])
+        .where(TrainingExerciseCompletionModel.profile_id == profile_id)
+        .order_by(TrainingExerciseCompletionModel.training_day.desc())
+        .order_by(TrainingExerciseCompletionModel.training_plan_id.desc())
+        .order_by(TrainingExerciseCompletionModel.order)
+        .execution_options(yield_per=chunk_size)
+    )
+    if from_day is not None:
+        query = query.where(TrainingExerciseCompletionModel.training_day >= from_day)
+    if to_day is not None:
+        query = query.where(TrainingExerciseCompletionModel.training_day <= to_day)
+
+    async with read_transaction_session() as session:
+        result = await session.stream(query)
+
+        if format == "csv":
+            header = True
+            async for rows in result.partitions():
+                yield encode_csv(rows, header)
+                header = False
+            if header:
+                yield encode_csv([], header)
+        else:
+            async for rows in result.partitions():
+                yield encode_ndjson(rows)
+
+
+@router.get("/exercice-completion/byProfileId/{profile_id}/stream", status_code=200, tags=["exercice-completion"])
+async def stream_exercise_completions(
+    profile_id: UUID,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    chunk_size: int = Query(1000, ge=50, le=10000, description="Rows fetched from the database and sent per chunk"),
+    from_day: date | None = Query(None, description="Only completions on or after this training day"),
+    to_day: date | None = Query(None, description="Only completions on or before this training day")
+) -> StreamingResponse:
+
+    return StreamingResponse(
+        stream_history(profile_id, format, chunk_size, from_day, to_day),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="exercise-completions-{profile_id}.{format}"'}
+    )
@@ -20,3 +20,14 @@ class TrainingExerciseCompletion(BaseModel):
     training_day: date | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TrainingExerciseCompletionCreate(TrainingExerciseCompletion):
+    # Uploads must name the training day: together with the id it is the primary key that makes
+    # retried uploads idempotent, so it cannot depend on when the server receives the request
+    training_day: date
+
+
+class BulkIngestResult(BaseModel):
+    accepted: int
+    duplicates: int
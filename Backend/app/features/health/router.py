@@ -1,6 +1,10 @@
+# Health-Check Slice
 from fastapi import APIRouter
 
-from app.features.health.schemas import HealthResponse
+from app.config import settings
+from app.features.health.schemas import HealthResponse, PoolStatsResponse, ReplicaPoolStats
+from app.infrastructure.database import engine, replica_router
+from app.infrastructure.pool_metrics import pool_snapshot
 
 router = APIRouter()
 
@@ -8,3 +12,17 @@ router = APIRouter()
 @router.get("", response_model=HealthResponse)
 async def get_health() -> HealthResponse:
     return HealthResponse(status="ok")
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+async def get_pool_stats() -> PoolStatsResponse:
+    # Jeder Pool mit seinen eigenen Kennzahlen: oben der Primary, darunter die Replicas
+    replicas = [
+        ReplicaPoolStats(**pool_snapshot(replica.engine.sync_engine, state.pop("name")), **state)
+        for replica, state in zip(replica_router.replicas, replica_router.snapshot())
+    ]
+    return PoolStatsResponse(
+        **pool_snapshot(engine.sync_engine, "primary"),
+        transaction_pooling=settings.db_transaction_pooling,
+        replicas=replicas,
+    )
@@ -1,5 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class HealthResponse(BaseModel):
     status: str = "ok"
+
+
+class PoolStats(BaseModel):
+    name: str
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    connects: int
+    timeouts: int
+    pre_ping_failures: int
+    wait_count: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    wait_histogram_ms: dict[str, int]
+
+
+class ReplicaPoolStats(PoolStats):
+    healthy: bool
+    lag_seconds: float
+    failures: int
+
+
+class PoolStatsResponse(PoolStats):
+    transaction_pooling: bool
+    replicas: list[ReplicaPoolStats] = Field(default_factory=list)
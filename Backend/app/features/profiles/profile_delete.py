@@ -4,6 +4,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
 from app.Models.profile import Profile
+from app.features.training_plan.execute_cache import invalidate_execute_cache
+from app.features.excersice_completion.completion_references import invalidate_reference_cache
 
 
 router = APIRouter()
@@ -21,4 +23,6 @@ async def delete_profile(profile_id: UUID, session: AsyncSession = Depends(get_s
         raise HTTPException(status_code=404, detail="Profile not found")
 
     await session.delete(profile)
+    invalidate_execute_cache(session)
+    invalidate_reference_cache(session)
     await session.flush()
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
 from app.Models.profile import Profile
 from app.features.profiles.schemas import ProfileResponse
 
@@ -11,7 +11,7 @@ router = APIRouter()
 
 
 @router.get("/profiles/{profile_id}", response_model=ProfileResponse, status_code=200, tags=["profiles"])
-async def get_profile(profile_id: UUID, session: AsyncSession = Depends(get_session)) -> ProfileResponse:
+async def get_profile(profile_id: UUID, session: AsyncSession = Depends(get_read_session)) -> ProfileResponse:
 
     profile = (await session.execute(
         select(Profile)
@@ -0,0 +1 @@
+# Progress Feature Module
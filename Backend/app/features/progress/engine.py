@@ -0,0 +1,244 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+import numpy as np
+
+# Columnar completion history of a profile and the vectorized progress computations on it.
+# One completion is one set; days are date ordinals (date.toordinal), exercises are int codes into
+# ProgressHistory.exercise_ids. All computations work on whole columns, there is no per-row Python.
+
+MOVING_AVERAGE_DAYS = (7, 28)
+# Up to this many exercise x day cells the per-day volumes are counted in a dense grid (8 bytes each)
+DENSE_GRID_CELLS = 4_000_000
+# Reps and day offsets get 20 bits each in the personal record sort key
+_FIELD_MASK = (1 << 20) - 1
+
+
+@dataclass(frozen=True)
+class HistoryColumns:
+    # Read-only view of a history, sorted by day
+    days: np.ndarray
+    exercises: np.ndarray
+    reps: np.ndarray
+    break_times: np.ndarray
+    exercise_ids: list[UUID]
+
+
+class ProgressHistory:
+    def __init__(self, capacity: int = 1024) -> None:
+        self.days = np.empty(capacity, np.int32)
+        self.exercises = np.empty(capacity, np.int32)
+        self.reps = np.empty(capacity, np.int32)
+        self.break_times = np.empty(capacity, np.int32)
+        self.exercise_ids: list[UUID] = []
+        self._exercise_codes: dict[UUID, int] = {}
+        self.size = 0
+        self._sorted = True
+
+    def exercise_code(self, exercise_id: UUID) -> int:
+        code = self._exercise_codes.get(exercise_id)
+        if code is None:
+            code = self._exercise_codes[exercise_id] = len(self.exercise_ids)
+            self.exercise_ids.append(exercise_id)
+        return code
+
+    def _reserve(self, count: int) -> None:
+        needed = self.size + count
+        if needed <= len(self.days):
+            return
+        # New arrays instead of resizing in place: columns() views handed out before stay valid
+        capacity = max(needed, 2 * len(self.days))
+        for name in ("days", "exercises", "reps", "break_times"):
+            grown = np.empty(capacity, np.int32)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+
+    def append_columns(self, days: np.ndarray, exercises: np.ndarray, reps: np.ndarray, break_times: np.ndarray) -> None:
+        count = len(days)
+        if count == 0:
+            return
+        self._reserve(count)
+        end = self.size + count
+        self.days[self.size:end] = days
+        self.exercises[self.size:end] = exercises
+        self.reps[self.size:end] = reps
+        self.break_times[self.size:end] = break_times
+        if self._sorted and ((self.size and days[0] < self.days[self.size - 1]) or np.any(np.diff(days) < 0)):
+            self._sorted = False
+        self.size = end
+
+    def append(self, rows: Sequence[dict]) -> None:
+        # rows in the shape of completion_rows() (training_day, exercise_id, reps, break_time_seconds)
+        count = len(rows)
+        self.append_columns(
+            np.fromiter((row["training_day"].toordinal() for row in rows), np.int32, count),
+            np.fromiter((self.exercise_code(row["exercise_id"]) for row in rows), np.int32, count),
+            np.fromiter((row["reps"] for row in rows), np.int32, count),
+            np.fromiter((row["break_time_seconds"] for row in rows), np.int32, count),
+        )
+
+    def columns(self) -> HistoryColumns:
+        # Appends only write behind self.size or into new arrays, so the views stay consistent while
+        # a computation runs in another thread. Out-of-order appends are sorted into new arrays.
+        if not self._sorted:
+            order = np.argsort(self.days[:self.size], kind="stable")
+            self.days, self.exercises, self.reps, self.break_times = (
+                getattr(self, name)[:self.size][order] for name in ("days", "exercises", "reps", "break_times")
+            )
+            self._sorted = True
+        return HistoryColumns(
+            self.days[:self.size], self.exercises[:self.size], self.reps[:self.size],
+            self.break_times[:self.size], list(self.exercise_ids),
+        )
+
+
+def daily_totals(days: np.ndarray, reps: np.ndarray, first_day: int, last_day: int) -> tuple[np.ndarray, np.ndarray]:
+    # Sets and reps per day of [first_day, last_day], days without training included
+    length = last_day - first_day + 1
+    start, end = np.searchsorted(days, [first_day, last_day + 1])
+    offsets = days[start:end] - first_day
+    sets = np.bincount(offsets, minlength=length)
+    total_reps = np.bincount(offsets, weights=reps[start:end], minlength=length)
+    return sets, total_reps.astype(np.int64)
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    # Trailing average; the first window - 1 values are the warm-up and are dropped
+    sums = np.cumsum(np.concatenate(([0], values)), dtype=np.float64)
+    return (sums[window:] - sums[:-window]) / window
+
+
+def unique_days(days: np.ndarray) -> np.ndarray:
+    # days are sorted, no need for np.unique's sort
+    if len(days) == 0:
+        return days
+    return days[np.concatenate(([True], days[1:] != days[:-1]))]
+
+
+def streaks(training_days: np.ndarray, today: int) -> tuple[int, int]:
+    # (current, longest) run of consecutive training days; the current run may end yesterday
+    if len(training_days) == 0:
+        return 0, 0
+    breaks = np.flatnonzero(np.diff(training_days) != 1)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(training_days) - 1]))
+    lengths = ends - starts + 1
+    current = int(lengths[-1]) if training_days[-1] >= today - 1 else 0
+    return current, int(lengths.max())
+
+
+def exercise_days(days: np.ndarray, exercises: np.ndarray, reps: np.ndarray, exercise_count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Reps per (exercise, training day): exercise codes, days and reps of every pair, sorted by
+    # exercise and day
+    if len(days) == 0:
+        empty = np.empty(0, np.int64)
+        return empty, empty, empty
+    first_day = int(days[0])
+    span = int(days[-1]) - first_day + 1
+    keys = exercises.astype(np.int64) * span + (days - first_day)
+    if span * exercise_count <= DENSE_GRID_CELLS:
+        # Counting into a dense exercise x day grid needs no sort
+        pairs = np.flatnonzero(np.bincount(keys, minlength=span * exercise_count))
+        volume = np.bincount(keys, weights=reps, minlength=span * exercise_count)[pairs].astype(np.int64)
+    else:
+        pairs, inverse = np.unique(keys, return_inverse=True)
+        volume = np.bincount(inverse, weights=reps).astype(np.int64)
+    return pairs // span, pairs % span + first_day, volume
+
+
+def trend_slopes(pair_exercises: np.ndarray, pair_days: np.ndarray, volume: np.ndarray, exercise_count: int) -> tuple[np.ndarray, np.ndarray]:
+    # Least squares slope of reps per training day over time, per exercise (reps per day).
+    # Computed from grouped sums, so all exercises are fitted at once. NaN below two sessions.
+    x = pair_days.astype(np.float64)
+    y = volume.astype(np.float64)
+    if len(x):
+        x -= x.mean()  # centering keeps the sums small and the subtraction below accurate
+    n = np.bincount(pair_exercises, minlength=exercise_count).astype(np.float64)
+    sx = np.bincount(pair_exercises, weights=x, minlength=exercise_count)
+    sy = np.bincount(pair_exercises, weights=y, minlength=exercise_count)
+    sxx = np.bincount(pair_exercises, weights=x * x, minlength=exercise_count)
+    sxy = np.bincount(pair_exercises, weights=x * y, minlength=exercise_count)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+    return slopes, n.astype(np.int64)
+
+
+def personal_records(days: np.ndarray, exercises: np.ndarray, reps: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Best set per exercise: exercise codes, reps and the first day the record was reached.
+    # Exercise, inverted reps and day are packed into one int64 key, so a single sort orders the
+    # sets by exercise, reps descending and day; the first key of each exercise is its record.
+    if len(days) == 0:
+        empty = np.empty(0, np.int64)
+        return empty, empty, empty
+    first_day = int(days[0])
+    inverted_reps = _FIELD_MASK - np.clip(reps, 0, _FIELD_MASK).astype(np.int64)
+    keys = np.sort((exercises.astype(np.int64) << 40) | (inverted_reps << 20) | (days - first_day))
+    record_exercises = keys >> 40
+    first = np.flatnonzero(np.concatenate(([True], record_exercises[1:] != record_exercises[:-1])))
+    records = keys[first]
+    return records >> 40, _FIELD_MASK - ((records >> 20) & _FIELD_MASK), (records & _FIELD_MASK) + first_day
+
+
+def compute_progress(history: HistoryColumns, today: date, period_days: int) -> dict:
+    # Everything the progress route returns, as plain Python values. Daily series and trends cover
+    # the last period_days days, streaks and records the whole history.
+    today_ordinal = today.toordinal()
+    first_day = today_ordinal - period_days + 1
+    days, exercises, reps = history.days, history.exercises, history.reps
+    exercise_count = len(history.exercise_ids)
+
+    # The moving averages of the first days need the days before the period
+    warm_up = max(MOVING_AVERAGE_DAYS) - 1
+    sets, total_reps = daily_totals(days, reps, first_day - warm_up, today_ordinal)
+    averages = {window: moving_average(sets, window)[warm_up - window + 1:] for window in MOVING_AVERAGE_DAYS}
+    sets, total_reps = sets[warm_up:], total_reps[warm_up:]
+
+    training_days = unique_days(days)
+    current_streak, longest_streak = streaks(training_days, today_ordinal)
+
+    pair_exercises, pair_days, volume = exercise_days(days, exercises, reps, exercise_count)
+    # Pairs are grouped by exercise, so the best day per exercise is one reduceat over the groups
+    best_session = np.zeros(exercise_count, np.int64)
+    if len(pair_exercises):
+        starts = np.flatnonzero(np.concatenate(([True], pair_exercises[1:] != pair_exercises[:-1])))
+        best_session[pair_exercises[starts]] = np.maximum.reduceat(volume, starts)
+
+    in_period = pair_days >= first_day
+    slopes, sessions = trend_slopes(pair_exercises[in_period], pair_days[in_period], volume[in_period], exercise_count)
+
+    record_exercises, record_reps, record_days = personal_records(days, exercises, reps)
+
+    daily = [
+        {
+            "day": date.fromordinal(first_day + offset),
+            "sets": int(sets[offset]),
+            "reps": int(total_reps[offset]),
+            "sets_average_7_days": float(averages[7][offset]),
+            "sets_average_28_days": float(averages[28][offset]),
+        }
+        for offset in range(period_days)
+    ]
+    exercises_progress = [
+        {
+            "exercise_id": history.exercise_ids[code],
+            "sessions": int(sessions[code]),
+            "reps_per_week_trend": None if np.isnan(slopes[code]) else float(slopes[code] * 7),
+            "best_set_reps": int(best_reps),
+            "best_set_day": date.fromordinal(int(best_day)),
+            "best_session_reps": int(best_session[code]),
+        }
+        for code, best_reps, best_day in zip(record_exercises.tolist(), record_reps.tolist(), record_days.tolist())
+    ]
+    exercises_progress.sort(key=lambda exercise: (-exercise["sessions"], -exercise["best_session_reps"]))
+
+    return {
+        "total_sets": int(len(days)),
+        "training_days": int(len(training_days)),
+        "current_streak_days": current_streak,
+        "longest_streak_days": longest_streak,
+        "daily": daily,
+        "exercises": exercises_progress,
+    }
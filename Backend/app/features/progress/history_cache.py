@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from datetime import date
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.infrastructure.database import read_transaction_session
+from app.features.excersice_completion.completion_insert import completion_key
+from app.features.progress.engine import ProgressHistory
+from app.Models.training_exercise_completion import TrainingExerciseCompletion
+
+# Rows per fetch while loading a history; the columns are built chunk by chunk
+LOAD_CHUNK_ROWS = 50_000
+
+
+class ProgressCache:
+    # In-process LRU cache of loaded completion histories per profile. New completions are appended
+    # by the create slices instead of reloading the history. The route compares the cached row
+    # count with the profile's set count from the daily rollups before every use, so histories
+    # that missed rows (other workers, failed appends, deletes) are reloaded. Imports can change
+    # rows without changing the count and clear the cache (see invalidate_progress_cache).
+
+    def __init__(self, max_profiles: int) -> None:
+        self.max_profiles = max_profiles
+        self._entries: OrderedDict[UUID, ProgressHistory] = OrderedDict()
+        self.generation = 0
+
+    def get(self, profile_id: UUID) -> ProgressHistory | None:
+        history = self._entries.get(profile_id)
+        if history is not None:
+            self._entries.move_to_end(profile_id)
+        return history
+
+    def put(self, profile_id: UUID, generation: int, history: ProgressHistory) -> None:
+        if self.max_profiles <= 0 or generation != self.generation:
+            return
+        self._entries[profile_id] = history
+        self._entries.move_to_end(profile_id)
+        while len(self._entries) > self.max_profiles:
+            self._entries.popitem(last=False)
+
+    def append(self, rows: list[dict]) -> None:
+        # Only histories that are already loaded are extended
+        by_profile: dict[UUID, list[dict]] = {}
+        for row in rows:
+            if row["profile_id"] in self._entries:
+                by_profile.setdefault(row["profile_id"], []).append(row)
+        for profile_id, profile_rows in by_profile.items():
+            self._entries[profile_id].append(profile_rows)
+
+    def discard(self, profile_ids: set[UUID]) -> None:
+        for profile_id in profile_ids:
+            self._entries.pop(profile_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+progress_cache = ProgressCache(settings.progress_cache_profiles)
+
+
+def invalidate_progress_cache(session: AsyncSession) -> None:
+    # For the data sync imports; like invalidate_execute_cache right away and after the commit
+    def invalidate(*_) -> None:
+        progress_cache.clear()
+
+    invalidate()
+    event.listen(session.sync_session, "after_commit", invalidate, once=True)
+
+
+def append_after_commit(session: AsyncSession, rows: list[dict], inserted_keys: set[tuple[UUID, date]]) -> None:
+    # Appends the newly inserted completions once the request's transaction is committed
+    new_rows = [row for row in rows if completion_key(row) in inserted_keys]
+    if new_rows:
+        event.listen(session.sync_session, "after_commit", lambda *_: progress_cache.append(new_rows), once=True)
+
+
+def append_written(rows: list[dict], inserted: int | None) -> None:
+    # For the write buffer: with ack="commit" the rows are committed when write() returns. Whether
+    # skipped duplicates or enqueued rows end up in the table is unknown, those histories are dropped.
+    if inserted == len(rows):
+        progress_cache.append(rows)
+    else:
+        progress_cache.discard({row["profile_id"] for row in rows})
+
+
+async def load_history(profile_id: UUID) -> ProgressHistory:
+    # Streams the profile's completions with a server-side cursor, which needs an open transaction:
+    # read on the primary in a read-only transaction, not on the AUTOCOMMIT read session of the route
+    model = TrainingExerciseCompletion
+    query = (
+        select(model.training_day, model.exercise_id, model.reps, model.break_time_seconds)
+        .where(model.profile_id == profile_id)
+        .order_by(model.training_day)
+        .execution_options(yield_per=LOAD_CHUNK_ROWS)
+    )
+
+    history = ProgressHistory()
+    async with read_transaction_session() as session:
+        result = await session.stream(query)
+        async for chunk in result.partitions():
+            count = len(chunk)
+            days, exercise_ids, reps, break_times = zip(*chunk)
+            history.append_columns(
+                np.fromiter((day.toordinal() for day in days), np.int32, count),
+                np.fromiter((history.exercise_code(exercise_id) for exercise_id in exercise_ids), np.int32, count),
+                np.fromiter(reps, np.int32, count),
+                np.fromiter(break_times, np.int32, count),
+            )
+    return history
@@ -0,0 +1,49 @@
+import asyncio
+from datetime import date
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database import get_read_session
+from app.features.progress.engine import compute_progress
+from app.features.progress.history_cache import load_history, progress_cache
+from app.features.progress.schemas import ProgressResponse
+from app.Models.completion_rollup import CompletionDailyRollup
+from app.Models.training_exercise_item import TrainingExerciseItem
+from app.Models.training_plan import TrainingExercise
+
+router = APIRouter()
+
+
+@router.get("/profiles/{profile_id}/progress", response_model=ProgressResponse, tags=["progress"])
+async def get_progress(
+    profile_id: UUID,
+    days: int = Query(90, ge=7, le=3650, description="Length of the daily series and the trend period"),
+    session: AsyncSession = Depends(get_read_session),
+) -> ProgressResponse:
+    # Moving averages, per-exercise trends, streaks and personal records, computed with NumPy on the
+    # profile's cached completion columns. The set count from the daily rollups (O(days)) tells
+    # whether the cached history is complete; otherwise it is reloaded.
+    expected_sets = await session.scalar(
+        select(func.coalesce(func.sum(CompletionDailyRollup.sets), 0)).where(CompletionDailyRollup.profile_id == profile_id)
+    )
+    history = progress_cache.get(profile_id)
+    if history is None or history.size != expected_sets:
+        generation = progress_cache.generation
+        history = await load_history(profile_id)
+        progress_cache.put(profile_id, generation, history)
+
+    # The vectorized work releases the GIL for the most part; keep it off the event loop
+    progress = await asyncio.to_thread(compute_progress, history.columns(), date.today(), days)
+
+    exercise_ids = [exercise["exercise_id"] for exercise in progress["exercises"]]
+    if exercise_ids:
+        descriptions = dict((await session.execute(
+            select(TrainingExercise.id, TrainingExerciseItem.description)
+            .join(TrainingExerciseItem, TrainingExerciseItem.id == TrainingExercise.training_exercise_item_id)
+            .where(TrainingExercise.id.in_(exercise_ids))
+        )).all())
+        for exercise in progress["exercises"]:
+            exercise["exercise_description"] = descriptions.get(exercise["exercise_id"])
+
+    return ProgressResponse.model_validate(progress)
@@ -0,0 +1,37 @@
+from uuid import UUID
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DailyProgress(BaseModel):
+    day: date
+    sets: int
+    reps: int
+    sets_average_7_days: float
+    sets_average_28_days: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExerciseProgress(BaseModel):
+    exercise_id: UUID
+    exercise_description: str | None = None
+    sessions: int  # Training days with this exercise in the period
+    reps_per_week_trend: float | None = None  # Slope of the daily reps in the period, None below two sessions
+    best_set_reps: int  # Personal record over the whole history
+    best_set_day: date
+    best_session_reps: int  # Most reps of this exercise on one training day
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProgressResponse(BaseModel):
+    total_sets: int
+    training_days: int
+    current_streak_days: int
+    longest_streak_days: int
+    daily: list[DailyProgress]
+    exercises: list[ExerciseProgress]
+
+    model_config = ConfigDict(from_attributes=True)
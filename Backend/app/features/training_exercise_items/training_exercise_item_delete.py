@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
 from app.Models.training_exercise_item import TrainingExerciseItem
+from app.features.training_plan.execute_cache import invalidate_execute_cache
 
 
 router = APIRouter()
@@ -22,4 +23,5 @@ async def delete_training_exercise_item(item_id: UUID, session: AsyncSession = D
             status_code=404, detail="Training exercise item not found")
 
     await session.delete(item)
+    invalidate_execute_cache(session)
     await session.flush()
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
 from app.Models.training_exercise_item import TrainingExerciseItem
 from app.features.training_exercise_items.schemas import TrainingExerciseItemResponse
 
@@ -11,7 +11,7 @@ router = APIRouter()
 
 
 @router.get("/training-exercise-items", response_model=list[TrainingExerciseItemResponse], status_code=200, tags=["training-exercise-items"])
-async def list_training_exercise_items(session: AsyncSession = Depends(get_session)) -> list[TrainingExerciseItemResponse]:
+async def list_training_exercise_items(session: AsyncSession = Depends(get_read_session)) -> list[TrainingExerciseItemResponse]:
 
     all_items = await session.execute(
         select(TrainingExerciseItem)
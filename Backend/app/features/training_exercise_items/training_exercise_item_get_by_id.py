@@ -3,7 +3,7 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
 from app.Models.training_exercise_item import TrainingExerciseItem
 from app.features.training_exercise_items.schemas import TrainingExerciseItemResponse
 
@@ -12,7 +12,7 @@ router = APIRouter()
 
 
 @router.get("/training-exercise-items/{item_id}", response_model=TrainingExerciseItemResponse, status_code=200, tags=["training-exercise-items"])
-async def get_training_exercise_item(item_id: UUID, session: AsyncSession = Depends(get_session)) -> TrainingExerciseItemResponse:
+async def get_training_exercise_item(item_id: UUID, session: AsyncSession = Depends(get_read_session)) -> TrainingExerciseItemResponse:
 
     item = (await session.execute(
         select(TrainingExerciseItem)
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
 from app.Models.training_exercise_item import TrainingExerciseItem
 from app.features.training_exercise_items.schemas import TrainingExerciseItemUpdate, TrainingExerciseItemResponse
+from app.features.training_plan.execute_cache import invalidate_execute_cache
 
 
 router = APIRouter()
@@ -36,6 +37,7 @@ async def update_training_exercise_item(item_id: UUID, body: TrainingExerciseIte
     item.description = body.description
     item.video_url = body.video_url
     item.body_category_id = body.body_category_id
+    invalidate_execute_cache(session)
     
     await session.flush()
     # Eager load the relationship for the response
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.features.training_plan.schemas import TrainingPlanExecuteCompactResponse
+
+
+class ExecuteCache:
+    # In-process LRU cache for the compact execute representation of a training plan.
+    # Every entry remembers the plan version it was built from; invalidating a plan bumps its version,
+    # so a response that was built from data read before the invalidation is never served.
+    # Edits to exercise items, body categories or profiles can affect any plan and bump the
+    # global generation instead, which invalidates all entries at once.
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[UUID, tuple[tuple[int, int], TrainingPlanExecuteCompactResponse]] = OrderedDict()
+        self._plan_versions: dict[UUID, int] = {}
+        self._generation = 0
+
+    def version(self, plan_id: UUID) -> tuple[int, int]:
+        return self._generation, self._plan_versions.get(plan_id, 0)
+
+    def get(self, plan_id: UUID) -> TrainingPlanExecuteCompactResponse | None:
+        entry = self._entries.get(plan_id)
+        if entry is None:
+            return None
+
+        version, response = entry
+        if version != self.version(plan_id):
+            del self._entries[plan_id]
+            return None
+
+        self._entries.move_to_end(plan_id)
+        return response
+
+    def put(self, plan_id: UUID, version: tuple[int, int], response: TrainingPlanExecuteCompactResponse) -> None:
+        if self.max_entries <= 0 or version != self.version(plan_id):
+            return
+
+        self._entries[plan_id] = (version, response)
+        self._entries.move_to_end(plan_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_plan(self, plan_id: UUID) -> None:
+        self._plan_versions[plan_id] = self._plan_versions.get(plan_id, 0) + 1
+        self._entries.pop(plan_id, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._plan_versions.clear()
+        self._entries.clear()
+
+
+execute_cache = ExecuteCache(settings.training_plan_execute_cache_size)
+
+
+def invalidate_execute_cache(session: AsyncSession, plan_id: UUID | None = None) -> None:
+    # Invalidates right away and once more after the surrounding transaction committed, so a concurrent
+    # request that read the old rows in between cannot put a stale expansion back into the cache.
+    # Without a plan_id all cached plans are invalidated.
+    def invalidate(*_) -> None:
+        if plan_id is None:
+            execute_cache.clear()
+        else:
+            execute_cache.invalidate_plan(plan_id)
+
+    invalidate()
+    event.listen(session.sync_session, "after_commit", invalidate, once=True)
@@ -0,0 +1,17 @@
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Models.training_exercise_item import TrainingExerciseItem
+
+
+async def load_exercise_items(session: AsyncSession, item_ids: set[UUID]) -> dict[UUID, TrainingExerciseItem]:
+    # Loads all referenced exercise items in a single query instead of one query per exercise
+    if not item_ids:
+        return {}
+
+    result = await session.scalars(select(TrainingExerciseItem).where(TrainingExerciseItem.id.in_(item_ids)))
+    return {item.id: item for item in result.all()}
+
+
+def missing_items_message(missing_ids: set[UUID]) -> str:
+    return f"TrainingExerciseItem with ids {', '.join(str(id) for id in sorted(missing_ids, key=str))} does not exist"
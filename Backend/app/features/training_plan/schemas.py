@@ -22,6 +22,13 @@ class TrainingExerciseUpdate(TrainingExerciseCreate):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TrainingExerciseUpsert(TrainingExerciseCreate):
+    # Id of an existing exercise of the plan; without it the exercise is matched by order
+    id: UUID | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TrainingPlanCreate(BaseModel):
     name: str
     profile_id: UUID
@@ -34,7 +41,7 @@ class TrainingPlanUpdate(BaseModel):
     id: UUID
     name: str
     profile_id: UUID
-    training_exercises: list[TrainingExerciseCreate]
+    training_exercises: list[TrainingExerciseUpsert]
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -91,3 +98,30 @@ class TrainingPlanExecuteResponse(BaseModel):
         default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TrainingExerciseExecuteEntry(BaseModel):
+    # One distinct exercise of the plan, referenced by index from the set runs
+    exercise_id: UUID
+    equipment: str | None = None
+    reps: int = 1
+    break_time_seconds: int
+    training_exercise_description: str
+    training_exercise_video_url: str | None = None
+    body_category_id: UUID
+    body_category_name: str
+
+
+class TrainingExerciseExecuteRun(BaseModel):
+    # `count` consecutive sets of the exercise at `exercise_index`, starting at execution order `first_order`
+    exercise_index: int
+    first_order: int
+    count: int
+
+
+class TrainingPlanExecuteCompactResponse(BaseModel):
+    id: UUID
+    name: str
+    profile_id: UUID
+    exercises: list[TrainingExerciseExecuteEntry] = Field(default_factory=list)
+    runs: list[TrainingExerciseExecuteRun] = Field(default_factory=list)
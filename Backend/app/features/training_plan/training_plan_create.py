@@ -1,11 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from uuid import uuid4
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
-from app.Models.training_exercise_item import TrainingExerciseItem
 from app.Models.training_plan import TrainingPlan, TrainingExercise
+from app.features.training_plan.exercise_items import load_exercise_items, missing_items_message
 from app.features.training_plan.schemas import TrainingPlanCreate, TrainingPlanResponse
 
 
@@ -16,20 +14,17 @@ router = APIRouter()
 async def create_training_plan(training_plan: TrainingPlanCreate, session: AsyncSession = Depends(get_session)) -> TrainingPlanResponse:
     try:
         training_plan_id = uuid4()
-        exercises_data = []
 
-        for exercise_dto in training_plan.training_exercises:
+        # Resolve all referenced exercise items in one round trip
+        item_ids = {exercise_dto.training_exercise_item_id for exercise_dto in training_plan.training_exercises}
+        exercise_items = await load_exercise_items(session, item_ids)
 
-            exercise_item_exists = (await session.execute(select(TrainingExerciseItem)
-                                                          .where(TrainingExerciseItem.id == exercise_dto.training_exercise_item_id))).scalar_one_or_none()
+        missing_ids = item_ids - exercise_items.keys()
+        if missing_ids:
+            raise HTTPException(status_code=404, detail=missing_items_message(missing_ids))
 
-            if not exercise_item_exists:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"TrainingExerciseItem with id {exercise_dto.training_exercise_item_id} does not exist"
-                )
-
-            new_exercise = TrainingExercise(
+        exercises_data = [
+            TrainingExercise(
                 id=uuid4(),
                 training_plan_id=training_plan_id,
                 order=exercise_dto.order,
@@ -38,9 +33,10 @@ async def create_training_plan(training_plan: TrainingPlanCreate, session: Async
                 reps=exercise_dto.reps,
                 break_time_seconds=exercise_dto.break_time_seconds,
                 training_exercise_item_id=exercise_dto.training_exercise_item_id,
-                training_exercise_item=exercise_item_exists
+                training_exercise_item=exercise_items[exercise_dto.training_exercise_item_id]
             )
-            exercises_data.append(new_exercise)
+            for exercise_dto in training_plan.training_exercises
+        ]
 
         new_plan = TrainingPlan(
             id=training_plan_id,
@@ -51,14 +47,10 @@ async def create_training_plan(training_plan: TrainingPlanCreate, session: Async
         session.add(new_plan)
         await session.flush()
 
-        # Reload the plan with all nested relationships loaded
-        result = (await session.execute(
-            select(TrainingPlan)
-            .options(selectinload(TrainingPlan.exercises).selectinload(TrainingExercise.training_exercise_item))
-            .where(TrainingPlan.id == training_plan_id))
-        ).scalar_one()
-
-        return TrainingPlanResponse.model_validate(result)
+        # All relationships are already populated in memory, no reload needed
+        return TrainingPlanResponse.model_validate(new_plan)
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -5,6 +5,8 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
 from app.Models.training_plan import TrainingPlan, TrainingExercise
+from app.features.training_plan.execute_cache import invalidate_execute_cache
+from app.features.excersice_completion.completion_references import invalidate_reference_cache
 
 
 router = APIRouter()
@@ -23,4 +25,6 @@ async def delete_training_plan(plan_id: UUID, session: AsyncSession = Depends(ge
         raise HTTPException(status_code=404, detail="Training Plan not found")
 
     await session.delete(plan)
+    invalidate_execute_cache(session, plan.id)
+    invalidate_reference_cache(session)
     await session.flush()
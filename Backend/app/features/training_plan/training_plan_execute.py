@@ -1,56 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException
+from collections.abc import Iterator
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, Response
 from uuid import UUID, uuid4
+from pydantic_core import to_json
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import async_read_session_factory
 from app.Models.training_plan import TrainingPlan, TrainingExercise
 from app.Models.training_exercise_item import TrainingExerciseItem
-from app.features.training_plan.schemas import TrainingPlanExecuteResponse, TrainingExerciseExecuteResponse
+from app.features.training_plan.execute_cache import execute_cache
+from app.features.training_plan.schemas import (
+    TrainingPlanExecuteResponse,
+    TrainingPlanExecuteCompactResponse,
+    TrainingExerciseExecuteEntry,
+    TrainingExerciseExecuteRun,
+)
 
 
 router = APIRouter()
 
 
-@router.get("/training-plans/{plan_id}/execute", response_model=TrainingPlanExecuteResponse, tags=["training-plans"])
-async def get_training_plan(plan_id: UUID, session: AsyncSession = Depends(get_session)) -> TrainingPlanExecuteResponse:
-
-    plan = (await session.execute(
-        select(TrainingPlan)
-        .options(selectinload(TrainingPlan.exercises).selectinload(TrainingExercise.training_exercise_item).selectinload(TrainingExerciseItem.body_category))
-        .where(TrainingPlan.id == plan_id)
-    )).scalar_one_or_none()
-
-    if plan is None:
-        raise HTTPException(status_code=404, detail="Training Plan not found")
-
-    exercise_data = []
+def build_compact_plan(plan: TrainingPlan) -> TrainingPlanExecuteCompactResponse:
+    # One dictionary entry per exercise plus one run per block of consecutive sets
+    exercises = []
+    runs = []
     order = 1
 
     for exercise in sorted(plan.exercises, key=lambda e: e.order):
-        for set in range(exercise.sets):
-
-            execute_exercise = TrainingExerciseExecuteResponse(
-                id=uuid4(),
-                exercise_id=exercise.id,
-                order=order,
-                equipment=exercise.equipment,
-                reps=exercise.reps,
-                break_time_seconds=exercise.break_time_seconds,
-                training_exercise_description=exercise.training_exercise_item.description,
-                training_exercise_video_url=exercise.training_exercise_item.video_url,
-                body_category_id=exercise.training_exercise_item.body_category.id,
-                body_category_name=exercise.training_exercise_item.body_category.name
-            )
-
-            exercise_data.append(execute_exercise)
-            order += 1
-
-    execute_plan = TrainingPlanExecuteResponse(
+        if exercise.sets <= 0:
+            continue
+
+        exercises.append(TrainingExerciseExecuteEntry(
+            exercise_id=exercise.id,
+            equipment=exercise.equipment,
+            reps=exercise.reps,
+            break_time_seconds=exercise.break_time_seconds,
+            training_exercise_description=exercise.training_exercise_item.description,
+            training_exercise_video_url=exercise.training_exercise_item.video_url,
+            body_category_id=exercise.training_exercise_item.body_category.id,
+            body_category_name=exercise.training_exercise_item.body_category.name
+        ))
+        runs.append(TrainingExerciseExecuteRun(exercise_index=len(exercises) - 1, first_order=order, count=exercise.sets))
+        order += exercise.sets
+
+    return TrainingPlanExecuteCompactResponse(
         id=plan.id,
         name=plan.name,
         profile_id=plan.profile_id,
-        exercises=exercise_data
+        exercises=exercises,
+        runs=runs
     )
 
-    return execute_plan
+
+def expand_sets(compact_plan: TrainingPlanExecuteCompactResponse) -> Iterator[dict]:
+    # Expands the runs lazily into one plain row per set (the default response format)
+    for run in compact_plan.runs:
+        exercise = compact_plan.exercises[run.exercise_index].model_dump()
+        for order in range(run.first_order, run.first_order + run.count):
+            yield {"id": uuid4(), "order": order, **exercise}
+
+
+@router.get("/training-plans/{plan_id}/execute", response_model=TrainingPlanExecuteResponse | TrainingPlanExecuteCompactResponse, tags=["training-plans"])
+async def get_training_plan(
+    plan_id: UUID,
+    format: Literal["full", "compact"] = Query("full", description="`compact` returns each exercise once plus run-length encoded sets"),
+) -> TrainingPlanExecuteResponse | TrainingPlanExecuteCompactResponse | Response:
+
+    # The expansion only changes when the plan or its referenced items change, so serve it from memory
+    compact_plan = execute_cache.get(plan_id)
+
+    if compact_plan is None:
+        # Capture the version before reading, so an invalidation during the read prevents caching stale data
+        version = execute_cache.version(plan_id)
+
+        # Read from the primary, not a replica: a replica may not have replayed the update that bumped
+        # the version yet, and its stale plan would then be cached until the next edit
+        async with async_read_session_factory() as session:
+            plan = (await session.execute(
+                select(TrainingPlan)
+                .options(selectinload(TrainingPlan.exercises).selectinload(TrainingExercise.training_exercise_item).selectinload(TrainingExerciseItem.body_category))
+                .where(TrainingPlan.id == plan_id)
+            )).scalar_one_or_none()
+
+            if plan is None:
+                raise HTTPException(status_code=404, detail="Training Plan not found")
+
+            compact_plan = build_compact_plan(plan)
+        execute_cache.put(plan_id, version, compact_plan)
+
+    if format == "compact":
+        return compact_plan
+
+    # Serialize the expanded rows straight to JSON without building one response model per set
+    return Response(
+        content=to_json({
+            "id": compact_plan.id,
+            "name": compact_plan.name,
+            "profile_id": compact_plan.profile_id,
+            "exercises": expand_sets(compact_plan)
+        }),
+        media_type="application/json"
+    )
@@ -3,7 +3,7 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
 from app.Models.training_plan import TrainingPlan, TrainingExercise
 from app.features.training_plan.schemas import TrainingPlanResponse
 
@@ -12,7 +12,7 @@ router = APIRouter()
 
 
 @router.get("/training-plans/{plan_id}", response_model=TrainingPlanResponse, tags=["training-plans"])
-async def get_training_plan(plan_id: UUID, session: AsyncSession = Depends(get_session)) -> TrainingPlanResponse:
+async def get_training_plan(plan_id: UUID, session: AsyncSession = Depends(get_read_session)) -> TrainingPlanResponse:
 
     plan = (await session.execute(
         select(TrainingPlan)
@@ -6,11 +6,50 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_session
 from app.Models.training_exercise_item import TrainingExerciseItem
 from app.Models.training_plan import TrainingPlan, TrainingExercise
-from app.features.training_plan.schemas import TrainingPlanUpdate, TrainingPlanResponse
+from app.features.training_plan.exercise_items import load_exercise_items, missing_items_message
+from app.features.training_plan.schemas import TrainingExerciseUpsert, TrainingPlanUpdate, TrainingPlanResponse
+from app.features.training_plan.execute_cache import invalidate_execute_cache
+from app.features.excersice_completion.completion_references import invalidate_reference_cache
 
 
 router = APIRouter()
 
+EXERCISE_FIELDS = ("order", "equipment", "sets", "reps", "break_time_seconds", "training_exercise_item_id")
+
+
+def match_exercises(plan: TrainingPlan, exercise_dtos: list[TrainingExerciseUpsert]) -> list[TrainingExercise | None]:
+    # Matches incoming exercises to existing ones: first by id, then by order.
+    # Returns the existing exercise per incoming entry, or None if a new one is needed.
+    existing_by_id = {exercise.id: exercise for exercise in plan.exercises}
+    claimed_ids = {dto.id for dto in exercise_dtos if dto.id in existing_by_id}
+
+    existing_by_order: dict[int, TrainingExercise] = {}
+    for exercise in plan.exercises:
+        if exercise.id not in claimed_ids:
+            existing_by_order.setdefault(exercise.order, exercise)
+
+    matched: list[TrainingExercise | None] = []
+    used_ids = set()
+    for dto in exercise_dtos:
+        exercise = existing_by_id.get(dto.id) if dto.id is not None else existing_by_order.get(dto.order)
+        if exercise is not None and exercise.id in used_ids:
+            exercise = None
+        if exercise is not None:
+            used_ids.add(exercise.id)
+        matched.append(exercise)
+
+    return matched
+
+
+def apply_changes(exercise: TrainingExercise, dto: TrainingExerciseUpsert, exercise_item: TrainingExerciseItem) -> None:
+    # Only touches changed attributes so the unit of work emits UPDATEs for modified rows only
+    for field in EXERCISE_FIELDS:
+        value = getattr(dto, field)
+        if getattr(exercise, field) != value:
+            setattr(exercise, field, value)
+    if exercise.training_exercise_item is not exercise_item:
+        exercise.training_exercise_item = exercise_item
+
 
 @router.put("/training-plans", response_model=TrainingPlanResponse, tags=["training-plans"])
 async def update_training_plan(training_plan_update: TrainingPlanUpdate, session: AsyncSession = Depends(get_session)) -> TrainingPlanResponse:
@@ -26,46 +65,53 @@ async def update_training_plan(training_plan_update: TrainingPlanUpdate, session
             raise HTTPException(
                 status_code=404, detail="Training Plan not found")
 
-        plan.name = training_plan_update.name
-        plan.profile_id = training_plan_update.profile_id
+        # Resolve all referenced exercise items in one round trip
+        item_ids = {exercise_dto.training_exercise_item_id for exercise_dto in training_plan_update.training_exercises}
+        exercise_items = await load_exercise_items(session, item_ids)
 
-        # Clear existing exercises
-        plan.exercises.clear()
+        missing_ids = item_ids - exercise_items.keys()
+        if missing_ids:
+            raise ValueError(missing_items_message(missing_ids))
 
-        for exercise_dto in training_plan_update.training_exercises:
+        if plan.name != training_plan_update.name:
+            plan.name = training_plan_update.name
+        if plan.profile_id != training_plan_update.profile_id:
+            plan.profile_id = training_plan_update.profile_id
 
-            exercise_item_exists = (await session.execute(
-                select(TrainingExerciseItem)
-                .where(TrainingExerciseItem.id == exercise_dto.training_exercise_item_id)
-            )).scalar_one_or_none()
+        # Diff the exercises instead of clearing and re-inserting them: matched exercises keep their id
+        # (completions reference it), unmatched incoming ones are inserted and left-over ones are
+        # removed via delete-orphan. The unit of work batches the resulting statements.
+        exercises = []
+        for exercise_dto, existing in zip(training_plan_update.training_exercises, match_exercises(plan, training_plan_update.training_exercises)):
+            exercise_item = exercise_items[exercise_dto.training_exercise_item_id]
 
-            if not exercise_item_exists:
-                raise ValueError(
-                    f"TrainingExerciseItem with id {exercise_dto.training_exercise_item_id} does not exist")
+            if existing is None:
+                existing = TrainingExercise(
+                    id=uuid4(),
+                    training_plan_id=plan.id,
+                    order=exercise_dto.order,
+                    equipment=exercise_dto.equipment,
+                    sets=exercise_dto.sets,
+                    reps=exercise_dto.reps,
+                    break_time_seconds=exercise_dto.break_time_seconds,
+                    training_exercise_item_id=exercise_dto.training_exercise_item_id,
+                    training_exercise_item=exercise_item
+                )
+            else:
+                apply_changes(existing, exercise_dto, exercise_item)
 
-            new_exercise = TrainingExercise(
-                id=uuid4(),
-                training_plan_id=plan.id,
-                order=exercise_dto.order,
-                equipment=exercise_dto.equipment,
-                sets=exercise_dto.sets,
-                reps=exercise_dto.reps,
-                break_time_seconds=exercise_dto.break_time_seconds,
-                training_exercise_item_id=exercise_dto.training_exercise_item_id,
-                training_exercise_item=exercise_item_exists
-            )
-            plan.exercises.append(new_exercise)
+            exercises.append(existing)
 
-        await session.flush()
+        plan.exercises = exercises
+        invalidate_execute_cache(session, plan.id)
+        invalidate_reference_cache(session)
 
-        # Reload the plan with all nested relationships loaded
-        result = (await session.execute(
-            select(TrainingPlan)
-            .options(selectinload(TrainingPlan.exercises).selectinload(TrainingExercise.training_exercise_item))
-            .where(TrainingPlan.id == training_plan_update.id)
-        )).scalar_one()
+        await session.flush()
 
-        return TrainingPlanResponse.model_validate(result)
+        # All relationships are already populated in memory, no reload needed
+        return TrainingPlanResponse.model_validate(plan)
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
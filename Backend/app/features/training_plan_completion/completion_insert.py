@@ -0,0 +1,37 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Models.training_plan_completion import TrainingPlanCompletion as TrainingPlanCompletionModel
+from app.features.training_plan_completion.schemas import TrainingPlanCompletion
+
+
+def plan_completion_rows(plan_completions: list[TrainingPlanCompletion]) -> list[dict]:
+    now = datetime.now()
+    return [
+        {
+            "id": pc.id or uuid4(),
+            "profile_id": pc.profile_id,
+            "training_plan_id": pc.training_plan_id,
+            "training_plan_name": pc.training_plan_name,
+            "count_completed_exercises": pc.count_completed_exercises,
+            "count_open_exercises": pc.count_open_exercises,
+            "created_at": now,
+            "training_day": pc.training_day or now.date(),
+        }
+        for pc in plan_completions
+    ]
+
+
+async def insert_plan_completions(session: AsyncSession, rows: list[dict]) -> set[UUID]:
+    # Batched multi-row insert; plan completions that already exist are skipped. Returns the ids of the new rows.
+    if not rows:
+        return set()
+
+    statement = (
+        insert(TrainingPlanCompletionModel)
+        .on_conflict_do_nothing(index_elements=["id"])
+        .returning(TrainingPlanCompletionModel.id)
+    )
+    result = await session.execute(statement, rows)
+    return set(result.scalars())
@@ -1,21 +1,60 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from uuid import UUID
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session
+from app.infrastructure.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from app.features.training_plan_completion.schemas import TrainingPlanCompletion
 from app.Models.training_plan_completion import TrainingPlanCompletion as TrainingPlanCompletionModel
 
 router = APIRouter()
 
+# Keyset: (training_day, created_at, id), all descending
+CURSOR_TYPES = [date, datetime, UUID]
+
 @router.get("/training-plan-completion/byProfileId/{profile_id}", response_model=list[TrainingPlanCompletion], status_code=200, tags=["training-plan-completion"])
-async def list_training_plan_completions(profile_id: str, session: AsyncSession = Depends(get_session)) -> list[TrainingPlanCompletion]:
+async def list_training_plan_completions(
+    profile_id: UUID,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description=f"Page size; the next page cursor is returned in the {NEXT_CURSOR_HEADER} header"),
+    cursor: str | None = Query(None, description="Cursor of the next page from a previous response"),
+    from_day: date | None = Query(None, description="Only completions on or after this training day"),
+    to_day: date | None = Query(None, description="Only completions on or before this training day"),
+    session: AsyncSession = Depends(get_read_session)
+) -> list[TrainingPlanCompletion]:
 
-    all_completions = await session.execute(
+    query = (
         select(TrainingPlanCompletionModel)
         .where(TrainingPlanCompletionModel.profile_id == profile_id)
         .order_by(TrainingPlanCompletionModel.training_day.desc())
         .order_by(TrainingPlanCompletionModel.created_at.desc())
+        .order_by(TrainingPlanCompletionModel.id.desc())
     )
+
+    if from_day is not None:
+        query = query.where(TrainingPlanCompletionModel.training_day >= from_day)
+    if to_day is not None:
+        query = query.where(TrainingPlanCompletionModel.training_day <= to_day)
+    if cursor is not None:
+        try:
+            cursor_values = decode_cursor(cursor, CURSOR_TYPES)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(
+            tuple_(TrainingPlanCompletionModel.training_day, TrainingPlanCompletionModel.created_at, TrainingPlanCompletionModel.id)
+            < tuple_(*cursor_values)
+        )
+    if limit is not None:
+        # One extra row tells whether another page exists
+        query = query.limit(limit + 1)
+
+    all_completions = await session.execute(query)
     result = list(all_completions.scalars().all())
 
+    if limit is not None and len(result) > limit:
+        result = result[:limit]
+        last = result[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([last.training_day, last.created_at, last.id])
+
     return [TrainingPlanCompletion.model_validate(comp) for comp in result]
@@ -1,3 +1,3 @@
-from app.infrastructure.database import get_session
+from app.infrastructure.database import get_read_session, get_session
 
-__all__ = ["get_session"]
+__all__ = ["get_read_session", "get_session"]
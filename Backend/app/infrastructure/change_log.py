@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.Models.sync_change import SyncChange
+
+logger = logging.getLogger(__name__)
+
+# Markierung im Änderungsprotokoll: Einträge mit kleinerer txid wurden gelöscht. Ein Delta-Sync mit
+# einem älteren Watermark ist nicht mehr vollständig möglich und endet mit reset=true.
+PRUNED = "pruned"
+
+
+async def pruned_before(conn: AsyncConnection | AsyncSession) -> int | None:
+    return (await conn.execute(
+        select(func.max(SyncChange.txid)).where(SyncChange.operation == PRUNED)
+    )).scalar()
+
+
+async def prune_sync_changes(conn: AsyncConnection, retention_days: int) -> int:
+    # Löscht alle Einträge von sync_changes unterhalb eines Watermarks, das älter als `retention_days`
+    # ist, und merkt sich dieses Watermark in einer einzelnen PRUNED-Zeile. Die Grenze liegt nie über
+    # dem xmin des aktuellen Snapshots, damit keine Änderungen noch laufender Transaktionen verloren gehen.
+    cutoff = (await conn.execute(
+        select(func.max(SyncChange.txid) + 1).where(
+            SyncChange.changed_at < func.now() - timedelta(days=retention_days),
+            SyncChange.operation != PRUNED,
+        )
+    )).scalar()
+    if cutoff is None:
+        return 0
+
+    snapshot_xmin = (await conn.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))).scalar_one()
+    cutoff = min(cutoff, snapshot_xmin)
+    previous = await pruned_before(conn)
+    if previous is not None and cutoff <= previous:
+        return 0
+
+    # Entfernt auch die bisherige PRUNED-Zeile (txid = previous < cutoff)
+    result = await conn.execute(delete(SyncChange).where(SyncChange.txid < cutoff))
+    await conn.execute(insert(SyncChange).values(txid=cutoff, table_name="*", operation=PRUNED))
+    return result.rowcount
+
+
+async def run_change_log_pruning(engine: AsyncEngine, retention_days: int, interval_seconds: float = 24 * 60 * 60) -> None:
+    # Hintergrund-Task: hält das Änderungsprotokoll auf die letzten `retention_days` Tage begrenzt
+    while True:
+        try:
+            async with engine.begin() as conn:
+                pruned = await prune_sync_changes(conn, retention_days)
+            if pruned:
+                logger.info("Änderungsprotokoll bereinigt: %s Einträge gelöscht", pruned)
+        except Exception:
+            logger.exception("Bereinigung des Änderungsprotokolls fehlgeschlagen")
+        await asyncio.sleep(interval_seconds)
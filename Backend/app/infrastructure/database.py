@@ -1,19 +1,58 @@
 from collections.abc import AsyncGenerator # Import AsyncGenerator für Typ-Hinting von asynchronen Generatoren
+import re
+from contextlib import asynccontextmanager
+from uuid import uuid4
 
 # Importe aus SQLAlchemy für asynchrone Datenbankverbindungen
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base # Import für ORM-Basis-Klasse zur Definition von Datenbankmodellen
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base # Import für ORM-Basis-Klasse zur Definition von Datenbankmodellen
 from app.config import settings # Import der Konfiguration aus der Config-Datei (enthält Datenbank-URL)
+from app.infrastructure.pool_metrics import InstrumentedAsyncQueuePool, instrument_engine
+from app.infrastructure.replica_routing import Replica, ReplicaRouter
 
 # Erstellt die Basis-Klasse, von der alle ORM-Modelle erben werden
 Base = declarative_base()
 
-# Erstellt die asynchrone Datenbank-Engine mit folgenden Konfigurationen:
-engine = create_async_engine(
-    settings.database_url,  # Datenbank-URL aus den Einstellungen
-    echo=False,  # SQL-Statements werden nicht in der Konsole ausgegeben
-    pool_pre_ping=True,  # Testet Verbindung vor Nutzung (verhindert Connection Timeout)
-)
+
+
+def build_connect_args() -> dict:
+    # Hinter einem Transaction-Pooler (z. B. PgBouncer) landen aufeinanderfolgende Transaktionen
+    # auf unterschiedlichen Server-Verbindungen. Prepared Statements dürfen daher weder gecacht
+    # noch unter festen Namen wiederverwendet werden.
+    if settings.db_transaction_pooling:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+
+
+def build_engine(database_url: str):
+    # Erstellt eine asynchrone Datenbank-Engine mit den Pool-Einstellungen aus der Konfiguration
+    new_engine = create_async_engine(
+        database_url,  # Datenbank-URL aus den Einstellungen
+        echo=False,  # SQL-Statements werden nicht in der Konsole ausgegeben
+        poolclass=InstrumentedAsyncQueuePool,  # Pool mit Messung der Wartezeit auf Verbindungen
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,  # Testet Verbindung vor Nutzung (verhindert Connection Timeout)
+        connect_args=build_connect_args(),
+    )
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
+# Erstellt die asynchrone Datenbank-Engine der Anwendung
+engine = build_engine(settings.database_url)
 
 # Erstellt eine Factory für asynchrone Datenbank-Sessions mit Konfigurationen:
 async_session_factory = async_sessionmaker(
@@ -25,6 +64,60 @@ async_session_factory = async_sessionmaker(
 )
 
 
+# Session-Klasse für reine Lesezugriffe: verhindert, dass versehentlich Änderungen geschrieben werden
+class ReadOnlySession(Session):
+    def flush(self, objects=None) -> None:
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Schreibzugriff über eine Read-Only-Session ist nicht erlaubt")
+        super().flush(objects)
+
+
+def build_read_session_factory(source_engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # Engine-Variante für Lesezugriffe: teilt sich den Pool mit der übergebenen Engine, arbeitet aber
+    # im AUTOCOMMIT-Modus. Dadurch entfallen BEGIN und COMMIT/ROLLBACK pro Request; jede
+    # SELECT-Abfrage läuft als eigene implizite Transaktion.
+    return async_sessionmaker(
+        source_engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+# Factory für Read-Only-Sessions auf dem Primary (kein Commit, kein Autoflush)
+async_read_session_factory = build_read_session_factory(engine)
+
+# Engines der Read-Replicas (leer, wenn keine konfiguriert sind)
+replica_engines = [build_engine(url) for url in settings.database_replica_urls]
+
+# Routing der Lesezugriffe auf Replicas mit Fallback auf den Primary
+replica_router = ReplicaRouter(
+    primary_factory=async_read_session_factory,
+    replicas=[
+        Replica(
+            name=make_url(url).render_as_string(hide_password=True),
+            engine=replica_engine,
+            session_factory=build_read_session_factory(replica_engine),
+        )
+        for url, replica_engine in zip(settings.database_replica_urls, replica_engines)
+    ],
+    sticky_seconds=settings.db_replica_sticky_seconds,
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    lag_check_interval=settings.db_replica_lag_check_interval,
+    retry_after_seconds=settings.db_replica_retry_after_seconds,
+)
+
+
+def client_key(request: Request) -> str | None:
+    # Identifiziert einen Client für Read-your-writes: bevorzugt das Profil aus dem Frontend-Header,
+    # sonst die Client-Adresse
+    profile_id = request.headers.get("X-Profile-Id")
+    if profile_id:
+        return f"profile:{profile_id}"
+    return f"host:{request.client.host}" if request.client else None
+
+
 # Asynchrone Generatoren-Funktion, die eine Datenbank-Session bereitstellt
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     # Erstellt einen neuen Session-Kontext mit der Factory
@@ -42,3 +135,42 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         finally:
             # Schliesst die Session in jedem Fall (auch bei Fehlern)
             await session.close()
+
+
+# Dependency für lesende Endpunkte (GET): öffnet keine explizite Transaktion und committed nicht.
+# Sind Replicas konfiguriert, wird der Request auf eine Replica geroutet.
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    session = await replica_router.open_session(client_key(request))
+    async with session:
+        yield session
+
+
+# Read-only Transaktion auf dem Primary für Streaming-Endpunkte: Server-Side-Cursor (session.stream)
+# benötigen bei asyncpg eine offene Transaktion und funktionieren nicht im AUTOCOMMIT-Modus.
+# Wird direkt im Response-Generator geöffnet, damit die Session so lange lebt wie der Stream.
+# Mit isolation_level="REPEATABLE READ" sehen alle Abfragen der Session denselben Snapshot.
+# Mit `snapshot` (Ergebnis von pg_export_snapshot() einer anderen, noch offenen Transaktion) übernimmt
+# die Session deren Snapshot; so lesen mehrere Verbindungen parallel exakt denselben Datenstand.
+@asynccontextmanager
+async def read_transaction_session(isolation_level: str | None = None, snapshot: str | None = None) -> AsyncGenerator[AsyncSession, None]:
+    execution_options = {"postgresql_readonly": True}
+    if snapshot is not None:
+        isolation_level = "REPEATABLE READ"
+    if isolation_level is not None:
+        execution_options["isolation_level"] = isolation_level
+
+    async with async_session_factory() as session:
+        connection = await session.connection(execution_options=execution_options)
+        if snapshot is not None:
+            # Muss die erste Anweisung der Transaktion sein; SET akzeptiert keine Bind-Parameter
+            if not re.fullmatch(r"[0-9A-Fa-f-]+", snapshot):
+                raise ValueError("Invalid snapshot id")
+            await connection.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot}'"))
+        yield session
+
+
+async def dispose_engines() -> None:
+    # Schliesst die Pools von Primary und Replicas
+    await engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
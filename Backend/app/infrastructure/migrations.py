@@ -0,0 +1,71 @@
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex
+
+from app.infrastructure.database import Base
+from app.infrastructure.partitioning import is_partitioned, list_partitions
+
+
+async def index_state(conn: AsyncConnection, name: str) -> bool | None:
+    # True = gültiger Index, False = ungültig (abgebrochener Build), None = existiert nicht
+    return (await conn.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"
+        ),
+        {"name": name},
+    )).scalar_one_or_none()
+
+
+async def build_index_concurrently(conn: AsyncConnection, name: str, ddl: str) -> bool:
+    # Ein abgebrochener CONCURRENTLY-Build hinterlässt einen ungültigen Index; dieser wird
+    # verworfen und neu aufgebaut
+    state = await index_state(conn, name)
+    if state is True:
+        return False
+    if state is False:
+        await conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+    await conn.execute(text(ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)))
+    return True
+
+
+async def create_indexes_concurrently(engine: AsyncEngine) -> list[str]:
+    # Legt alle in den Modellen definierten Indizes auf einer bestehenden Datenbank an, ohne die
+    # Tabellen zu sperren: CREATE INDEX CONCURRENTLY blockiert keine parallelen INSERTs (z. B.
+    # Completions), darf aber nicht innerhalb einer Transaktion laufen -> AUTOCOMMIT.
+    # Partitionierte Tabellen unterstützen kein CONCURRENTLY: dort wird der Index zunächst nur auf
+    # der Eltern-Tabelle angelegt (ON ONLY), dann pro Partition nebenläufig gebaut und angehängt.
+    created = []
+    dialect = postgresql.dialect()
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        for table in Base.metadata.sorted_tables:
+            partitioned = await is_partitioned(conn, table.name)
+            partitions = await list_partitions(conn, table.name) if partitioned else []
+
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+
+                if not partitioned:
+                    if await build_index_concurrently(conn, index.name, ddl):
+                        created.append(index.name)
+                    continue
+
+                if await index_state(conn, index.name) is True:
+                    continue
+
+                await conn.execute(text(ddl.replace(f" ON {table.name} ", f" ON ONLY {table.name} ", 1)))
+                for partition in partitions:
+                    partition_index = f"{index.name}_{partition.removeprefix(table.name + '_')}"[:63]
+                    partition_ddl = ddl.replace(f" {index.name} ", f" {partition_index} ", 1)
+                    partition_ddl = partition_ddl.replace(f" ON {table.name} ", f" ON {partition} ", 1)
+                    await build_index_concurrently(conn, partition_index, partition_ddl)
+                    await conn.execute(text(f'ALTER INDEX "{index.name}" ATTACH PARTITION "{partition_index}"'))
+                created.append(index.name)
+
+    return created
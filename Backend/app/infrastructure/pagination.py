@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import date, datetime
+from uuid import UUID
+
+# Header, in dem die Cursor-basierten Listen-Endpunkte den Cursor der nächsten Seite zurückgeben
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Maximale Seitengrösse für Cursor-Pagination
+MAX_PAGE_SIZE = 1000
+
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime, UUID)):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    # Kodiert die Sortierschlüssel der letzten Zeile einer Seite als URL-sicheren String
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: list[type]) -> list:
+    # Gegenstück zu encode_cursor; wirft ValueError bei ungültigem Cursor
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+
+    parsers = {date: date.fromisoformat, datetime: datetime.fromisoformat, UUID: UUID, int: int}
+    try:
+        return [parsers[value_type](value) for value_type, value in zip(types, values)]
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
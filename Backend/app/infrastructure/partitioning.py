@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.Models.completion_rollup import APPLY_COMPLETION_ROLLUPS, ROLLUP_SOURCE_TABLE, rollup_triggers_ddl
+from app.Models.sync_change import RECORD_SYNC_CHANGES, TRACKED_TABLES, sync_triggers_ddl
+from app.infrastructure.rollups import subtract_rollups
+
+logger = logging.getLogger(__name__)
+
+
+# Tabellen, die monatlich nach einer Datumsspalte range-partitioniert sind (Tabelle -> Partitionsschlüssel)
+PARTITIONED_TABLES = {
+    "training_exercise_completions": "training_day",
+}
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_y{month.year}m{month.month:02d}"
+
+
+def default_partition_name(table_name: str) -> str:
+    return f"{table_name}_default"
+
+
+async def is_partitioned(conn: AsyncConnection, table_name: str) -> bool:
+    relkind = (await conn.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :name AND relnamespace = 'public'::regnamespace"),
+        {"name": table_name},
+    )).scalar_one_or_none()
+    return relkind == "p"
+
+
+async def list_partitions(conn: AsyncConnection, table_name: str) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :name ORDER BY child.relname"
+        ),
+        {"name": table_name},
+    )
+    return list(result.scalars().all())
+
+
+async def create_month_partition(conn: AsyncConnection, table_name: str, column: str, month: date) -> str:
+    # Legt die Partition für einen Monat an. Liegen in der Default-Partition bereits Zeilen dieses
+    # Monats, würde PostgreSQL das Anlegen verweigern; die Zeilen werden daher in die neue Tabelle
+    # verschoben, bevor sie als Partition angehängt wird.
+    name = partition_name(table_name, month)
+    default_name = default_partition_name(table_name)
+    lower, upper = month, add_months(month, 1)
+    bounds = {"lower": lower, "upper": upper}
+
+    has_default = default_name in await list_partitions(conn, table_name)
+    rows_in_default = has_default and (await conn.execute(
+        text(f'SELECT EXISTS (SELECT 1 FROM "{default_name}" WHERE "{column}" >= :lower AND "{column}" < :upper)'),
+        bounds,
+    )).scalar()
+
+    if not rows_in_default:
+        await conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table_name}" '
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        return name
+
+    await conn.execute(text(f'CREATE TABLE "{name}" (LIKE "{table_name}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    await conn.execute(
+        text(
+            f'WITH moved AS (DELETE FROM "{default_name}" WHERE "{column}" >= :lower AND "{column}" < :upper RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved'
+        ),
+        bounds,
+    )
+    await conn.execute(text(
+        f'ALTER TABLE "{table_name}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    ))
+    return name
+
+
+async def ensure_partitions(conn: AsyncConnection, months_back: int, months_ahead: int, today: date | None = None) -> list[str]:
+    # Stellt sicher, dass für alle partitionierten Tabellen die Default-Partition sowie die Monatspartitionen
+    # von `months_back` Monaten zurück bis `months_ahead` Monate voraus existieren
+    today = today or date.today()
+    created = []
+
+    for table_name, column in PARTITIONED_TABLES.items():
+        if not await is_partitioned(conn, table_name):
+            continue
+
+        existing = set(await list_partitions(conn, table_name))
+        default_name = default_partition_name(table_name)
+        if default_name not in existing:
+            await conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{default_name}" PARTITION OF "{table_name}" DEFAULT'))
+            created.append(default_name)
+
+        first_month = add_months(month_start(today), -months_back)
+        for offset in range(months_back + months_ahead + 1):
+            month = add_months(first_month, offset)
+            if partition_name(table_name, month) not in existing:
+                created.append(await create_month_partition(conn, table_name, column, month))
+
+    return created
+
+
+async def run_partition_maintenance(engine: AsyncEngine, months_ahead: int, interval_seconds: float = 24 * 60 * 60) -> None:
+    # Hintergrund-Task: legt regelmässig die Partitionen der kommenden Monate an
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with engine.begin() as conn:
+                created = await ensure_partitions(conn, months_back=0, months_ahead=months_ahead)
+            if created:
+                logger.info("Partitionen angelegt: %s", ", ".join(created))
+        except Exception:
+            logger.exception("Partitionspflege fehlgeschlagen")
+
+
+async def detach_partitions_before(conn: AsyncConnection, table_name: str, cutoff: date, drop: bool = False) -> list[str]:
+    # Hängt alle Monatspartitionen, die vollständig vor `cutoff` liegen, aus der Tabelle aus.
+    # Das ist eine reine Katalogoperation (kein DELETE über Millionen Zeilen); die ausgehängten
+    # Tabellen bleiben als Archiv bestehen oder werden mit drop=True gelöscht.
+    # Die Zeilen einer ausgehängten Partition werden in derselben Transaktion von den Tages-Rollups
+    # abgezogen (Aggregation nur über diese Partition). DETACH sperrt die Partition bis zum Commit,
+    # dazwischen kann sich also nichts mehr an ihr ändern.
+    detached = []
+    cutoff_month = month_start(cutoff)
+
+    for name in await list_partitions(conn, table_name):
+        suffix = name.removeprefix(f"{table_name}_y")
+        if suffix == name or "m" not in suffix:
+            continue
+        year, month = suffix.split("m")
+        if add_months(date(int(year), int(month), 1), 1) > cutoff_month:
+            continue
+
+        await conn.execute(text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{name}"'))
+        if table_name == ROLLUP_SOURCE_TABLE:
+            await subtract_rollups(conn, name)
+        if drop:
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+        detached.append(name)
+
+    return detached
+
+
+async def convert_to_partitioned(conn: AsyncConnection, table_name: str, months_ahead: int) -> int:
+    # Einmalige Migration einer bestehenden, nicht partitionierten Tabelle: die alte Tabelle wird
+    # umbenannt, die partitionierte Tabelle aus den Modellen neu angelegt und die Daten übernommen.
+    # Läuft in einer Transaktion und sperrt die Tabelle für die Dauer der Kopie.
+    from app.infrastructure.database import Base
+
+    if await is_partitioned(conn, table_name):
+        return 0
+
+    column = PARTITIONED_TABLES[table_name]
+    old_name = f"{table_name}_unpartitioned"
+    await conn.execute(text(f'ALTER TABLE "{table_name}" RENAME TO "{old_name}"'))
+
+    # Index- und Constraint-Namen der alten Tabelle freigeben, damit die neue Tabelle sie verwenden kann
+    index_names = (await conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :name"), {"name": old_name}
+    )).scalars().all()
+    for index_name in index_names:
+        await conn.execute(text(f'ALTER INDEX "{index_name}" RENAME TO "{index_name}_old"'))
+
+    await conn.run_sync(Base.metadata.tables[table_name].create)
+
+    first_day = (await conn.execute(text(f'SELECT MIN("{column}") FROM "{old_name}"'))).scalar() or date.today()
+    today = date.today()
+    months_back = (today.year - first_day.year) * 12 + today.month - first_day.month
+    await ensure_partitions(conn, months_back=max(months_back, 0), months_ahead=months_ahead, today=today)
+
+    columns = ", ".join(f'"{c.name}"' for c in Base.metadata.tables[table_name].columns)
+    result = await conn.execute(text(f'INSERT INTO "{table_name}" ({columns}) SELECT {columns} FROM "{old_name}"'))
+    await conn.execute(text(f'DROP TABLE "{old_name}"'))
+
+    # table.create() löst die after_create-DDL der Metadaten nicht aus: die Statement-Trigger für
+    # sync_changes und die Tages-Rollups hier selbst anlegen, sonst fehlen sie bis zum nächsten Start.
+    # Erst nach der Kopie, damit die übernommenen Zeilen weder protokolliert noch doppelt gezählt werden.
+    await create_statement_triggers(conn, table_name)
+    return result.rowcount
+
+
+async def create_statement_triggers(conn: AsyncConnection, table_name: str) -> None:
+    if table_name in TRACKED_TABLES:
+        await conn.execute(RECORD_SYNC_CHANGES)
+        await conn.execute(sync_triggers_ddl(table_name))
+    if table_name == ROLLUP_SOURCE_TABLE:
+        await conn.execute(APPLY_COMPLETION_ROLLUPS)
+        await conn.execute(rollup_triggers_ddl())
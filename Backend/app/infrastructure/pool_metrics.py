@@ -0,0 +1,106 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Obergrenzen der Histogramm-Buckets für die Wartezeit auf eine Verbindung (in Millisekunden)
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    # Sammelt Kennzahlen über die Nutzung des Connection-Pools
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        # Ein Bucket pro Obergrenze plus ein "+Inf"-Bucket für alles darüber
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.timeouts = 0
+        self.pre_ping_failures = 0
+        self.connects = 0
+
+    def observe_wait(self, wait_ms: float) -> None:
+        self.wait_count += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        for index, upper in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= upper:
+                self.wait_buckets[index] += 1
+                return
+        self.wait_buckets[-1] += 1
+
+    def histogram(self) -> dict[str, int]:
+        labels = [f"le_{upper}ms" for upper in WAIT_BUCKETS_MS] + ["le_inf"]
+        return dict(zip(labels, self.wait_buckets))
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    # Misst die Zeit, die ein Request auf eine freie Verbindung aus dem Pool wartet.
+    # Jeder Pool (Primary, Replicas) führt seine eigene Metrik-Instanz, angelegt mit dem Pool, damit
+    # Wartezeiten auf Replicas nie in die Kennzahlen des Primary einfliessen.
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.observe_wait((time.perf_counter() - started) * 1000)
+
+    def recreate(self):
+        # engine.dispose() ersetzt den Pool; die Kennzahlen werden übernommen
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+def instrument_engine(sync_engine: Engine) -> PoolMetrics:
+    # Registriert Event-Listener für neue Verbindungen und fehlgeschlagene Pre-Pings auf der
+    # Metrik-Instanz des Pools dieser Engine
+    metrics = getattr(sync_engine.pool, "metrics", None)
+    if metrics is None:
+        metrics = sync_engine.pool.metrics = PoolMetrics()
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record) -> None:
+        metrics.connects += 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context) -> None:
+        if context.is_pre_ping:
+            metrics.pre_ping_failures += 1
+
+    return metrics
+
+
+def pool_snapshot(sync_engine: Engine, name: str) -> dict:
+    # Liefert den aktuellen Zustand eines Pools zusammen mit seinen eigenen Kennzahlen
+    pool = sync_engine.pool
+    pool_metrics = getattr(pool, "metrics", None) or PoolMetrics()
+    return {
+        "name": name,
+        "pool_class": type(pool).__name__,
+        "size": pool.size() if hasattr(pool, "size") else 0,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        # QueuePool meldet negativen Overflow, solange pool_size nicht ausgeschöpft ist
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+        "connects": pool_metrics.connects,
+        "timeouts": pool_metrics.timeouts,
+        "pre_ping_failures": pool_metrics.pre_ping_failures,
+        "wait_count": pool_metrics.wait_count,
+        "wait_avg_ms": pool_metrics.wait_total_ms / pool_metrics.wait_count if pool_metrics.wait_count else 0.0,
+        "wait_max_ms": pool_metrics.wait_max_ms,
+        "wait_histogram_ms": pool_metrics.histogram(),
+    }
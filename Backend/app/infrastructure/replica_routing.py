@@ -0,0 +1,118 @@
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Replikationsverzögerung in Sekunden. Auf einem Primary (oder einer normalen Datenbank beim lokalen
+# Testen mit zwei Datenbanknamen) liefern die Funktionen NULL, was als 0 gewertet wird.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.lag_seconds = 0.0
+        self.lag_checked_at = 0.0
+        self.unhealthy_until = 0.0
+        self.failures = 0
+
+    def is_available(self, now: float, max_lag_seconds: float, lag_check_interval: float) -> bool:
+        # Eine zu weit hinterherhinkende Replica wird nach Ablauf des Intervalls erneut gemessen
+        lag_ok = self.lag_seconds <= max_lag_seconds or now - self.lag_checked_at >= lag_check_interval
+        return now >= self.unhealthy_until and lag_ok
+
+
+class ReplicaRouter:
+    # Verteilt Lesezugriffe per Round-Robin auf die Replicas. Clients, die kürzlich geschrieben haben,
+    # lesen für `sticky_seconds` vom Primary (Read-your-writes). Ausgefallene oder zu weit
+    # hinterherhinkende Replicas werden übersprungen; im Zweifel wird immer der Primary genutzt.
+
+    def __init__(
+        self,
+        primary_factory: async_sessionmaker[AsyncSession],
+        replicas: list[Replica],
+        sticky_seconds: float,
+        max_lag_seconds: float,
+        lag_check_interval: float,
+        retry_after_seconds: float,
+    ) -> None:
+        self.primary_factory = primary_factory
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_interval = lag_check_interval
+        self.retry_after_seconds = retry_after_seconds
+        self._next_index = 0
+        self._last_write: dict[str, float] = {}
+
+    def mark_write(self, client_key: str | None) -> None:
+        if not self.replicas or client_key is None:
+            return
+        now = time.monotonic()
+        self._last_write[client_key] = now
+        # Abgelaufene Einträge gelegentlich entfernen, damit das Dict nicht unbegrenzt wächst
+        if len(self._last_write) > 10_000:
+            cutoff = now - self.sticky_seconds
+            self._last_write = {key: ts for key, ts in self._last_write.items() if ts >= cutoff}
+
+    def is_sticky(self, client_key: str | None) -> bool:
+        if client_key is None:
+            return False
+        last_write = self._last_write.get(client_key)
+        return last_write is not None and time.monotonic() - last_write < self.sticky_seconds
+
+    def candidates(self, client_key: str | None) -> list[Replica]:
+        # Reihenfolge der Replicas, die für diesen Request ausprobiert werden
+        if not self.replicas or self.is_sticky(client_key):
+            return []
+        now = time.monotonic()
+        start = self._next_index % len(self.replicas)
+        self._next_index += 1
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.is_available(now, self.max_lag_seconds, self.lag_check_interval)]
+
+    def mark_failed(self, replica: Replica, error: Exception) -> None:
+        replica.failures += 1
+        replica.unhealthy_until = time.monotonic() + self.retry_after_seconds
+        logger.warning("Replica %s nicht erreichbar, Fallback auf Primary: %s", replica.name, error)
+
+    async def open_session(self, client_key: str | None) -> AsyncSession:
+        # Liefert eine Session mit bereits ausgeliehener Verbindung, damit Verbindungsfehler
+        # hier (und nicht erst im Endpunkt) auftreten und auf den Primary ausgewichen werden kann
+        for replica in self.candidates(client_key):
+            session = replica.session_factory()
+            try:
+                connection = await session.connection()
+                if time.monotonic() - replica.lag_checked_at >= self.lag_check_interval:
+                    replica.lag_seconds = float((await connection.execute(REPLICA_LAG_QUERY)).scalar() or 0)
+                    replica.lag_checked_at = time.monotonic()
+                    if replica.lag_seconds > self.max_lag_seconds:
+                        await session.close()
+                        continue
+                return session
+            except Exception as e:
+                await session.close()
+                self.mark_failed(replica, e)
+        return self.primary_factory()
+
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "name": replica.name,
+                "healthy": now >= replica.unhealthy_until,
+                "lag_seconds": replica.lag_seconds,
+                "failures": replica.failures,
+            }
+            for replica in self.replicas
+        ]
@@ -0,0 +1,34 @@
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.Models.completion_rollup import ADD_ROLLUPS_SQL, REMOVE_EMPTY_ROLLUPS_SQL, SUBTRACT_ROLLUPS_SQL
+
+
+async def rebuild_rollups(conn: AsyncConnection, profile_id: UUID | None = None) -> int:
+    # Baut completion_daily_rollups (alle oder die eines Profils) aus dem Completion-Log neu auf,
+    # z. B. einmalig nach dem Anlegen der Tabelle für bestehende Daten. Die Trigger halten die
+    # Rollups danach aktuell. SHARE-Lock: Lesen bleibt möglich, neue Completions warten, bis der
+    # Neuaufbau committet ist, damit kein Insert doppelt oder gar nicht gezählt wird.
+    await conn.execute(text("LOCK TABLE training_exercise_completions IN SHARE MODE"))
+
+    if profile_id is None:
+        await conn.execute(text("DELETE FROM completion_daily_rollups"))
+        rows = "training_exercise_completions"
+        params = {}
+    else:
+        await conn.execute(text("DELETE FROM completion_daily_rollups WHERE profile_id = :profile_id"), {"profile_id": profile_id})
+        rows = "(SELECT * FROM training_exercise_completions WHERE profile_id = :profile_id) AS completions"
+        params = {"profile_id": profile_id}
+
+    result = await conn.execute(text(ADD_ROLLUPS_SQL.format(rows=rows)), params)
+    return result.rowcount
+
+
+async def subtract_rollups(conn: AsyncConnection, table_name: str) -> int:
+    # Zieht die Completions einer Tabelle mit dem Aufbau von training_exercise_completions (z. B. einer
+    # ausgehängten Partition) von den Rollups ab, damit diese wieder genau dem Completion-Log entsprechen
+    rows = f'"{table_name}"'
+    result = await conn.execute(text(SUBTRACT_ROLLUPS_SQL.format(rows=rows)))
+    await conn.execute(text(REMOVE_EMPTY_ROLLUPS_SQL.format(rows=rows)))
+    return result.rowcount
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.infrastructure.database import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+# Schreibt Zeilen in die Datenbank und liefert die Schlüssel der tatsächlich neu eingefügten Zeilen
+InsertFunction = Callable[[AsyncSession, list[dict]], Awaitable[set[Hashable]]]
+# Schlüssel einer Zeile in derselben Form, wie ihn die InsertFunction zurückgibt
+RowKey = Callable[[dict], Hashable]
+
+
+def row_id(row: dict) -> Hashable:
+    return row["id"]
+
+
+class PendingWrite:
+    def __init__(self, insert: InsertFunction, rows: list[dict], key: RowKey) -> None:
+        self.insert = insert
+        self.rows = rows
+        self.key = key
+        self.future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+
+    def resolve(self, inserted_keys: set[Hashable]) -> None:
+        if not self.future.done():
+            self.future.set_result(sum(1 for row in self.rows if self.key(row) in inserted_keys))
+
+    def fail(self, error: Exception) -> None:
+        if not self.future.done():
+            self.future.set_exception(error)
+
+
+class WriteBuffer:
+    # Group Commit für Inserts: Zeilen mehrerer Requests werden gesammelt und alle `flush_interval`
+    # Sekunden oder sobald `max_rows` Zeilen anstehen in einer Transaktion mit Multi-Row-Inserts
+    # geschrieben. Statt eines Commits pro Request gibt es einen Commit pro Flush.
+    #
+    # Bestätigung (ack):
+    #   "commit"   write() kehrt erst zurück, wenn der Flush mit den Zeilen committet ist. Gleiche
+    #              Dauerhaftigkeit wie ohne Puffer, der Request wartet höchstens flush_interval länger.
+    #   "enqueue"  write() kehrt sofort zurück. Zeilen, die noch im Speicher liegen, gehen bei einem
+    #              Absturz des Prozesses verloren (höchstens flush_interval bzw. max_rows); beim
+    #              regulären Herunterfahren werden sie mit drain() geschrieben. Fehler beim Flush
+    #              werden nur geloggt, und folgende Lesezugriffe sehen die Zeilen erst nach dem Flush.
+    #
+    # Schlägt ein Flush fehl (z. B. weil ein referenzierter Plan inzwischen gelöscht wurde), werden die
+    # Einträge einzeln wiederholt, damit nur der fehlerhafte Request den Fehler erhält.
+    #
+    # Der Flush holt sich eine eigene Verbindung aus dem Pool. Aufrufer müssen ihre Request-Session
+    # daher vor write() freigeben (z. B. session.commit() nach der Validierung): Halten viele wartende
+    # Requests ihre Verbindung in einer offenen Transaktion, bekommt der Flush keine Verbindung mehr,
+    # läuft in pool_timeout und alle Requests schlagen fehl (beim Einzeln-Wiederholen sogar mehrfach).
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval: float,
+        max_rows: int,
+        ack: str = "commit",
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_rows = max(max_rows, 1)
+        self.ack = ack
+        self._pending: list[PendingWrite] = []
+        self._pending_rows = 0
+        self._has_pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.flushes = 0
+        self.flushed_rows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing
+
+    def start(self) -> None:
+        if not self.running:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def write(self, insert: InsertFunction, rows: list[dict], key: RowKey = row_id) -> int | None:
+        # Liefert bei ack="commit" die Anzahl neu eingefügter Zeilen, bei ack="enqueue" None.
+        # `key` bildet eine Zeile auf den Schlüssel ab, den `insert` für neue Zeilen zurückgibt.
+        if not rows:
+            return 0
+        if not self.running:
+            raise RuntimeError("Write buffer is not running")
+
+        pending = PendingWrite(insert, rows, key)
+        self._pending.append(pending)
+        self._pending_rows += len(rows)
+        self._has_pending.set()
+        if self._pending_rows >= self.max_rows:
+            self._full.set()
+
+        # Rückstau: kommt die Datenbank nicht nach, warten auch "enqueue"-Requests auf ihren Flush
+        if self.ack == "commit" or self._pending_rows >= 10 * self.max_rows:
+            return await pending.future
+
+        pending.future.add_done_callback(self._log_failure)
+        return None
+
+    @staticmethod
+    def _log_failure(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Gepufferte Zeilen konnten nicht geschrieben werden: %s", future.exception())
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            await self._flush_pending()
+            if self._closing:
+                return
+
+    async def _flush_pending(self) -> None:
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        self._has_pending.clear()
+        self._full.clear()
+        if batch:
+            await self.flush(batch)
+
+    async def flush(self, batch: list[PendingWrite]) -> None:
+        try:
+            results = await self._write(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].fail(e)
+                return
+            # Einzeln wiederholen, damit ein fehlerhafter Eintrag nicht die anderen mitreisst
+            for pending in batch:
+                await self.flush([pending])
+            return
+
+        for pending in batch:
+            pending.resolve(results[pending.insert])
+        self.flushes += 1
+        self.flushed_rows += sum(len(pending.rows) for pending in batch)
+
+    async def _write(self, batch: list[PendingWrite]) -> dict[InsertFunction, set[Hashable]]:
+        groups: dict[InsertFunction, list[dict]] = {}
+        for pending in batch:
+            groups.setdefault(pending.insert, []).extend(pending.rows)
+
+        async with self.session_factory() as session:
+            results = {insert: await insert(session, rows) for insert, rows in groups.items()}
+            await session.commit()
+        return results
+
+    async def drain(self) -> None:
+        # Beim Herunterfahren: keine neuen Zeilen mehr annehmen, Ausstehendes schreiben, Task beenden
+        self._closing = True
+        self._has_pending.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self._flush_pending()
+
+
+# Puffer für Exercise- und Plan-Completions; läuft nur mit COMPLETION_WRITE_BUFFER=true (Start im Lifespan)
+completion_write_buffer = WriteBuffer(
+    async_session_factory,
+    flush_interval=settings.completion_write_buffer_interval_ms / 1000,
+    max_rows=settings.completion_write_buffer_max_rows,
+    ack=settings.completion_write_buffer_ack,
+)
@@ -1,9 +1,15 @@
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.infrastructure.database import Base, engine, get_session
+from app.infrastructure.database import Base, client_key, dispose_engines, engine, get_session, replica_router
+from app.config import settings
 from app.infrastructure.initial_data import init_db
+from app.infrastructure.pagination import NEXT_CURSOR_HEADER
+from app.infrastructure.partitioning import ensure_partitions, run_partition_maintenance
+from app.infrastructure.change_log import run_change_log_pruning
+from app.infrastructure.write_buffer import completion_write_buffer
 from app.features.health.router import router as health_router
 from app.features.profiles.profile_create import router as profile_create_router
 from app.features.profiles.profile_get_all import router as profile_get_all_router
@@ -23,7 +29,9 @@ from app.features.training_plan.training_plan_update import router as training_p
 from app.features.training_plan.training_plan_delete import router as training_plan_delete_router
 from app.features.training_plan.training_plan_execute import router as training_plan_execute_router
 from app.features.excersice_completion.excersice_completion_create import router as excersice_completion_create_router
+from app.features.excersice_completion.excersice_completion_bulk_create import router as excersice_completion_bulk_create_router
 from app.features.excersice_completion.excersice_completion_get_all_by_profile_id import router as excersice_completion_get_all_by_profile_id_router
+from app.features.excersice_completion.excersice_completion_stream_by_profile_id import router as excersice_completion_stream_by_profile_id_router
 from app.features.training_plan_completion.training_plan_completion_create import router as training_plan_completion_create_router
 from app.features.training_plan_completion.training_plan_completion_get_all_by_profile_id import router as training_plan_completion_get_all_by_profile_id_router
 from app.features.body_category.body_category_create import router as body_category_create_router
@@ -33,6 +41,15 @@ from app.features.body_category.body_category_update import router as body_categ
 from app.features.body_category.body_category_delete import router as body_category_delete_router
 from app.features.data_sync.data_sync_export import router as data_sync_export_router
 from app.features.data_sync.data_sync_import import router as data_sync_import_router
+from app.features.data_sync.data_sync_import_stream import router as data_sync_import_stream_router
+from app.features.data_sync.data_sync_changes import router as data_sync_changes_router
+from app.features.data_sync.data_sync_profile_export import router as data_sync_profile_export_router
+from app.features.data_sync.data_sync_profile_import import router as data_sync_profile_import_router
+from app.features.analytics.analytics_volume import router as analytics_volume_router
+from app.features.analytics.analytics_sessions import router as analytics_sessions_router
+from app.features.analytics.analytics_plan_completion import router as analytics_plan_completion_router
+from app.features.analytics.analytics_heatmap import router as analytics_heatmap_router
+from app.features.progress.progress_get import router as progress_get_router
 
 
 @asynccontextmanager
@@ -40,14 +57,28 @@ async def lifespan(app: FastAPI):
     # Startup: Tabellen anlegen (alle Modelle sind durch Import oben registriert)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # Monatspartitionen der Completion-Historie (aktueller Monat bis einige Monate voraus)
+        await ensure_partitions(conn, months_back=0, months_ahead=settings.completion_partition_months_ahead)
+    partition_task = asyncio.create_task(run_partition_maintenance(engine, settings.completion_partition_months_ahead))
+    # Änderungsprotokoll für den Delta-Sync auf die Aufbewahrungsdauer begrenzen (beim Start und danach täglich)
+    pruning_task = None
+    if settings.sync_changes_retention_days > 0:
+        pruning_task = asyncio.create_task(run_change_log_pruning(engine, settings.sync_changes_retention_days))
+    if settings.completion_write_buffer:
+        completion_write_buffer.start()
     
     # Init Data
     async for session in get_session():
         await init_db(session)
         break
     yield
-    # Shutdown: Engine schließen
-    await engine.dispose()
+    partition_task.cancel()
+    if pruning_task is not None:
+        pruning_task.cancel()
+    # Gepufferte Completions schreiben, bevor die Engines geschlossen werden
+    await completion_write_buffer.drain()
+    # Shutdown: Engines (Primary und Replicas) schließen
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -57,12 +88,22 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+@app.middleware("http")
+async def track_writes(request: Request, call_next):
+    # Merkt sich schreibende Clients, damit deren folgende Lesezugriffe vom Primary bedient werden
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        replica_router.mark_write(client_key(request))
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:4200", "file://", "null"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # Cursor der nächsten Seite bei paginierten Listen
 )
 
 app.include_router(health_router, prefix="/health", tags=["health"])
@@ -84,7 +125,9 @@ app.include_router(training_plan_update_router)
 app.include_router(training_plan_delete_router)
 app.include_router(training_plan_execute_router)
 app.include_router(excersice_completion_create_router)
+app.include_router(excersice_completion_bulk_create_router)
 app.include_router(excersice_completion_get_all_by_profile_id_router)
+app.include_router(excersice_completion_stream_by_profile_id_router)
 app.include_router(training_plan_completion_create_router)
 app.include_router(training_plan_completion_get_all_by_profile_id_router)
 app.include_router(body_category_create_router)
@@ -93,4 +136,13 @@ app.include_router(body_category_get_by_id_router)
 app.include_router(body_category_update_router)
 app.include_router(body_category_delete_router)
 app.include_router(data_sync_export_router)
-app.include_router(data_sync_import_router)
\ No newline at end of file
+app.include_router(data_sync_import_router)
+app.include_router(data_sync_import_stream_router)
+app.include_router(data_sync_changes_router)
+app.include_router(data_sync_profile_export_router)
+app.include_router(data_sync_profile_import_router)
+app.include_router(analytics_volume_router)
+app.include_router(analytics_sessions_router)
+app.include_router(analytics_plan_completion_router)
+app.include_router(analytics_heatmap_router)
+app.include_router(progress_get_router)
\ No newline at end of file
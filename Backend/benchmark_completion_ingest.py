@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import app.main  # noqa: F401  (registriert alle Modelle)
+from sqlalchemy import delete
+from app.infrastructure.database import async_session_factory, engine
+from app.Models.profile import Profile
+from app.Models.body_category import BodyCategory
+from app.Models.training_exercise_item import TrainingExerciseItem
+from app.Models.training_plan import TrainingPlan, TrainingExercise
+from app.Models.training_exercise_completion import TrainingExerciseCompletion as TrainingExerciseCompletionModel
+from app.features.excersice_completion.completion_insert import completion_rows, insert_completions
+from app.features.excersice_completion.schemas import TrainingExerciseCompletionCreate as TrainingExerciseCompletion
+
+# Durchsatz beim Speichern von Exercise-Completions: bisherige ORM-Schleife (ein Objekt pro Satz)
+# gegen den idempotenten Multi-Row-Insert mit ON CONFLICT DO NOTHING. Legt ein eigenes Profil an
+# und entfernt alle Testdaten am Ende wieder.
+#   python benchmark_completion_ingest.py --rows 50000 --batch 500
+
+
+async def create_fixture() -> dict:
+    async with async_session_factory() as session:
+        profile = Profile(name=f"Bench Profile {uuid.uuid4()}")
+        category = BodyCategory(name=f"Bench Category {uuid.uuid4()}")
+        session.add_all([profile, category])
+        await session.flush()
+        item = TrainingExerciseItem(description=f"Bench Item {uuid.uuid4()}", body_category_id=category.id)
+        plan = TrainingPlan(name=f"Bench Plan {uuid.uuid4()}", profile_id=profile.id)
+        session.add_all([item, plan])
+        await session.flush()
+        exercise = TrainingExercise(
+            training_plan_id=plan.id, order=1, equipment="Dumbbells", sets=3, reps=10,
+            break_time_seconds=60, training_exercise_item_id=item.id,
+        )
+        session.add(exercise)
+        await session.commit()
+        return {"profile": profile.id, "category": category.id, "item": item.id, "plan": plan.id, "exercise": exercise.id}
+
+
+async def remove_fixture(fixture: dict) -> None:
+    async with async_session_factory() as session:
+        await session.execute(delete(TrainingExerciseCompletionModel).where(TrainingExerciseCompletionModel.profile_id == fixture["profile"]))
+        await session.execute(delete(TrainingExercise).where(TrainingExercise.id == fixture["exercise"]))
+        await session.execute(delete(TrainingPlan).where(TrainingPlan.id == fixture["plan"]))
+        await session.execute(delete(TrainingExerciseItem).where(TrainingExerciseItem.id == fixture["item"]))
+        await session.execute(delete(BodyCategory).where(BodyCategory.id == fixture["category"]))
+        await session.execute(delete(Profile).where(Profile.id == fixture["profile"]))
+        await session.commit()
+
+
+def build_batches(fixture: dict, rows: int, batch: int) -> list[list[TrainingExerciseCompletion]]:
+    completions = [
+        TrainingExerciseCompletion(
+            id=uuid.uuid4(),
+            profile_id=fixture["profile"],
+            training_plan_id=fixture["plan"],
+            exercise_id=fixture["exercise"],
+            exercise_description="Bench Exercise",
+            body_category_id=fixture["category"],
+            body_category_name="Bench",
+            order=1,
+            equipment="Dumbbells",
+            reps=10,
+            break_time_seconds=60,
+            training_day=date.today() - timedelta(days=i // 100),
+        )
+        for i in range(rows)
+    ]
+    return [completions[start:start + batch] for start in range(0, rows, batch)]
+
+
+async def orm_loop(batches: list[list[TrainingExerciseCompletion]]) -> int:
+    # Bisheriger Pfad des Endpunkts: ein ORM-Objekt pro Completion, flush und commit pro Request
+    for batch in batches:
+        async with async_session_factory() as session:
+            for ec in batch:
+                session.add(TrainingExerciseCompletionModel(
+                    id=ec.id, profile_id=ec.profile_id, training_plan_id=ec.training_plan_id,
+                    exercise_id=ec.exercise_id, exercise_description=ec.exercise_description,
+                    exercise_video_url=ec.exercise_video_url, body_category_id=ec.body_category_id,
+                    body_category_name=ec.body_category_name, order=ec.order, equipment=ec.equipment,
+                    reps=ec.reps, break_time_seconds=ec.break_time_seconds,
+                    created_at=datetime.now(), training_day=ec.training_day,
+                ))
+            await session.flush()
+            await session.commit()
+    return sum(len(batch) for batch in batches)
+
+
+async def bulk_insert(batches: list[list[TrainingExerciseCompletion]]) -> int:
+    accepted = 0
+    for batch in batches:
+        async with async_session_factory() as session:
+            accepted += len(await insert_completions(session, completion_rows(batch)))
+            await session.commit()
+    return accepted
+
+
+async def main(args):
+    fixture = await create_fixture()
+    try:
+        print(f"{'variant':>16} {'rows':>8} {'accepted':>9} {'seconds':>8} {'rows/s':>10}")
+        for name, run in [("orm loop", orm_loop), ("bulk insert", bulk_insert), ("bulk (retry)", None)]:
+            if run is None:
+                # Same batches again: everything is a duplicate and must be skipped
+                run = bulk_insert
+            else:
+                batches = build_batches(fixture, args.rows, args.batch)
+            started = time.perf_counter()
+            accepted = await run(batches)
+            elapsed = time.perf_counter() - started
+            print(f"{name:>16} {args.rows:>8} {accepted:>9} {elapsed:>8.2f} {args.rows / elapsed:>10,.0f}")
+    finally:
+        await remove_fixture(fixture)
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=500, help="Completions pro Request")
+    asyncio.run(main(parser.parse_args()))
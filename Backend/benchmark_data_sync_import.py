@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import app.main  # noqa: F401  (registriert alle Modelle)
+from sqlalchemy import delete
+from app.infrastructure.database import async_session_factory, engine
+from app.features.data_sync.copy_import import copy_import
+from app.features.data_sync.schemas import DataSyncExport
+from app.features.data_sync.tables import SYNC_TABLES
+
+# Vergleicht den bisherigen ORM-Import (Zeile für Zeile über session.add) mit dem COPY-Import über
+# Staging-Tabellen. ACHTUNG: beide Varianten ersetzen den kompletten Datenbestand der Zieldatenbank.
+#   python benchmark_data_sync_import.py --completions 100000 --yes
+
+
+def build_document(completions: int) -> DataSyncExport:
+    today = date.today()
+    now = datetime.now()
+    profile_id = uuid.uuid4()
+    category_ids = [uuid.uuid4() for _ in range(5)]
+    item_ids = [uuid.uuid4() for _ in range(40)]
+    plan_ids = [uuid.uuid4() for _ in range(10)]
+
+    exercises = []
+    for plan_index, plan_id in enumerate(plan_ids):
+        for order in range(1, 9):
+            exercises.append({
+                "id": uuid.uuid4(),
+                "training_plan_id": plan_id,
+                "order": order,
+                "equipment": "Dumbbells",
+                "sets": 3,
+                "reps": 10,
+                "break_time_seconds": 60,
+                "training_exercise_item_id": item_ids[(plan_index * 8 + order) % len(item_ids)],
+            })
+
+    plan_completions = []
+    exercise_completions = []
+    while len(exercise_completions) < completions:
+        day = today - timedelta(days=len(plan_completions) // 2)
+        plan_index = len(plan_completions) % len(plan_ids)
+        plan_completions.append({
+            "id": uuid.uuid4(),
+            "profile_id": profile_id,
+            "training_plan_id": plan_ids[plan_index],
+            "training_plan_name": f"Plan {plan_index}",
+            "count_completed_exercises": 8,
+            "count_open_exercises": 0,
+            "created_at": now,
+            "training_day": day,
+        })
+        for exercise in exercises[plan_index * 8:(plan_index + 1) * 8]:
+            for _ in range(exercise["sets"]):
+                exercise_completions.append({
+                    "id": uuid.uuid4(),
+                    "profile_id": profile_id,
+                    "training_plan_id": exercise["training_plan_id"],
+                    "exercise_id": exercise["id"],
+                    "exercise_description": "Bench Exercise",
+                    "body_category_id": category_ids[0],
+                    "body_category_name": "Bench",
+                    "order": exercise["order"],
+                    "equipment": exercise["equipment"],
+                    "reps": exercise["reps"],
+                    "break_time_seconds": exercise["break_time_seconds"],
+                    "created_at": now,
+                    "training_day": day,
+                })
+
+    return DataSyncExport.model_validate({
+        "profiles": [{"id": profile_id, "name": "Bench Profile"}],
+        "body_categories": [{"id": category_id, "name": f"Bench {i}"} for i, category_id in enumerate(category_ids)],
+        "training_exercise_items": [
+            {"id": item_id, "description": f"Bench Item {i}", "body_category_id": category_ids[i % len(category_ids)]}
+            for i, item_id in enumerate(item_ids)
+        ],
+        "training_plans": [{"id": plan_id, "name": f"Plan {i}", "profile_id": profile_id} for i, plan_id in enumerate(plan_ids)],
+        "training_exercises": exercises,
+        "training_plan_completions": plan_completions,
+        "training_exercise_completions": exercise_completions[:completions],
+    })
+
+
+async def orm_import(data: DataSyncExport) -> None:
+    # Bisheriger Importpfad: DELETE je Tabelle, danach ORM-Objekte je Tabelle hinzufügen und flushen
+    async with async_session_factory() as session:
+        for _, model, _ in reversed(SYNC_TABLES):
+            await session.execute(delete(model))
+        for key, model, _ in SYNC_TABLES:
+            for row in getattr(data, key):
+                session.add(model(**row.model_dump()))
+            await session.flush()
+        await session.commit()
+
+
+async def bulk_import(data: DataSyncExport) -> None:
+    async with async_session_factory() as session:
+        await copy_import(session, data)
+        await session.commit()
+
+
+async def main(args):
+    try:
+        data = build_document(args.completions)
+        print(f"{len(data.training_exercise_completions)} exercise completions, "
+              f"{len(data.training_plan_completions)} plan completions")
+
+        for name, run in [("orm", orm_import), ("copy", bulk_import)]:
+            started = time.perf_counter()
+            await run(data)
+            elapsed = time.perf_counter() - started
+            rate = len(data.training_exercise_completions) / elapsed
+            print(f"{name:>5}: {elapsed:8.2f} s  ({rate:,.0f} completions/s)")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--completions", type=int, default=100_000)
+    parser.add_argument("--yes", action="store_true", help="Bestätigt, dass alle Daten der Datenbank ersetzt werden")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("Der Benchmark ersetzt alle Daten der Datenbank; mit --yes bestätigen")
+    asyncio.run(main(args))
@@ -0,0 +1,126 @@
+import argparse
+import os
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from app.features.progress.engine import ProgressHistory, compute_progress
+
+# Fortschrittsberechnung (/profiles/{id}/progress) auf einer synthetischen Historie ohne Datenbank:
+# Aufbau der Spalten aus Zeilen-Tupeln (wie beim Laden), vektorisierte Berechnung, Anhängen neuer
+# Completions statt Neuladen und zum Vergleich eine reine Python-Schleife über die Zeilen.
+#   python benchmark_progress_engine.py --rows 1000000 --exercises 40
+
+
+def synthetic_rows(rows: int, exercises: int, history_days: int, today: date) -> list[tuple]:
+    # Rows sorted by training day like the load query; reps slowly increase, so the trends are positive
+    rng = np.random.default_rng(42)
+    exercise_ids = [uuid.uuid4() for _ in range(exercises)]
+    day_numbers = np.sort(rng.integers(0, history_days, rows))
+    exercise_codes = rng.integers(0, exercises, rows)
+    reps = rng.integers(5, 15, rows) + day_numbers // 200
+    first = today - timedelta(days=history_days - 1)
+    days = [first + timedelta(days=offset) for offset in range(history_days)]
+    return [
+        (days[day], exercise_ids[code], rep, 60)
+        for day, code, rep in zip(day_numbers.tolist(), exercise_codes.tolist(), reps.tolist())
+    ]
+
+
+def build_history(rows: list[tuple]) -> ProgressHistory:
+    # Same conversion as history_cache.load_history, in chunks of 50 000 rows
+    history = ProgressHistory()
+    for start in range(0, len(rows), 50_000):
+        chunk = rows[start:start + 50_000]
+        count = len(chunk)
+        days, exercise_ids, reps, break_times = zip(*chunk)
+        history.append_columns(
+            np.fromiter((day.toordinal() for day in days), np.int32, count),
+            np.fromiter((history.exercise_code(exercise_id) for exercise_id in exercise_ids), np.int32, count),
+            np.fromiter(reps, np.int32, count),
+            np.fromiter(break_times, np.int32, count),
+        )
+    return history
+
+
+def python_loop(rows: list[tuple], today: date, period_days: int) -> dict:
+    # Records, best training days, trends and streaks with dicts, one row at a time
+    first_day = today - timedelta(days=period_days - 1)
+    best_set: dict = {}
+    volume: dict = defaultdict(int)
+    training_days = set()
+    for day, exercise_id, reps, _ in rows:
+        training_days.add(day)
+        volume[(exercise_id, day)] += reps
+        best = best_set.get(exercise_id)
+        if best is None or reps > best[0] or (reps == best[0] and day < best[1]):
+            best_set[exercise_id] = (reps, day)
+
+    points: dict = defaultdict(list)
+    for (exercise_id, day), total in volume.items():
+        if day >= first_day:
+            points[exercise_id].append((day.toordinal(), total))
+    slopes = {}
+    for exercise_id, values in points.items():
+        n = len(values)
+        mean_x = sum(x for x, _ in values) / n
+        mean_y = sum(y for _, y in values) / n
+        sxx = sum((x - mean_x) ** 2 for x, _ in values)
+        slopes[exercise_id] = sum((x - mean_x) * (y - mean_y) for x, y in values) / sxx * 7 if sxx else None
+
+    longest = current = 0
+    previous = None
+    for day in sorted(training_days):
+        current = current + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, current)
+        previous = day
+    return {"records": best_set, "slopes": slopes, "longest_streak_days": longest}
+
+
+def timed(label: str, function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    print(f"{label:>28} {time.perf_counter() - started:>9.3f} s")
+    return result
+
+
+def main(args):
+    today = date.today()
+    rows = timed("generate rows", synthetic_rows, args.rows, args.exercises, args.history_days, today)
+    history = timed("build columns", build_history, rows)
+    progress = timed("compute (numpy)", lambda: compute_progress(history.columns(), today, args.days))
+
+    new_rows = [
+        {"training_day": today, "exercise_id": history.exercise_ids[i % args.exercises], "reps": 12, "break_time_seconds": 60}
+        for i in range(args.append)
+    ]
+    timed(f"append {args.append} rows", history.append, new_rows)
+    appended = timed("compute after append", lambda: compute_progress(history.columns(), today, args.days))
+    assert appended["total_sets"] == progress["total_sets"] + args.append
+
+    expected = timed("python loop", python_loop, rows, today, args.days)
+
+    # Both implementations must agree before their timings mean anything
+    records = {e["exercise_id"]: (e["best_set_reps"], e["best_set_day"]) for e in progress["exercises"]}
+    assert records == expected["records"], "personal records differ"
+    assert progress["longest_streak_days"] == expected["longest_streak_days"], "streaks differ"
+    for exercise in progress["exercises"]:
+        slope = expected["slopes"].get(exercise["exercise_id"])
+        if slope is not None and exercise["reps_per_week_trend"] is not None:
+            assert abs(slope - exercise["reps_per_week_trend"]) < 1e-6 * max(1.0, abs(slope)), "trends differ"
+    print(f"{len(rows):,} rows, {progress['training_days']:,} training days, results match")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--exercises", type=int, default=40)
+    parser.add_argument("--history-days", type=int, default=3650, help="Länge der synthetischen Historie")
+    parser.add_argument("--days", type=int, default=90, help="Zeitraum der Tagesreihe und Trends")
+    parser.add_argument("--append", type=int, default=100, help="Neue Completions nach dem Laden")
+    main(parser.parse_args())
@@ -0,0 +1,106 @@
+import asyncio
+import httpx
+import statistics
+import sys
+import time
+import uuid
+
+# Measures POST/PUT /training-plans latency depending on the number of exercises in the payload.
+# Run against a running server (uvicorn app.main:app --port 8000), optionally once per git revision
+# to compare the old per-exercise validation with the batched one.
+BASE_URL = "http://localhost:8000"
+EXERCISE_COUNTS = [1, 5, 10, 30, 60]
+ROUNDS = 20
+
+
+async def create_fixture(client: httpx.AsyncClient, max_exercises: int) -> tuple[str, list[str]]:
+    resp = await client.post("/profiles", json={"name": f"Bench Profile {uuid.uuid4()}"})
+    if resp.status_code != 201:
+        print(f"Failed to create profile: {resp.text}")
+        sys.exit(1)
+    profile_id = resp.json()["id"]
+
+    resp = await client.get("/body-categories")
+    body_category_id = resp.json()[0]["id"]
+
+    item_ids = []
+    for _ in range(max_exercises):
+        resp = await client.post("/training-exercise-items", json={
+            "description": f"Bench Item {uuid.uuid4()}",
+            "body_category_id": body_category_id
+        })
+        if resp.status_code != 201:
+            print(f"Failed to create item: {resp.text}")
+            sys.exit(1)
+        item_ids.append(resp.json()["id"])
+
+    return profile_id, item_ids
+
+
+def build_exercises(item_ids: list[str]) -> list[dict]:
+    return [
+        {
+            "order": index + 1,
+            "equipment": "Dumbbells",
+            "sets": 3,
+            "reps": 10,
+            "break_time_seconds": 60,
+            "training_exercise_item_id": item_id
+        }
+        for index, item_id in enumerate(item_ids)
+    ]
+
+
+async def main():
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30.0) as client:
+        profile_id, item_ids = await create_fixture(client, max(EXERCISE_COUNTS))
+        created_plan_ids = []
+
+        print(f"{'exercises':>10} {'create p50 ms':>14} {'create p95 ms':>14} {'update p50 ms':>14} {'update p95 ms':>14}")
+        for count in EXERCISE_COUNTS:
+            exercises = build_exercises(item_ids[:count])
+            create_times = []
+            update_times = []
+
+            for _ in range(ROUNDS):
+                plan_name = f"Bench Plan {uuid.uuid4()}"
+                started = time.perf_counter()
+                resp = await client.post("/training-plans", json={
+                    "name": plan_name,
+                    "profile_id": profile_id,
+                    "training_exercises": exercises
+                })
+                create_times.append((time.perf_counter() - started) * 1000)
+                if resp.status_code != 201:
+                    print(f"Failed to create plan: {resp.text}")
+                    sys.exit(1)
+                plan_id = resp.json()["id"]
+                created_plan_ids.append(plan_id)
+
+                started = time.perf_counter()
+                resp = await client.put("/training-plans", json={
+                    "id": plan_id,
+                    "name": plan_name,
+                    "profile_id": profile_id,
+                    "training_exercises": exercises
+                })
+                update_times.append((time.perf_counter() - started) * 1000)
+                if resp.status_code != 200:
+                    print(f"Failed to update plan: {resp.text}")
+                    sys.exit(1)
+
+            create_p95 = statistics.quantiles(create_times, n=20)[-1]
+            update_p95 = statistics.quantiles(update_times, n=20)[-1]
+            print(f"{count:>10} {statistics.median(create_times):>14.2f} {create_p95:>14.2f} "
+                  f"{statistics.median(update_times):>14.2f} {update_p95:>14.2f}")
+
+        # Cleanup
+        for plan_id in created_plan_ids:
+            await client.delete(f"/training-plans/{plan_id}")
+        for item_id in item_ids:
+            await client.delete(f"/training-exercise-items/{item_id}")
+        await client.delete(f"/profiles/{profile_id}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+import sys
+import os
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import app.main  # noqa: F401  (registriert alle Modelle)
+from app.config import settings
+from app.infrastructure.database import engine
+from app.infrastructure.partitioning import convert_to_partitioned, detach_partitions_before, ensure_partitions
+
+TABLE = "training_exercise_completions"
+
+# Verwaltung der monatlichen Partitionen von training_exercise_completions:
+#   python manage_partitions.py migrate                          bestehende Tabelle einmalig partitionieren
+#   python manage_partitions.py ensure                           kommende Monatspartitionen anlegen
+#   python manage_partitions.py detach --before 2025-01-01 [--drop]   alte Partitionen aushängen
+# Beim Aushängen werden die Zeilen der Partitionen in derselben Transaktion von completion_daily_rollups
+# abgezogen; Auswertungen und Fortschritt zählen archivierte Monate danach nicht mehr mit.
+
+
+async def main(args):
+    try:
+        async with engine.begin() as conn:
+            if args.command == "migrate":
+                copied = await convert_to_partitioned(conn, TABLE, settings.completion_partition_months_ahead)
+                print(f"Table partitioned, {copied} rows copied")
+            elif args.command == "ensure":
+                created = await ensure_partitions(conn, months_back=0, months_ahead=settings.completion_partition_months_ahead)
+                print(f"Partitions created: {', '.join(created) or 'none'}")
+            elif args.command == "detach":
+                detached = await detach_partitions_before(conn, TABLE, date.fromisoformat(args.before), drop=args.drop)
+                print(f"Partitions detached: {', '.join(detached) or 'none'}")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["migrate", "ensure", "detach"])
+    parser.add_argument("--before", help="Partitionen vor diesem Datum aushängen (YYYY-MM-DD)")
+    parser.add_argument("--drop", action="store_true", help="Ausgehängte Partitionen löschen statt archivieren")
+    args = parser.parse_args()
+    if args.command == "detach" and not args.before:
+        parser.error("detach benötigt --before")
+    asyncio.run(main(args))
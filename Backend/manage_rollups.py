@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import sys
+import os
+from uuid import UUID
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import app.main  # noqa: F401  (registriert alle Modelle)
+from app.infrastructure.database import Base, engine
+from app.infrastructure.rollups import rebuild_rollups
+
+# Tägliche Rollups der Exercise-Completions (completion_daily_rollups):
+#   python manage_rollups.py rebuild                    alle Rollups aus dem Completion-Log neu aufbauen
+#   python manage_rollups.py rebuild --profile <id>     nur die Rollups eines Profils
+# Legt Tabelle, Trigger-Funktion und Trigger vorher an, falls sie fehlen.
+
+
+async def main(args):
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            rows = await rebuild_rollups(conn, UUID(args.profile) if args.profile else None)
+            print(f"Rollups rebuilt, {rows} rows written")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--profile", help="Nur die Rollups dieses Profils neu aufbauen")
+    asyncio.run(main(parser.parse_args()))
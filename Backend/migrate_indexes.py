@@ -0,0 +1,23 @@
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import app.main  # noqa: F401  (registriert alle Modelle)
+from app.infrastructure.database import engine
+from app.infrastructure.migrations import create_indexes_concurrently
+
+async def migrate():
+    try:
+        created = await create_indexes_concurrently(engine)
+        if created:
+            print(f"Indexes created: {', '.join(created)}")
+        else:
+            print("All indexes already exist")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,100 @@
+import asyncio
+import sys
+import uuid
+from datetime import date, timedelta
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+# End-to-end check of GET /profiles/{id}/progress against a running API: the first request loads the
+# history from the database (cache miss), the second one after new uploads uses the appended cache.
+
+
+def fail(message: str) -> None:
+    print(message)
+    sys.exit(1)
+
+
+def completions(profile_id: str, plan_id: str, exercise: dict, category: dict, days: list[date], reps: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "profile_id": profile_id,
+            "training_plan_id": plan_id,
+            "exercise_id": exercise["id"],
+            "exercise_description": "Progress Test",
+            "body_category_id": category["id"],
+            "body_category_name": category["name"],
+            "order": 1,
+            "reps": reps,
+            "break_time_seconds": 60,
+            "training_day": day.isoformat(),
+        }
+        for day in days
+    ]
+
+
+async def main():
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30.0) as client:
+        suffix = uuid.uuid4()
+        resp = await client.post("/profiles", json={"name": f"Progress Test {suffix}"})
+        if resp.status_code != 201:
+            fail(f"Failed to create profile: {resp.text}")
+        profile_id = resp.json()["id"]
+
+        resp = await client.post("/body-categories", json={"name": f"Progress Category {suffix}"})
+        if resp.status_code != 201:
+            fail(f"Failed to create body category: {resp.text}")
+        category = resp.json()
+
+        resp = await client.post("/training-exercise-items", json={"description": f"Progress Item {suffix}", "body_category_id": category["id"]})
+        if resp.status_code != 201:
+            fail(f"Failed to create item: {resp.text}")
+        item_id = resp.json()["id"]
+
+        resp = await client.post("/training-plans", json={
+            "name": f"Progress Plan {suffix}",
+            "profile_id": profile_id,
+            "training_exercises": [{"order": 1, "sets": 3, "reps": 10, "break_time_seconds": 60, "training_exercise_item_id": item_id}],
+        })
+        if resp.status_code != 201:
+            fail(f"Failed to create plan: {resp.text}")
+        plan = resp.json()
+        exercise = plan["exercises"][0]
+
+        today = date.today()
+        first = completions(profile_id, plan["id"], exercise, category, [today - timedelta(days=2), today - timedelta(days=1)], 10)
+        resp = await client.post("/exercice-completion", json=first)
+        if resp.status_code != 201:
+            fail(f"Failed to upload completions: {resp.text}")
+
+        # Cache miss: the history is streamed from the database
+        resp = await client.get(f"/profiles/{profile_id}/progress")
+        if resp.status_code != 200:
+            fail(f"Progress failed on load: {resp.status_code} {resp.text}")
+        progress = resp.json()
+        assert progress["total_sets"] == 2, progress["total_sets"]
+        assert progress["current_streak_days"] == 2, progress["current_streak_days"]
+        print("Progress loaded from the database")
+
+        # Cached history, extended by the upload
+        second = completions(profile_id, plan["id"], exercise, category, [today], 15)
+        resp = await client.post("/exercice-completion", json=second)
+        if resp.status_code != 201:
+            fail(f"Failed to upload completions: {resp.text}")
+        resp = await client.get(f"/profiles/{profile_id}/progress")
+        if resp.status_code != 200:
+            fail(f"Progress failed on cached history: {resp.status_code} {resp.text}")
+        progress = resp.json()
+        assert progress["total_sets"] == 3, progress["total_sets"]
+        assert progress["current_streak_days"] == 3, progress["current_streak_days"]
+        assert progress["exercises"][0]["best_set_reps"] == 15, progress["exercises"]
+        print("Progress updated after upload")
+
+        await client.delete(f"/profiles/{profile_id}")
+        print("Progress verified")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import struct
+import sys
+import uuid
+import zlib
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from app.features.data_sync.archive import MAX_BLOCK_BYTES, ArchiveError, archive_end, archive_header, encode_archive, iter_archive_rows
+from app.features.data_sync.schemas import DataSyncExport
+
+# Round trip of the binary sync archive against the JSON schemas in data_sync/schemas.py:
+# encode a document, decode it again and compare field by field. Runs without a database.
+
+
+def build_document(completions: int) -> DataSyncExport:
+    profile_id = uuid.uuid4()
+    category_id = uuid.uuid4()
+    item_id = uuid.uuid4()
+    plan_id = uuid.uuid4()
+    exercise_id = uuid.uuid4()
+    now = datetime(2025, 3, 1, 18, 30, 15, 123456)
+
+    return DataSyncExport.model_validate({
+        "profiles": [
+            {"id": profile_id, "name": "Bär 🐻", "emoji": "💪"},
+            {"id": uuid.uuid4(), "name": "Ohne Emoji", "emoji": None},
+        ],
+        "body_categories": [{"id": category_id, "name": "Brust"}],
+        "training_exercise_items": [
+            {"id": item_id, "description": "Bankdrücken", "video_url": None, "body_category_id": category_id},
+        ],
+        "training_plans": [{"id": plan_id, "name": "Push", "profile_id": profile_id}],
+        "training_exercises": [{
+            "id": exercise_id, "training_plan_id": plan_id, "order": 1, "equipment": "",
+            "sets": 3, "reps": 10, "break_time_seconds": 90, "training_exercise_item_id": item_id,
+        }],
+        "training_plan_completions": [],
+        "training_exercise_completions": [
+            {
+                "id": uuid.uuid4(),
+                "profile_id": profile_id,
+                "training_plan_id": plan_id,
+                "exercise_id": exercise_id,
+                "exercise_description": "Bankdrücken",
+                "exercise_video_url": "https://example.com/video" if i % 3 == 0 else None,
+                "body_category_id": category_id if i % 2 == 0 else None,
+                "body_category_name": "Brust" if i % 2 == 0 else None,
+                "order": i % 8,
+                "equipment": None,
+                "reps": -1 if i == 0 else 10,
+                "break_time_seconds": 2**40 if i == 1 else 60,
+                "created_at": now - timedelta(minutes=i),
+                "training_day": date(2025, 3, 1) - timedelta(days=i // 24),
+            }
+            for i in range(completions)
+        ],
+    })
+
+
+async def decode(archive: bytes, chunk_size: int) -> DataSyncExport:
+    async def chunks():
+        for start in range(0, len(archive), chunk_size):
+            yield archive[start:start + chunk_size]
+
+    tables: dict[str, list] = {}
+    async for key, row in iter_archive_rows(chunks()):
+        rows = tables.setdefault(key, [])
+        if row is not None:
+            rows.append(row)
+    return DataSyncExport.model_validate(tables)
+
+
+async def expect_error(archive: bytes, description: str) -> None:
+    try:
+        await decode(archive, 4096)
+    except ArchiveError as e:
+        print(f"OK: {description} rejected ({e})")
+        return
+    print(f"FAILED: {description} was accepted")
+    sys.exit(1)
+
+
+async def main():
+    document = build_document(5000)
+    archive = encode_archive(document, block_rows=1000)
+
+    for chunk_size in (1, 7, 4096, len(archive)):
+        decoded = await decode(archive, chunk_size)
+        if decoded.model_dump() != document.model_dump():
+            print(f"FAILED: round trip differs (chunk size {chunk_size})")
+            sys.exit(1)
+    print("OK: round trip matches the JSON document")
+
+    json_size = len(document.model_dump_json())
+    print(f"JSON: {json_size} bytes, archive: {len(archive)} bytes ({len(archive) / json_size:.1%})")
+
+    await expect_error(archive[:-1], "truncated archive")
+    await expect_error(b"XXXX" + archive[4:], "wrong magic")
+    await expect_error(archive + b"\x00", "trailing data")
+    corrupt = bytearray(archive)
+    corrupt[-20] ^= 0xFF
+    await expect_error(bytes(corrupt), "corrupt block")
+
+    # Oversized blocks: a length header beyond the limit and a small block that inflates beyond it
+    key = b"profiles"
+    header = struct.pack("<H", len(key)) + key
+    await expect_error(archive_header() + header + struct.pack("<II", 1, MAX_BLOCK_BYTES + 1), "oversized block header")
+    bomb = zlib.compress(bytes(MAX_BLOCK_BYTES + 1), 9)
+    await expect_error(archive_header() + header + struct.pack("<II", 1, len(bomb)) + bomb + archive_end(), "decompression bomb")
+
+    # Documents produced by the archive still serialize to the JSON export format
+    json.loads(decoded.model_dump_json())
+    print("All checks passed.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
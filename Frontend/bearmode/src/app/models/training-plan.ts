@@ -34,6 +34,7 @@ export interface TrainingPlanUpdate {
 
 // Helper types for strict typing if needed, mirroring backend schemas
 export interface TrainingExerciseCreate {
+    id?: string | null; // Existing exercise id, keeps the id stable on plan updates
     order: number;
     equipment?: string | null;
     sets?: number | null;
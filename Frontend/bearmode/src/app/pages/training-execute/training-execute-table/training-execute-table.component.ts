@@ -79,6 +79,10 @@ export class TrainingExecuteTableComponent implements OnChanges {
             return;
         }
 
+        // Local training day; together with the id it keeps retried uploads from being stored twice
+        const now = new Date();
+        const trainingDay = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}-${String(now.getDate()).padStart(2, '0')}`;
+
         const completions: TrainingExerciseCompletion[] = [];
 
         this.exercises.forEach(exercise => {
@@ -95,7 +99,8 @@ export class TrainingExecuteTableComponent implements OnChanges {
                     exercise_description: exercise.training_exercise_description,
                     exercise_video_url: exercise.training_exercise_video_url,
                     body_category_id: exercise.body_category_id,
-                    body_category_name: exercise.body_category_name
+                    body_category_name: exercise.body_category_name,
+                    training_day: trainingDay
                 });
             }
         });
@@ -106,7 +111,8 @@ export class TrainingExecuteTableComponent implements OnChanges {
             training_plan_id: this.trainingPlanId,
             training_plan_name: this.trainingPlanName,
             count_completed_exercises: this.completedExercises.size,
-            count_open_exercises: this.exercises.length - this.completedExercises.size
+            count_open_exercises: this.exercises.length - this.completedExercises.size,
+            training_day: trainingDay
         };
 
         forkJoin({
@@ -128,6 +128,7 @@ export class TrainingPlanWizardComponent implements OnInit {
 
     addExercise(data?: TrainingExercise): void {
         const exerciseGroup = this.fb.group({
+            id: [data?.id || null],
             training_exercise_item_id: [data?.training_exercise_item?.id || '', Validators.required],
             sets: [data?.sets || null],
             reps: [data?.reps || null],
@@ -160,6 +161,7 @@ export class TrainingPlanWizardComponent implements OnInit {
 
         // Map form exercises to model
         const exercisesPayload: TrainingExerciseCreate[] = exercises.map((ex: any, index: number) => ({
+            id: ex.id || null,
             order: index + 1,
             equipment: ex.equipment,
             sets: ex.sets ? Number(ex.sets) : null,